@@ -2,13 +2,83 @@
 Paquete automaton: construccion directa de AFD a partir de expresiones regulares.
 """
 
-from automaton.direct_dfa import DFA, build_direct_dfa
-from automaton.minimization import minimize_dfa
-from automaton.simulation import simulate_dfa
+from automaton._version import __version__
+from automaton.aio import compile_async, match_async
+from automaton.cache import DFACache
+from automaton.compact_dfa import CompactDFA, build_compact_dfa, to_compact
+from automaton.compiler import (
+    cache_clear,
+    cache_info,
+    choose_engine,
+    compile,
+    compile_auto,
+    set_cache_limit,
+)
+from automaton.direct_dfa import (
+    DFA,
+    build_dfa,
+    build_direct_dfa,
+    build_direct_dfa_bitset,
+    build_search_dfa,
+)
+from automaton.lazy_dfa import LazyDFA, build_lazy_dfa
+from automaton.lexer import LexError, Lexer, Token, compile_lexer
+from automaton.limits import BudgetExceeded, Limits
+from automaton.matcher import DFAMatcher, compile_matcher
+from automaton.minimization import minimize_compact, minimize_dfa
+from automaton.nfa import PositionNFA, build_position_nfa
+from automaton.parallel_dfa import build_compact_dfa_parallel
+from automaton.search import Searcher, compile_searcher
+from automaton.simulation import (
+    simulate_dfa,
+    simulate_long,
+    simulate_many,
+    simulate_patterns,
+    state_map,
+)
+from automaton.stats import BuildStats, collect_stats
 
 __all__ = [
+    "BudgetExceeded",
+    "BuildStats",
+    "CompactDFA",
     "DFA",
+    "DFACache",
+    "DFAMatcher",
+    "LazyDFA",
+    "LexError",
+    "Lexer",
+    "Limits",
+    "PositionNFA",
+    "Searcher",
+    "Token",
+    "build_compact_dfa",
+    "build_compact_dfa_parallel",
+    "build_dfa",
     "build_direct_dfa",
+    "build_direct_dfa_bitset",
+    "build_lazy_dfa",
+    "build_position_nfa",
+    "build_search_dfa",
+    "cache_clear",
+    "cache_info",
+    "choose_engine",
+    "collect_stats",
+    "compile",
+    "compile_async",
+    "compile_auto",
+    "compile_lexer",
+    "compile_matcher",
+    "compile_searcher",
+    "match_async",
+    "minimize_compact",
     "minimize_dfa",
+    "set_cache_limit",
     "simulate_dfa",
+    "simulate_long",
+    "simulate_many",
+    "simulate_patterns",
+    "state_map",
+    "to_compact",
+    "__version__",
 ]
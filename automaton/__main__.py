@@ -0,0 +1,119 @@
+"""
+Punto de entrada no interactivo del paquete.
+
+Uso:
+    python -m automaton grep [-c] [-n] [-x] [-U | --latin1] [-j JOBS] REGEX ARCHIVO...
+    python -m automaton serve [--host HOST] [--port PORT] [--unix RUTA] [-j JOBS]
+                              [--max-states N] [--max-positions N] [--timeout SEG]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import signal
+import sys
+
+from automaton.grep import DEFAULT_CHUNK_SIZE, grep_files
+
+
+def _cmd_grep(args: argparse.Namespace) -> int:
+    out = sys.stdout.buffer
+    show_path = len(args.files) > 1
+    counts: dict[str, int] = {path: 0 for path in args.files}
+
+    try:
+        for result in grep_files(
+            args.regex,
+            args.files,
+            jobs=args.jobs,
+            chunk_size=args.chunk_size,
+            whole_line=args.line_regexp,
+            collect=not args.count,
+            utf8=args.utf8,
+        ):
+            counts[result.path] += result.matches
+            prefix = f"{result.path}:".encode() if show_path else b""
+            for number, line in result.matched_lines:
+                number_prefix = f"{number}:".encode() if args.line_number else b""
+                out.write(prefix + number_prefix + line + b"\n")
+    except ValueError as e:
+        print(f"Error: expresion regular invalida: {e}", file=sys.stderr)
+        return 2
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    if args.count:
+        for path, count in counts.items():
+            out.write((f"{path}:{count}\n" if show_path else f"{count}\n").encode())
+    out.flush()
+    return 0 if any(counts.values()) else 1
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    from automaton.aio import create_executor, set_executor, shutdown_executor
+    from automaton.limits import Limits
+    from automaton.server import serve
+
+    limits = None
+    if args.max_states or args.max_positions or args.timeout:
+        limits = Limits(max_states=args.max_states, max_positions=args.max_positions, timeout=args.timeout)
+
+    set_executor(create_executor(args.jobs))
+    # SIGTERM se trata como Ctrl+C para cerrar el pool de compilacion
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, limits))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        shutdown_executor()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m automaton",
+        description="Herramientas de linea de comandos para AFD construidos directamente.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    grep = commands.add_parser("grep", help="Buscar lineas que contienen la regex")
+    grep.add_argument("regex", help="Expresion regular")
+    grep.add_argument("files", nargs="+", help="Archivos donde buscar")
+    grep.add_argument("-c", "--count", action="store_true", help="Solo contar lineas")
+    grep.add_argument("-n", "--line-number", action="store_true", help="Mostrar numero de linea")
+    grep.add_argument("-x", "--line-regexp", action="store_true", help="La linea completa debe coincidir")
+    encoding = grep.add_mutually_exclusive_group()
+    encoding.add_argument(
+        "-U", "--utf8", action="store_true", default=True,
+        help="Leer los archivos como UTF-8 (por defecto)",
+    )
+    encoding.add_argument(
+        "--latin1", dest="utf8", action="store_false",
+        help="Leer cada byte como un caracter latin-1 (archivos no UTF-8 o binarios)",
+    )
+    grep.add_argument("-j", "--jobs", type=int, default=None, help="Procesos trabajadores (por defecto: CPUs)")
+    grep.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Tamano de bloque en bytes")
+    grep.set_defaults(handler=_cmd_grep)
+
+    serve = commands.add_parser("serve", help="Servidor HTTP local para match por lotes")
+    serve.add_argument("--host", default="127.0.0.1", help="Direccion de escucha")
+    serve.add_argument("--port", type=int, default=8765, help="Puerto de escucha")
+    serve.add_argument("--unix", default=None, help="Escuchar en un socket Unix en lugar de TCP")
+    serve.add_argument("-j", "--jobs", type=int, default=None, help="Procesos de compilacion (por defecto: CPUs)")
+    serve.add_argument("--max-states", type=int, default=None, help="Maximo de estados por AFD")
+    serve.add_argument("--max-positions", type=int, default=None, help="Maximo de posiciones por regex")
+    serve.add_argument("--timeout", type=float, default=None, help="Segundos maximos por compilacion")
+    serve.set_defaults(handler=_cmd_serve)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""
+Version de la biblioteca.
+"""
+
+__version__ = "0.1.0"
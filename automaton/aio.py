@@ -0,0 +1,178 @@
+"""
+API asincrona para usar el paquete dentro de servicios asyncio.
+
+La construccion, minimizacion y compilacion de una regex se delegan a un
+ProcessPoolExecutor, para que los patrones grandes no bloqueen el ciclo de
+eventos. El trabajador devuelve el matcher en el formato binario de
+serialization.py, que se carga sin copiar la tabla y se guarda en el mismo
+cache LRU en memoria que usa compile().
+
+Las compilaciones concurrentes de la misma regex en un ciclo de eventos
+comparten una sola tarea: solo la primera llamada envia trabajo al pool y
+las demas esperan su resultado.
+
+Los procesos del pool se crean con el metodo forkserver cuando el sistema lo
+ofrece: un proceso creado con fork dentro de un servidor heredaria sus
+sockets (el de escucha y las conexiones abiertas), y una conexion cerrada
+por el servidor no llegaria al fin de archivo en el cliente. Como con spawn,
+el script principal debe proteger su codigo con if __name__ == "__main__".
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+import weakref
+from collections.abc import Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+
+from automaton.compiler import _cache, _cache_key, compile
+from automaton.limits import Limits
+from automaton.matcher import DFAMatcher
+from automaton.serialization import dump_matcher, load_matcher
+
+# Cada cuantas cadenas match_async cede el control al ciclo de eventos
+_YIELD_EVERY = 1024
+
+_executor: Executor | None = None
+_executor_lock = threading.Lock()
+
+# Compilaciones en curso por ciclo de eventos: clave de cache -> tarea
+_pending: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[object, asyncio.Task]
+] = weakref.WeakKeyDictionary()
+_started = 0
+_joined = 0
+
+
+@dataclass(frozen=True)
+class AsyncStats:
+    """Contadores de compile_async."""
+
+    # Compilaciones enviadas al pool
+    compiles: int
+    # Llamadas que esperaron una compilacion ya en curso
+    joined: int
+
+
+def _compile_worker(regex: str | list[str], minimize: bool, limits: Limits | None) -> bytes:
+    """Compila en el proceso trabajador y retorna el matcher serializado."""
+    return dump_matcher(compile(regex, minimize, limits))
+
+
+def create_executor(max_workers: int | None = None) -> ProcessPoolExecutor:
+    """Crea un pool de procesos que no hereda los descriptores del proceso actual."""
+    context = None
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+
+def get_executor() -> Executor:
+    """Retorna el pool de procesos de compilacion, creandolo si no existe."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = create_executor()
+        return _executor
+
+
+def set_executor(executor: Executor | None) -> None:
+    """Reemplaza el pool de compilacion (None vuelve al pool por defecto).
+
+    El pool anterior no se cierra; si lo creo get_executor, usar
+    shutdown_executor antes de reemplazarlo.
+    """
+    global _executor
+    with _executor_lock:
+        _executor = executor
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Cierra el pool de compilacion actual."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def async_stats() -> AsyncStats:
+    """Retorna los contadores de compile_async."""
+    return AsyncStats(compiles=_started, joined=_joined)
+
+
+async def _compile_shared(
+    key: object, regex: str | list[str], minimize: bool, limits: Limits | None
+) -> DFAMatcher:
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(get_executor(), _compile_worker, regex, minimize, limits)
+    return _cache.put(key, load_matcher(data))
+
+
+async def compile_async(
+    regex: str | list[str],
+    minimize: bool = True,
+    limits: Limits | None = None,
+) -> DFAMatcher:
+    """Compila la regex sin bloquear el ciclo de eventos.
+
+    Equivale a compile(regex, minimize, limits): usa el mismo cache en
+    memoria, acepta tambien una lista de regex (AFD multipatron) y propaga
+    BudgetExceeded si se supera algun limite.
+    """
+    global _started, _joined
+    key = _cache_key(regex, minimize)
+    matcher = _cache.get(key)
+    if matcher is not None:
+        return matcher
+
+    loop = asyncio.get_running_loop()
+    pending = _pending.setdefault(loop, {})
+    # Llamadas con limites distintos no comparten la compilacion
+    task_key = (key, limits)
+    task = pending.get(task_key)
+    if task is None:
+        _started += 1
+        task = loop.create_task(_compile_shared(key, regex, minimize, limits))
+        pending[task_key] = task
+        task.add_done_callback(lambda _: pending.pop(task_key, None))
+    else:
+        _joined += 1
+
+    # shield: cancelar a un solo interesado no cancela la compilacion compartida
+    return await asyncio.shield(task)
+
+
+async def match_async(
+    regex: str | list[str],
+    inputs: str | bytes | Iterable[str | bytes],
+    minimize: bool = True,
+    limits: Limits | None = None,
+):
+    """Compila la regex (ver compile_async) y la evalua sobre la entrada.
+
+    Con una sola cadena retorna un booleano; con un iterable, una lista. Si
+    regex es una lista, cada resultado es el conjunto de patrones aceptados.
+    Las listas largas ceden el control al ciclo de eventos periodicamente.
+    """
+    matcher = await compile_async(regex, minimize, limits)
+    match = _matcher_function(matcher, tagged=not isinstance(regex, str))
+    if isinstance(inputs, (str, bytes)):
+        return match(inputs)
+
+    results = []
+    for i, w in enumerate(inputs, 1):
+        results.append(match(w))
+        if i % _YIELD_EVERY == 0:
+            await asyncio.sleep(0)
+    return results
+
+
+def _matcher_function(matcher: DFAMatcher, tagged: bool):
+    """Funcion que evalua una cadena o bytes con el matcher."""
+    if tagged:
+        return matcher.match_patterns
+    return lambda w: matcher.match(w) if isinstance(w, str) else matcher.match_bytes(w)
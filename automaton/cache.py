@@ -0,0 +1,115 @@
+"""
+Cache persistente en disco de AFD compilados y minimizados.
+
+Cada entrada se identifica por el hash SHA-256 de la regex junto con la
+version de la biblioteca y del formato binario, por lo que un cambio de
+version invalida las entradas anteriores sin pasos adicionales. Los archivos
+se escriben de forma atomica (archivo temporal + os.replace) y se cargan con
+mmap, asi los procesos que usan el mismo patron comparten las paginas de la
+tabla de transiciones.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import tempfile
+
+from automaton._version import __version__
+from automaton.direct_dfa import build_dfa
+from automaton.matcher import DFAMatcher, compile_matcher
+from automaton.minimization import minimize_dfa
+from automaton.serialization import FORMAT_VERSION, FormatError, dump_matcher, load_matcher
+
+CACHE_ENV = "AUTOMATON_CACHE_DIR"
+SUFFIX = ".adfa"
+
+
+def default_cache_dir() -> str:
+    """Directorio del cache: $AUTOMATON_CACHE_DIR o ~/.cache/automaton."""
+    return os.environ.get(CACHE_ENV) or os.path.join(
+        os.path.expanduser("~"), ".cache", "automaton"
+    )
+
+
+def cache_key(regex: str) -> str:
+    """Clave de contenido para la regex en la version actual."""
+    digest = hashlib.sha256(
+        f"{__version__}\0{FORMAT_VERSION}\0{regex}".encode("utf-8")
+    ).hexdigest()
+    return digest
+
+
+class DFACache:
+    """Cache en disco de matchers compilados, direccionado por contenido."""
+
+    def __init__(self, directory: str | None = None) -> None:
+        self.directory = directory or default_cache_dir()
+
+    def path_for(self, regex: str) -> str:
+        return os.path.join(self.directory, cache_key(regex) + SUFFIX)
+
+    def get(self, regex: str) -> DFAMatcher | None:
+        """Carga el matcher desde el cache, o None si no esta o es invalido."""
+        path = self.path_for(regex)
+        try:
+            with open(path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            return load_matcher(buffer)
+        except FormatError:
+            pass
+        # Entrada corrupta o de otro formato: se cierra el mmap y se descarta.
+        # Se cierra fuera del except, cuando el traceback ya no retiene las
+        # vistas del buffer creadas por load_matcher
+        buffer.close()
+        self._remove(path)
+        return None
+
+    def put(self, regex: str, matcher: DFAMatcher) -> str:
+        """Guarda el matcher de forma atomica y retorna la ruta del archivo."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(regex)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(dump_matcher(matcher))
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        return path
+
+    def load_or_compile(self, regex: str) -> DFAMatcher:
+        """Retorna el matcher del cache, o lo construye, minimiza y guarda."""
+        matcher = self.get(regex)
+        if matcher is not None:
+            return matcher
+        matcher = compile_matcher(minimize_dfa(build_dfa(regex)))
+        self.put(regex, matcher)
+        return self.get(regex) or matcher
+
+    def invalidate(self, regex: str) -> bool:
+        """Elimina la entrada de la regex; retorna True si existia."""
+        return self._remove(self.path_for(regex))
+
+    def clear(self) -> int:
+        """Elimina todas las entradas del cache y retorna cuantas se borraron."""
+        if not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        for name in os.listdir(self.directory):
+            if name.endswith((SUFFIX, ".tmp")):
+                removed += self._remove(os.path.join(self.directory, name))
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
@@ -0,0 +1,234 @@
+"""
+Conjuntos de caracteres para las hojas del arbol sintactico.
+
+Cada hoja representa un conjunto de code points, guardado como una tupla
+ordenada de intervalos disjuntos (lo, hi). Un simbolo simple como 'a' es el
+intervalo (97, 97); una clase como [a-z0-9] son dos intervalos, sin importar
+cuantos caracteres contengan.
+
+Antes de construir el AFD, los conjuntos de todas las hojas se particionan
+en regiones disjuntas (clases de equivalencia): dos caracteres estan en la
+misma region si pertenecen exactamente a las mismas hojas. El alfabeto del
+AFD es el conjunto de etiquetas de esas regiones, por lo que la construccion
+escala con la cantidad de regiones y no con la de caracteres.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+MAX_CODE = 0x10FFFF
+
+T = TypeVar("T")
+
+CharSet = tuple[tuple[int, int], ...]
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "f": "\f", "v": "\v", "0": "\0"}
+
+_SHORTHANDS: dict[str, CharSet] = {
+    "d": ((48, 57),),
+    "w": ((48, 57), (65, 90), (95, 95), (97, 122)),
+    "s": ((9, 13), (32, 32)),
+}
+
+
+def _normalize(intervals: list[tuple[int, int]]) -> CharSet:
+    """Ordena y fusiona intervalos solapados o adyacentes."""
+    merged: list[tuple[int, int]] = []
+    for lo, hi in sorted(intervals):
+        if merged and lo <= merged[-1][1] + 1:
+            if hi > merged[-1][1]:
+                merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return tuple(merged)
+
+
+def complement(charset: CharSet) -> CharSet:
+    """Complemento del conjunto dentro de [0, MAX_CODE]."""
+    result: list[tuple[int, int]] = []
+    prev = 0
+    for lo, hi in charset:
+        if lo > prev:
+            result.append((prev, lo - 1))
+        prev = hi + 1
+    if prev <= MAX_CODE:
+        result.append((prev, MAX_CODE))
+    return tuple(result)
+
+
+def _escape_set(c: str) -> CharSet:
+    """Conjunto de una secuencia de escape \\c (mayuscula = complemento)."""
+    if c.lower() in _SHORTHANDS:
+        charset = _SHORTHANDS[c.lower()]
+        return complement(charset) if c.isupper() else charset
+    code = ord(_ESCAPES.get(c, c))
+    return ((code, code),)
+
+
+def _single(charset: CharSet, token: str) -> int:
+    """Code point de un conjunto de un solo caracter (extremo de un rango)."""
+    if len(charset) != 1 or charset[0][0] != charset[0][1]:
+        raise ValueError(f"rango invalido en {token!r}")
+    return charset[0][0]
+
+
+def parse_atom(token: str) -> CharSet:
+    """Convierte un token operando (simbolo, escape o clase [...]) a su conjunto."""
+    if len(token) == 1:
+        code = ord(token)
+        return ((code, code),)
+    if token[0] == "\\" and len(token) == 2:
+        return _escape_set(token[1])
+    if token[0] != "[" or token[-1] != "]":
+        raise ValueError(f"token invalido: {token!r}")
+
+    body = token[1:-1]
+    negate = body.startswith("^")
+    if negate:
+        body = body[1:]
+
+    intervals: list[tuple[int, int]] = []
+    i = 0
+    while i < len(body):
+        # Leer un elemento: caracter simple o secuencia de escape
+        if body[i] == "\\" and i + 1 < len(body):
+            item = _escape_set(body[i + 1])
+            i += 2
+        else:
+            code = ord(body[i])
+            item = ((code, code),)
+            i += 1
+
+        # Rango lo-hi (un '-' al final se toma literal)
+        if i + 1 < len(body) and body[i] == "-":
+            if body[i + 1] == "\\" and i + 2 < len(body):
+                end_item = _escape_set(body[i + 2])
+                i += 3
+            else:
+                code = ord(body[i + 1])
+                end_item = ((code, code),)
+                i += 2
+            lo, hi = _single(item, token), _single(end_item, token)
+            if lo > hi:
+                raise ValueError(f"rango invertido en {token!r}")
+            intervals.append((lo, hi))
+        else:
+            intervals.extend(item)
+
+    charset = _normalize(intervals)
+    return complement(charset) if negate else charset
+
+
+def _render_char(code: int) -> str:
+    for key, value in _ESCAPES.items():
+        if ord(value) == code:
+            return "\\" + key
+    c = chr(code)
+    if c in "\\]^-[":
+        return "\\" + c
+    if not c.isprintable():
+        return f"\\u{code:04x}" if code <= 0xFFFF else f"\\U{code:08x}"
+    return c
+
+
+def render(charset: CharSet) -> str:
+    """Etiqueta legible del conjunto: el caracter si es uno solo, o una clase [...]."""
+    if len(charset) == 1 and charset[0][0] == charset[0][1]:
+        return chr(charset[0][0])
+
+    def body(intervals: CharSet) -> str:
+        parts = []
+        for lo, hi in intervals:
+            if lo == hi:
+                parts.append(_render_char(lo))
+            elif hi == lo + 1:
+                parts.append(_render_char(lo) + _render_char(hi))
+            else:
+                parts.append(f"{_render_char(lo)}-{_render_char(hi)}")
+        return "".join(parts)
+
+    size = sum(hi - lo + 1 for lo, hi in charset)
+    if size > (MAX_CODE + 1) // 2:
+        return f"[^{body(complement(charset))}]"
+    return f"[{body(charset)}]"
+
+
+def partition(
+    leaf_sets: dict[int, CharSet],
+) -> tuple[dict[int, frozenset[str]], list[tuple[int, int, str]]]:
+    """Particiona los conjuntos de las hojas en regiones disjuntas.
+
+    Retorna, para cada posicion, el conjunto de etiquetas de las regiones que
+    cubre, y la lista ordenada de intervalos (lo, hi, etiqueta) de las
+    regiones de mas de un caracter. Las regiones de un solo caracter usan el
+    caracter mismo como etiqueta.
+    """
+    # Barrido: en cada frontera se activan o desactivan posiciones
+    events: dict[int, list[tuple[int, int]]] = {}
+    for pos, charset in leaf_sets.items():
+        for lo, hi in charset:
+            events.setdefault(lo, []).append((1, pos))
+            events.setdefault(hi + 1, []).append((-1, pos))
+
+    regions: dict[frozenset[int], list[tuple[int, int]]] = {}
+    active: set[int] = set()
+    bounds = sorted(events)
+    for k, point in enumerate(bounds):
+        for delta, pos in events[point]:
+            if delta > 0:
+                active.add(pos)
+            else:
+                active.discard(pos)
+        if active and k + 1 < len(bounds):
+            regions.setdefault(frozenset(active), []).append((point, bounds[k + 1] - 1))
+
+    pos_classes: dict[int, set[str]] = {pos: set() for pos in leaf_sets}
+    intervals: list[tuple[int, int, str]] = []
+    for signature, segments in regions.items():
+        charset = _normalize(segments)
+        label = render(charset)
+        for pos in signature:
+            pos_classes[pos].add(label)
+        if len(label) > 1:
+            intervals.extend((lo, hi, label) for lo, hi in charset)
+
+    intervals.sort()
+    return {pos: frozenset(labels) for pos, labels in pos_classes.items()}, intervals
+
+
+def find_interval(intervals: Sequence[tuple[int, int, T]], code: int) -> T | None:
+    """Valor del intervalo (lo, hi, valor) que contiene al code point, o None.
+
+    Los intervalos deben estar ordenados y ser disjuntos, como los de partition.
+    """
+    i = bisect_right(intervals, code, key=lambda iv: iv[0]) - 1
+    if i >= 0 and code <= intervals[i][1]:
+        return intervals[i][2]
+    return None
+
+
+@dataclass
+class SymbolIndex:
+    """Code point -> indice de su etiqueta en el alfabeto, con tabla directa para ASCII."""
+
+    alphabet: list[str]
+    intervals: list[tuple[int, int, str]]
+    # ascii[c]: indice del simbolo del code point c < 128, o None
+    ascii: list[int | None] = field(default_factory=list, repr=False)
+    _index: dict[str, int] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self._index = {label: k for k, label in enumerate(self.alphabet)}
+        self.ascii = [self.lookup(code) for code in range(128)]
+
+    def lookup(self, code: int) -> int | None:
+        """Indice del simbolo del alfabeto que contiene al code point, o None."""
+        k = self._index.get(chr(code))
+        if k is not None:
+            return k
+        label = find_interval(self.intervals, code)
+        return None if label is None else self._index[label]
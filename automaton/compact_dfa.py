@@ -0,0 +1,321 @@
+"""
+Representacion compacta de un AFD en arreglos planos.
+
+El DFA de direct_dfa guarda los estados como conjuntos de posiciones y las
+transiciones en un diccionario con claves (estado, simbolo), lo que cuesta
+cientos de bytes por transicion. CompactDFA guarda:
+1. Una tabla `array('i')` de estados x simbolos, con -1 donde no hay
+   transicion. Las columnas son las etiquetas del alfabeto, que ya son
+   clases de caracteres disjuntas
+2. Un mapa de bits de los estados de aceptacion
+3. Opcionalmente, los conjuntos de posiciones de cada estado
+
+build_compact_dfa escribe la tabla directamente durante la construccion por
+subconjuntos, sin pasar por el diccionario. to_compact y CompactDFA.to_dfa
+convierten entre ambas representaciones, de modo que minimize_dfa,
+render_dfa y print_dfa_table siguen funcionando.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+
+from automaton.charset import find_interval
+from automaton.direct_dfa import (
+    BITSET_MAX_POSITIONS,
+    DFA,
+    _augment,
+    _label_masks,
+    _leaf_classes,
+)
+from automaton.limits import Budget, Limits, budget_of
+from automaton.stats import current_stats, record_states, stage
+from automaton.syntax_tree import _iter_bits, build_followpos_bitsets, build_syntax_tree
+from automaton.utf8 import byte_string
+
+
+@dataclass(slots=True)
+class CompactDFA:
+    """AFD con tabla de transiciones plana y mapa de bits de aceptacion."""
+
+    alphabet: list[str] = field(default_factory=list)
+    num_states: int = 0
+    # Fila s, columna k: destino de s con alphabet[k], o -1
+    table: array = field(default_factory=lambda: array("i"))
+    # Bit s encendido si el estado s es de aceptacion
+    accept: bytearray = field(default_factory=bytearray)
+    start_state: int = 0
+    intervals: list[tuple[int, int, str]] = field(default_factory=list)
+    accept_patterns: dict[int, frozenset[int]] = field(default_factory=dict)
+    # Conjuntos de posiciones por estado; None si se descartaron
+    states: list[frozenset[int]] | None = None
+    # Alfabeto de bytes UTF-8: las cadenas str se simulan por su codificacion
+    utf8: bool = False
+    _columns: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._columns = {symbol: k for k, symbol in enumerate(self.alphabet)}
+
+    @property
+    def accept_states(self) -> set[int]:
+        """Conjunto de estados de aceptacion."""
+        return {s for s in range(self.num_states) if self.is_accepting(s)}
+
+    @property
+    def nbytes(self) -> int:
+        """Tamano en bytes de la tabla y del mapa de bits."""
+        return self.table.itemsize * len(self.table) + len(self.accept)
+
+    def is_accepting(self, state: int) -> bool:
+        return bool(self.accept[state >> 3] >> (state & 7) & 1)
+
+    def symbol_of(self, char: str) -> str | None:
+        """Simbolo del alfabeto que corresponde al caracter, o None."""
+        if char in self._columns:
+            return char
+        return find_interval(self.intervals, ord(char))
+
+    def transition(self, state: int, symbol: str) -> int | None:
+        """Destino de la transicion (state, symbol), o None si no existe."""
+        k = self._columns.get(symbol)
+        if k is None:
+            return None
+        target = self.table[state * len(self.alphabet) + k]
+        return None if target < 0 else target
+
+    def match(self, input_string: str) -> bool:
+        """Retorna True si la cadena completa es aceptada."""
+        if self.utf8:
+            input_string = byte_string(input_string)
+        table, width, columns = self.table, len(self.alphabet), self._columns
+        state = self.start_state
+        for char in input_string:
+            k = columns.get(char)
+            if k is None:
+                symbol = self.symbol_of(char)
+                if symbol is None:
+                    return False
+                k = columns[symbol]
+            state = table[state * width + k]
+            if state < 0:
+                return False
+        return self.is_accepting(state)
+
+    def drop_positions(self) -> None:
+        """Descarta los conjuntos de posiciones, que solo sirven para depurar."""
+        self.states = None
+
+    def to_dfa(self) -> DFA:
+        """Convierte a la representacion DFA con diccionario de transiciones."""
+        dfa = DFA(utf8=self.utf8)
+        dfa.alphabet = set(self.alphabet)
+        dfa.intervals = list(self.intervals)
+        dfa.start_state = self.start_state
+        dfa.accept_states = self.accept_states
+        dfa.accept_patterns = dict(self.accept_patterns)
+        if self.states is not None:
+            dfa.states = list(self.states)
+        else:
+            dfa.states = [frozenset() for _ in range(self.num_states)]
+
+        width = len(self.alphabet)
+        for s in range(self.num_states):
+            row = s * width
+            for k, symbol in enumerate(self.alphabet):
+                target = self.table[row + k]
+                if target >= 0:
+                    dfa.transitions[(s, symbol)] = target
+        return dfa
+
+
+def _accept_bitmap(accepting: list[int], num_states: int) -> bytearray:
+    bitmap = bytearray((num_states + 7) >> 3)
+    for s in accepting:
+        bitmap[s >> 3] |= 1 << (s & 7)
+    return bitmap
+
+
+def to_compact(dfa: DFA, keep_positions: bool = False) -> CompactDFA:
+    """Convierte un DFA a su forma compacta."""
+    alphabet = sorted(dfa.alphabet)
+    n = len(dfa.states)
+    width = len(alphabet)
+    columns = {symbol: k for k, symbol in enumerate(alphabet)}
+
+    table = array("i", [-1]) * (n * width)
+    for (s, symbol), t in dfa.transitions.items():
+        table[s * width + columns[symbol]] = t
+
+    return CompactDFA(
+        alphabet=alphabet,
+        num_states=n,
+        table=table,
+        accept=_accept_bitmap(dfa.accept_states, n),
+        start_state=dfa.start_state,
+        intervals=list(dfa.intervals),
+        accept_patterns=dict(dfa.accept_patterns),
+        states=list(dfa.states) if keep_positions else None,
+        utf8=dfa.utf8,
+    )
+
+
+def build_compact_dfa(
+    regex: str | list[str],
+    keep_positions: bool = False,
+    limits: Limits | None = None,
+    utf8: bool = False,
+) -> CompactDFA:
+    """Construye el AFD directo escribiendo las transiciones en la tabla plana.
+
+    Produce la misma numeracion de estados que build_direct_dfa_bitset. Los
+    estados se internan por su bitset de posiciones (o, con mas de
+    BITSET_MAX_POSITIONS posiciones, por su conjunto, como en build_dfa)
+    solo durante la construccion; con keep_positions=False no se conservan.
+    Con limits, las transiciones que se cuentan son las celdas de la tabla.
+    utf8 tiene el mismo sentido que en build_direct_dfa.
+    """
+    budget = budget_of(limits)
+    postfix, end_positions = _augment(regex, utf8)
+    if budget is not None:
+        budget.check_positions(end_positions[-1])
+    if end_positions[-1] <= BITSET_MAX_POSITIONS:
+        with stage("followpos"):
+            first, pos_symbols, followpos = build_followpos_bitsets(postfix)
+        pos_classes, intervals = _leaf_classes(pos_symbols, end_positions)
+        alphabet, table, states = _bitset_table(first, followpos, pos_classes, budget)
+        end_mask = 0
+        for end in end_positions:
+            end_mask |= 1 << end
+        hits = {
+            s: list(_iter_bits(m & end_mask))
+            for s, m in enumerate(states)
+            if m & end_mask
+        }
+        num_states = len(states)
+        positions = [frozenset(_iter_bits(m)) for m in states] if keep_positions else None
+    else:
+        with stage("followpos"):
+            tree = build_syntax_tree(postfix)
+        pos_classes, intervals = _leaf_classes(tree.pos_symbols, end_positions)
+        alphabet, table, positions = _set_table(
+            tree.firstpos, tree.followpos, pos_classes, budget
+        )
+        num_states = len(positions)
+        ends = set(end_positions)
+        hits = {
+            s: list(ends.intersection(p))
+            for s, p in enumerate(positions)
+            if not ends.isdisjoint(p)
+        }
+        if not keep_positions:
+            positions = None
+
+    # hits: estado de aceptacion -> marcadores # que contiene
+    pattern_of = {end: i for i, end in enumerate(end_positions)}
+    accept_patterns: dict[int, frozenset[int]] = {}
+    if not isinstance(regex, str):
+        accept_patterns = {
+            s: frozenset(pattern_of[p] for p in hit) for s, hit in hits.items()
+        }
+
+    return CompactDFA(
+        alphabet=alphabet,
+        num_states=num_states,
+        table=table,
+        accept=_accept_bitmap(list(hits), num_states),
+        intervals=intervals,
+        accept_patterns=accept_patterns,
+        states=positions,
+        utf8=utf8,
+    )
+
+
+def _bitset_table(
+    first: int,
+    followpos: list[int],
+    pos_classes: dict[int, frozenset[str]],
+    budget: Budget | None,
+) -> tuple[list[str], array, list[int]]:
+    """Tabla plana de la construccion por subconjuntos con estados como bitsets."""
+    masks = _label_masks(pos_classes)
+    alphabet = sorted(masks)
+    symbol_masks = [masks[symbol] for symbol in alphabet]
+
+    table = array("i")
+    state_masks: list[int] = [first]
+    state_map: dict[int, int] = {first: 0}
+
+    # Los estados se procesan en orden de creacion (equivale a una cola)
+    with stage("subset"):
+        current_id = 0
+        while current_id < len(state_masks):
+            current = state_masks[current_id]
+            for mask in symbol_masks:
+                selected = current & mask
+                next_state = 0
+                for p in _iter_bits(selected):
+                    next_state |= followpos[p]
+                if not next_state:
+                    table.append(-1)
+                    continue
+
+                state_id = state_map.get(next_state)
+                if state_id is None:
+                    state_id = len(state_masks)
+                    state_map[next_state] = state_id
+                    state_masks.append(next_state)
+                table.append(state_id)
+            current_id += 1
+            if budget is not None:
+                budget.check("subset", len(state_masks), len(table))
+
+    stats = current_stats()
+    if stats is not None:
+        record_states(stats, (mask.bit_count() for mask in state_masks))
+    return alphabet, table, state_masks
+
+
+def _set_table(
+    first: frozenset[int],
+    followpos: dict[int, set[int]],
+    pos_classes: dict[int, frozenset[str]],
+    budget: Budget | None,
+) -> tuple[list[str], array, list[frozenset[int]]]:
+    """Tabla plana de la construccion por subconjuntos con estados como conjuntos."""
+    alphabet = sorted(set().union(*pos_classes.values()))
+    columns = {symbol: k for k, symbol in enumerate(alphabet)}
+
+    table = array("i")
+    states: list[frozenset[int]] = [first]
+    state_map: dict[frozenset[int], int] = {first: 0}
+
+    with stage("subset"):
+        current_id = 0
+        while current_id < len(states):
+            # Sucesores agrupados por columna, a partir de las posiciones del estado
+            targets: dict[int, set[int]] = {}
+            for p in states[current_id]:
+                for symbol in pos_classes.get(p, ()):
+                    targets.setdefault(columns[symbol], set()).update(followpos[p])
+            row = array("i", [-1]) * len(alphabet)
+            for k in sorted(targets):
+                positions = targets[k]
+                if not positions:
+                    continue
+                next_state = frozenset(positions)
+                state_id = state_map.get(next_state)
+                if state_id is None:
+                    state_id = len(states)
+                    state_map[next_state] = state_id
+                    states.append(next_state)
+                row[k] = state_id
+            table.extend(row)
+            current_id += 1
+            if budget is not None:
+                budget.check("subset", len(states), len(table))
+
+    stats = current_stats()
+    if stats is not None:
+        record_states(stats, map(len, states))
+    return alphabet, table, states
@@ -0,0 +1,286 @@
+"""
+Punto de entrada unico para compilar regex a matchers, con cache LRU en memoria.
+
+El cache es seguro entre hilos y se limita por el tamano total de las tablas
+de transiciones (DFAMatcher.nbytes), no por la cantidad de entradas. Lleva
+contadores de aciertos, fallos y desalojos para dimensionarlo con carga real.
+
+compile_auto elige entre el AFN de posiciones, el AFD perezoso y el AFD
+completo segun el tamano del patron y el volumen de entrada esperado.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+
+from automaton.compact_dfa import build_compact_dfa
+from automaton.direct_dfa import build_dfa
+from automaton.lazy_dfa import LazyDFA, build_lazy_dfa
+from automaton.limits import BudgetExceeded, Limits, budget_of
+from automaton.matcher import DFAMatcher, compile_matcher
+from automaton.minimization import minimize_compact, minimize_dfa
+from automaton.nfa import PositionNFA, build_position_nfa
+
+DEFAULT_MAX_BYTES = 64 << 20
+
+# Heuristica de compile_auto, calibrada con benchmarks/bench_engines.py:
+# hasta este volumen de entrada (caracteres) conviene no construir el AFD
+NFA_MAX_VOLUME = 1 << 12
+# El AFD completo se amortiza con al menos tantos caracteres por simbolo del patron
+DFA_VOLUME_PER_SYMBOL = 256
+# Limite de estados del AFD completo en compile_auto antes de pasar al perezoso
+AUTO_MAX_STATES = 1 << 16
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Contadores del cache de compilacion."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    current_bytes: int
+    max_bytes: int
+
+
+def _size_of(matcher: DFAMatcher | LazyDFA) -> int:
+    # Un LazyDFA crece hasta su presupuesto de bytes
+    return matcher.max_bytes if isinstance(matcher, LazyDFA) else matcher.nbytes
+
+
+class LRUCache:
+    """Cache LRU seguro entre hilos, limitado por bytes totales."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        size_of: Callable[[DFAMatcher | LazyDFA], int] = _size_of,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self._size_of = size_of
+        self._entries: OrderedDict[object, tuple[DFAMatcher, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, *keys: object) -> DFAMatcher | None:
+        """Valor de la primera clave presente; cuenta un solo acierto o fallo."""
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry[0]
+            self._misses += 1
+            return None
+
+    def put(self, key: object, value: DFAMatcher) -> DFAMatcher:
+        """Inserta el valor; si otro hilo ya lo inserto, retorna el existente."""
+        size = self._size_of(value)
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                self._entries.move_to_end(key)
+                return existing[0]
+            if size > self.max_bytes:
+                # No cabe ni con el cache vacio: no se guarda
+                return value
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._evict()
+            return value
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                current_bytes=self._bytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def _evict(self) -> None:
+        """Desaloja las entradas menos usadas hasta respetar el limite."""
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
+
+
+_cache = LRUCache()
+
+
+def _cache_key(regex: str | list[str], minimize: bool, utf8: bool = False) -> tuple:
+    key = (regex if isinstance(regex, str) else tuple(regex), minimize)
+    return key + ("utf-8",) if utf8 else key
+
+
+def compile(
+    regex: str | list[str],
+    minimize: bool = True,
+    limits: Limits | None = None,
+    fallback: bool = False,
+    low_memory: bool = False,
+    utf8: bool = False,
+) -> DFAMatcher | LazyDFA:
+    """Compila la regex a un DFAMatcher, reutilizando el cache en memoria.
+
+    Con una lista de regex se compila el AFD multipatron (ver match_patterns).
+
+    Con limits, la construccion y la minimizacion comparten el tiempo dado y
+    se lanza BudgetExceeded si se supera algun limite. Con fallback=True no
+    se falla por estados, transiciones o tiempo: si se agota la minimizacion
+    se compila el AFD sin minimizar, y si se agota la construccion de una
+    regex individual se retorna un LazyDFA, que construye solo los estados
+    que la entrada alcanza.
+
+    Con low_memory=True la construccion escribe directamente la tabla plana
+    de CompactDFA y la minimizacion trabaja sobre ella, sin conjuntos de
+    posiciones ni diccionarios de transiciones; el resultado es el mismo y
+    el pico de memoria es menor. Con limits, las transiciones que se cuentan
+    son las celdas de la tabla.
+
+    Con utf8=True el AFD se construye sobre los bytes de la codificacion
+    UTF-8 (ver automaton/utf8.py): match_bytes acepta bytes, memoryview o
+    mmap sin decodificarlos, y match codifica las cadenas str.
+    """
+    key = _cache_key(regex, minimize, utf8)
+    matcher = _cache.get(*_lookup_keys(key, regex, fallback))
+    if matcher is not None:
+        return matcher
+    return _build(regex, key, minimize, limits, fallback, low_memory, utf8)
+
+
+def _lookup_keys(key: tuple, regex: str | list[str], fallback: bool) -> tuple:
+    """Claves a consultar: con fallback, tambien la del LazyDFA de respaldo."""
+    if fallback and isinstance(regex, str):
+        return key, _lazy_key(key)
+    return (key,)
+
+
+def _lazy_key(key: tuple) -> tuple:
+    return (key[0], "lazy", *key[2:])
+
+
+def _build(
+    regex: str | list[str],
+    key: tuple,
+    minimize: bool,
+    limits: Limits | None,
+    fallback: bool,
+    low_memory: bool,
+    utf8: bool,
+) -> DFAMatcher | LazyDFA:
+    """Construye y guarda en el cache lo que compile no encontro en el."""
+    # La construccion se hace fuera del lock para no bloquear otros hilos
+    if low_memory:
+        build, minimize_fn = partial(build_compact_dfa, keep_positions=False), minimize_compact
+    else:
+        build, minimize_fn = build_dfa, minimize_dfa
+    budget = budget_of(limits)
+    try:
+        dfa = build(regex, limits=limits, utf8=utf8)
+    except BudgetExceeded as e:
+        if not fallback or not isinstance(regex, str) or e.limit == "max_positions":
+            raise
+        return _cache.put(_lazy_key(key), build_lazy_dfa(regex, utf8=utf8))
+
+    if minimize:
+        try:
+            dfa = minimize_fn(dfa, budget and budget.remaining())
+        except BudgetExceeded:
+            if not fallback:
+                raise
+            # El AFD sin minimizar es equivalente; no se guarda como minimizado
+            return compile_matcher(dfa, utf8=utf8)
+    return _cache.put(key, compile_matcher(dfa, utf8=utf8))
+
+
+def choose_engine(regex: str | list[str], input_volume: int | None = None) -> str:
+    """Motor que compile_auto usaria: "dfa", "lazy" o "nfa".
+
+    input_volume es la cantidad total de caracteres que se espera evaluar
+    (None si es desconocida o ilimitada). Con poca entrada la simulacion del
+    AFN de posiciones, que no construye estados, es la mas barata; con mucha
+    entrada el AFD completo amortiza su construccion. En medio, el AFD
+    perezoso construye solo los estados que la entrada visita. Una lista de
+    regex nunca usa el AFD perezoso, que no es multipatron.
+    """
+    if input_volume is not None and input_volume <= NFA_MAX_VOLUME:
+        return "nfa"
+    size = len(regex) if isinstance(regex, str) else sum(map(len, regex))
+    if input_volume is None or input_volume >= DFA_VOLUME_PER_SYMBOL * size:
+        return "dfa"
+    return "lazy" if isinstance(regex, str) else "nfa"
+
+
+def compile_auto(
+    regex: str | list[str],
+    input_volume: int | None = None,
+    limits: Limits | None = None,
+) -> DFAMatcher | LazyDFA | PositionNFA:
+    """Compila con el motor mas conveniente (ver choose_engine).
+
+    Todos los resultados tienen match(texto), y con una lista de regex
+    tambien match_patterns. Un AFD ya presente en el cache se reutiliza
+    siempre, igual que el AFD perezoso guardado por una compilacion con
+    fallback. El AFD completo se construye con limits (por defecto
+    AUTO_MAX_STATES estados) y, si los supera, se usa el AFD perezoso o,
+    para una lista de regex, el AFN.
+    """
+    # Una sola consulta al cache: la rama "dfa" construye sin volver a buscar
+    key = _cache_key(regex, True)
+    matcher = _cache.get(*_lookup_keys(key, regex, True))
+    if matcher is not None:
+        return matcher
+
+    engine = choose_engine(regex, input_volume)
+    if engine == "nfa":
+        return build_position_nfa(regex)
+    if engine == "lazy":
+        return build_lazy_dfa(regex)
+    try:
+        limits = limits or Limits(max_states=AUTO_MAX_STATES)
+        return _build(
+            regex, key, minimize=True, limits=limits, fallback=True, low_memory=False, utf8=False
+        )
+    except BudgetExceeded as e:
+        if isinstance(regex, str) or e.limit == "max_positions":
+            raise
+        return build_position_nfa(regex)
+
+
+def cache_info() -> CacheStats:
+    """Retorna los contadores del cache de compilacion."""
+    return _cache.stats()
+
+
+def cache_clear() -> None:
+    """Vacia el cache de compilacion y reinicia los contadores."""
+    _cache.clear()
+
+
+def set_cache_limit(max_bytes: int) -> None:
+    """Cambia el limite de bytes del cache, desalojando si es necesario."""
+    _cache.resize(max_bytes)
@@ -9,14 +9,39 @@ Pasos del algoritmo:
 4. Estado inicial = firstpos(raiz)
 5. Construir transiciones usando la tabla followpos
 6. Estados de aceptacion = aquellos que contienen la posicion de #
+
+Con una lista de regex, cada r_i se aumenta con su propio marcador de fin
+((r_1)#|(r_2)#|...) en un mismo arbol. Cada estado de aceptacion guarda en
+accept_patterns los indices de los patrones cuyos marcadores contiene, de modo
+que una sola pasada sobre la entrada reporta todos los patrones que coinciden.
+
+Las hojas pueden ser clases de caracteres; antes de construir las
+transiciones sus conjuntos se particionan en regiones disjuntas
+(ver automaton/charset.py), y el alfabeto del AFD son las etiquetas de
+esas regiones.
 """
 
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
 
-from automaton.shunting_yard import shunting_yard
-from automaton.syntax_tree import build_syntax_tree
+from automaton.charset import find_interval, parse_atom, partition
+from automaton.limits import Budget, Limits, budget_of
+from automaton.shunting_yard import _validate, to_postfix, tokenize
+from automaton.stats import current_stats, record_states, stage
+from automaton.syntax_tree import (
+    SyntaxTree,
+    _iter_bits,
+    build_followpos_bitsets,
+    build_syntax_tree,
+)
+from automaton.utf8 import utf8_postfix
+
+# Con mas posiciones, los bitsets (enteros de n bits por estado y por fila
+# followpos) hacen que tiempo y memoria crezcan cuadraticamente con el largo
+# del patron; build_dfa usa entonces conjuntos (ver benchmarks/bench_construction.py)
+BITSET_MAX_POSITIONS = 4096
 
 
 @dataclass
@@ -28,61 +53,347 @@ class DFA:
     transitions: dict[tuple[int, str], int] = field(default_factory=dict)
     start_state: int = 0
     accept_states: set[int] = field(default_factory=set)
+    # Intervalos (lo, hi, etiqueta) de los simbolos que son clases de caracteres
+    intervals: list[tuple[int, int, str]] = field(default_factory=list)
+    # Solo en AFD multipatron: estado de aceptacion -> indices de sus patrones
+    accept_patterns: dict[int, frozenset[int]] = field(default_factory=dict)
+    # Alfabeto de bytes UTF-8: las cadenas str se simulan por su codificacion
+    utf8: bool = False
+
+    def symbol_of(self, char: str) -> str | None:
+        """Simbolo del alfabeto que corresponde al caracter, o None."""
+        if char in self.alphabet:
+            return char
+        return find_interval(self.intervals, ord(char))
+
+
+def _augment(regex: str | list[str], utf8: bool = False) -> tuple[list[str], list[int]]:
+    """Postfijo de la regex aumentada y posicion del marcador # de cada patron.
+
+    Las posiciones se numeran en el orden de los operandos del postfijo, por
+    lo que el marcador de (r_i)# es la ultima posicion de su parte. Con
+    utf8=True los operandos no ASCII se reemplazan por sus secuencias de
+    bytes UTF-8 (ver automaton/utf8.py).
+    """
+    regexes = [regex] if isinstance(regex, str) else list(regex)
+    if not regexes:
+        raise ValueError("se requiere al menos una expresion regular")
+
+    postfix: list[str] = []
+    end_positions: list[int] = []
+    count = 0
+    with stage("parse"):
+        for i, r in enumerate(regexes):
+            # La regex del usuario se divide en tokens y se valida antes de
+            # aumentarla, para que un escape final o una clase sin cerrar no
+            # tomen el ')' agregado y los errores se refieran a la regex original
+            tokens = tokenize(r)
+            if not tokens:
+                raise ValueError("expresion regular vacia")
+            _validate(tokens)
+            part = to_postfix(["(", *tokens, ")", "#"])
+            if utf8:
+                part = utf8_postfix(part)
+            count += sum(1 for c in part if c not in (".", "|", "*", "+", "?", "ε"))
+            postfix.extend(part)
+            if i:
+                postfix.append("|")
+            end_positions.append(count)
+    stats = current_stats()
+    if stats is not None:
+        stats.positions += count
+    return postfix, end_positions
+
+
+def _parse_augmented(
+    regex: str | list[str], budget: Budget | None = None, utf8: bool = False
+) -> tuple[SyntaxTree, list[int]]:
+    """Aumenta la regex con # y construye el arbol con su tabla followpos."""
+    postfix, end_positions = _augment(regex, utf8)
+    if budget is not None:
+        budget.check_positions(end_positions[-1])
+    with stage("followpos"):
+        tree = build_syntax_tree(postfix)
+    return tree, end_positions
+
+
+def _leaf_classes(
+    pos_symbols: dict[int, str], end_positions: list[int]
+) -> tuple[dict[int, frozenset[str]], list[tuple[int, int, str]]]:
+    """Particiona los conjuntos de caracteres de las hojas (sin los marcadores #)."""
+    ends = set(end_positions)
+    return partition(
+        {p: parse_atom(sym) for p, sym in pos_symbols.items() if p not in ends}
+    )
+
+
+def _label_masks(pos_classes: dict[int, frozenset[str]]) -> dict[str, int]:
+    """Mascara de bits de las posiciones que cubre cada etiqueta del alfabeto."""
+    masks: dict[str, int] = {}
+    for pos, labels in pos_classes.items():
+        for label in labels:
+            masks[label] = masks.get(label, 0) | (1 << pos)
+    return masks
 
 
-def build_direct_dfa(regex: str) -> DFA:
-    """Construye un AFD directamente desde la regex usando followpos."""
-    augmented = f"({regex})#"
-    postfix = shunting_yard(augmented)
-    root, pos_symbols, followpos = build_syntax_tree(postfix)
+def build_direct_dfa(
+    regex: str | list[str], limits: Limits | None = None, utf8: bool = False
+) -> DFA:
+    """Construye un AFD directamente desde la regex usando followpos.
 
-    # Encontrar la posicion del marcador de fin #
-    end_pos = None
-    for pos, sym in pos_symbols.items():
-        if sym == "#":
-            end_pos = pos
-            break
+    Con una lista de regex se construye el AFD multipatron etiquetado. Con
+    limits se lanza BudgetExceeded si la construccion los supera. Con
+    utf8=True el alfabeto son bytes (caracteres latin-1) de la codificacion
+    UTF-8; ver automaton/utf8.py.
+    """
+    budget = budget_of(limits)
+    tree, end_positions = _parse_augmented(regex, budget, utf8)
+    tagged = not isinstance(regex, str)
+    return _subset_sets(tree, end_positions, budget, tagged, utf8)
 
-    alphabet = {sym for sym in pos_symbols.values() if sym != "#"}
-    start = frozenset(root.firstpos)
 
-    dfa = DFA()
+def _subset_sets(
+    tree: SyntaxTree,
+    end_positions: list[int],
+    budget: Budget | None,
+    tagged: bool,
+    utf8: bool = False,
+) -> DFA:
+    """Construccion por subconjuntos con estados como conjuntos de posiciones."""
+    followpos = tree.followpos
+    pos_classes, intervals = _leaf_classes(tree.pos_symbols, end_positions)
+    pattern_of = {end: i for i, end in enumerate(end_positions)}
+
+    alphabet = set().union(*pos_classes.values())
+    start = tree.firstpos
+
+    dfa = DFA(utf8=utf8)
     dfa.alphabet = alphabet
+    dfa.intervals = intervals
     dfa.start_state = 0
 
     # Cola de estados no marcados para procesar
-    unmarked: list[frozenset[int]] = [start]
+    unmarked: deque[frozenset[int]] = deque([start])
     dfa.states.append(start)
     state_map: dict[frozenset[int], int] = {start: 0}
 
-    if end_pos is not None and end_pos in start:
-        dfa.accept_states.add(0)
+    _mark_accepting(dfa, 0, start, pattern_of, tagged)
+
+    with stage("subset"):
+        while unmarked:
+            current = unmarked.popleft()
+            current_id = state_map[current]
+
+            for symbol in sorted(alphabet):
+                # Unir followpos de todas las posiciones con este simbolo
+                next_state_positions: set[int] = set()
+                for p in current:
+                    if symbol in pos_classes.get(p, ()):
+                        next_state_positions |= followpos.get(p, set())
+
+                if not next_state_positions:
+                    continue
+
+                next_state = frozenset(next_state_positions)
+
+                if next_state not in state_map:
+                    state_id = len(dfa.states)
+                    state_map[next_state] = state_id
+                    dfa.states.append(next_state)
+                    unmarked.append(next_state)
+                    _mark_accepting(dfa, state_id, next_state, pattern_of, tagged)
+
+                dfa.transitions[(current_id, symbol)] = state_map[next_state]
+
+            if budget is not None:
+                budget.check("subset", len(dfa.states), len(dfa.transitions))
+
+    stats = current_stats()
+    if stats is not None:
+        record_states(stats, map(len, dfa.states))
+    return dfa
+
+
+def _mark_accepting(
+    dfa: DFA,
+    state_id: int,
+    positions: frozenset[int],
+    pattern_of: dict[int, int],
+    tagged: bool,
+) -> None:
+    """Marca el estado como de aceptacion si contiene algun marcador #."""
+    patterns = frozenset(pattern_of[p] for p in positions if p in pattern_of)
+    if patterns:
+        dfa.accept_states.add(state_id)
+        if tagged:
+            dfa.accept_patterns[state_id] = patterns
+
 
-    while unmarked:
-        current = unmarked.pop(0)
-        current_id = state_map[current]
+def build_direct_dfa_bitset(
+    regex: str | list[str], limits: Limits | None = None, utf8: bool = False
+) -> DFA:
+    """Construye el mismo AFD que build_direct_dfa usando bitsets de posiciones.
+
+    Se precalcula una mascara de posiciones por simbolo, de modo que cada
+    transicion es el OR de las filas followpos de los bits de
+    (estado & mascara[simbolo]). Los estados se internan por su entero.
+    """
+    budget = budget_of(limits)
+    postfix, end_positions = _augment(regex, utf8)
+    if budget is not None:
+        budget.check_positions(end_positions[-1])
+    tagged = not isinstance(regex, str)
+    return _subset_bitsets(postfix, end_positions, budget, tagged, utf8)
+
+
+def build_dfa(
+    regex: str | list[str], limits: Limits | None = None, utf8: bool = False
+) -> DFA:
+    """Construye el AFD directo eligiendo la representacion de los estados.
+
+    Con hasta BITSET_MAX_POSITIONS posiciones usa bitsets
+    (build_direct_dfa_bitset); con mas, conjuntos (build_direct_dfa). Ambos
+    caminos producen el mismo AFD con la misma numeracion de estados.
+    """
+    budget = budget_of(limits)
+    postfix, end_positions = _augment(regex, utf8)
+    if budget is not None:
+        budget.check_positions(end_positions[-1])
+    tagged = not isinstance(regex, str)
+    if end_positions[-1] <= BITSET_MAX_POSITIONS:
+        return _subset_bitsets(postfix, end_positions, budget, tagged, utf8)
+    with stage("followpos"):
+        tree = build_syntax_tree(postfix)
+    return _subset_sets(tree, end_positions, budget, tagged, utf8)
+
+
+def _subset_bitsets(
+    postfix: list[str],
+    end_positions: list[int],
+    budget: Budget | None,
+    tagged: bool,
+    utf8: bool = False,
+) -> DFA:
+    """Construccion por subconjuntos con estados como bitsets de posiciones."""
+    with stage("followpos"):
+        first, pos_symbols, followpos = build_followpos_bitsets(postfix)
+    pos_classes, intervals = _leaf_classes(pos_symbols, end_positions)
+
+    masks = _label_masks(pos_classes)
+    end_mask = 0
+    for end in end_positions:
+        end_mask |= 1 << end
+    pattern_of = {end: i for i, end in enumerate(end_positions)}
+    alphabet = sorted(masks)
+
+    dfa = DFA(utf8=utf8)
+    dfa.alphabet = set(alphabet)
+    dfa.intervals = intervals
+    dfa.start_state = 0
+
+    state_masks: list[int] = [first]
+    state_map: dict[int, int] = {first: 0}
+    unmarked: deque[int] = deque([first])
+
+    with stage("subset"):
+        while unmarked:
+            current = unmarked.popleft()
+            current_id = state_map[current]
+
+            for symbol in alphabet:
+                selected = current & masks[symbol]
+                if not selected:
+                    continue
+
+                next_state = 0
+                for p in _iter_bits(selected):
+                    next_state |= followpos[p]
+                if not next_state:
+                    continue
+
+                state_id = state_map.get(next_state)
+                if state_id is None:
+                    state_id = len(state_masks)
+                    state_map[next_state] = state_id
+                    state_masks.append(next_state)
+                    unmarked.append(next_state)
+
+                dfa.transitions[(current_id, symbol)] = state_id
+
+            if budget is not None:
+                budget.check("subset", len(state_masks), len(dfa.transitions))
+
+    stats = current_stats()
+    if stats is not None:
+        record_states(stats, (mask.bit_count() for mask in state_masks))
+
+    dfa.states = [frozenset(_iter_bits(mask)) for mask in state_masks]
+    dfa.accept_states = {
+        i for i, mask in enumerate(state_masks) if mask & end_mask
+    }
+    if tagged:
+        dfa.accept_patterns = {
+            i: frozenset(pattern_of[p] for p in _iter_bits(state_masks[i] & end_mask))
+            for i in dfa.accept_states
+        }
+    return dfa
+
+
+def build_search_dfa(regex: str, utf8: bool = False) -> DFA:
+    """Construye el AFD de busqueda equivalente a .*r desde followpos.
+
+    Cada estado es el conjunto de posiciones alcanzadas despues de leer al
+    menos un simbolo; antes de cada transicion se le une firstpos(raiz), lo
+    que equivale a iniciar un intento de coincidencia en cada posicion del
+    texto. Un estado es de aceptacion si alguna coincidencia no vacia termina
+    justo ahi. El estado inicial (0) es el conjunto vacio, y todas las
+    transiciones sobre el alfabeto son explicitas; un simbolo fuera del
+    alfabeto regresa al estado inicial. En modo utf8 las coincidencias solo
+    pueden empezar en un byte inicial de caracter.
+    """
+    tree, end_positions = _parse_augmented(regex, utf8=utf8)
+    followpos = tree.followpos
+    pos_classes, intervals = _leaf_classes(tree.pos_symbols, end_positions)
+    ends = set(end_positions)
+
+    alphabet = set().union(*pos_classes.values())
+    first = tree.firstpos
+    start: frozenset[int] = frozenset()
+
+    dfa = DFA(utf8=utf8)
+    dfa.alphabet = alphabet
+    dfa.intervals = intervals
+    dfa.start_state = 0
+    dfa.states.append(start)
+    state_map: dict[frozenset[int], int] = {start: 0}
+    unmarked: deque[frozenset[int]] = deque([start])
 
-        for symbol in sorted(alphabet):
-            # Unir followpos de todas las posiciones con este simbolo
-            next_state_positions: set[int] = set()
-            for p in current:
-                if pos_symbols.get(p) == symbol:
-                    next_state_positions |= followpos.get(p, set())
+    with stage("subset"):
+        while unmarked:
+            current = unmarked.popleft()
+            current_id = state_map[current]
+            active = current | first
 
-            if not next_state_positions:
-                continue
+            for symbol in sorted(alphabet):
+                next_state_positions: set[int] = set()
+                for p in active:
+                    if symbol in pos_classes.get(p, ()):
+                        next_state_positions |= followpos.get(p, set())
 
-            next_state = frozenset(next_state_positions)
+                next_state = frozenset(next_state_positions)
 
-            if next_state not in state_map:
-                state_id = len(dfa.states)
-                state_map[next_state] = state_id
-                dfa.states.append(next_state)
-                unmarked.append(next_state)
+                if next_state not in state_map:
+                    state_id = len(dfa.states)
+                    state_map[next_state] = state_id
+                    dfa.states.append(next_state)
+                    unmarked.append(next_state)
 
-                if end_pos is not None and end_pos in next_state:
-                    dfa.accept_states.add(state_id)
+                    if not ends.isdisjoint(next_state):
+                        dfa.accept_states.add(state_id)
 
-            dfa.transitions[(current_id, symbol)] = state_map[next_state]
+                dfa.transitions[(current_id, symbol)] = state_map[next_state]
 
+    stats = current_stats()
+    if stats is not None:
+        record_states(stats, map(len, dfa.states))
     return dfa
@@ -0,0 +1,158 @@
+"""
+Busqueda tipo grep sobre multiples archivos con paralelismo por procesos.
+
+La regex se compila una sola vez (construccion directa + minimizacion) a un
+Searcher de tablas compactas. Cada archivo se mapea en memoria y se divide en
+bloques alineados a fin de linea; los bloques se reparten entre los procesos
+de un ProcessPoolExecutor, que reciben el Searcher serializado una sola vez
+al iniciar y abren su propio mmap del archivo.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from automaton.search import Searcher, compile_searcher
+
+DEFAULT_CHUNK_SIZE = 8 << 20
+
+# Searcher del proceso trabajador, asignado por _init_worker
+_worker_searcher: Searcher | None = None
+
+
+@dataclass
+class ChunkResult:
+    """Resultado de procesar un bloque de lineas de un archivo."""
+
+    path: str
+    start: int = 0
+    lines: int = 0
+    matches: int = 0
+    matched_lines: list[tuple[int, bytes]] = field(default_factory=list)
+
+
+def _init_worker(searcher: Searcher) -> None:
+    global _worker_searcher
+    _worker_searcher = searcher
+
+
+def _open_mmap(path: str) -> mmap.mmap | None:
+    """Mapea el archivo en memoria de solo lectura; None si esta vacio."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def line_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[tuple[int, int]]:
+    """Divide el archivo en intervalos [inicio, fin) que terminan en fin de linea."""
+    mm = _open_mmap(path)
+    if mm is None:
+        return []
+    with mm:
+        size = len(mm)
+        chunks: list[tuple[int, int]] = []
+        start = 0
+        while start < size:
+            end = min(start + chunk_size, size)
+            if end < size:
+                newline = mm.find(b"\n", end - 1)
+                end = size if newline < 0 else newline + 1
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+def grep_chunk(
+    path: str,
+    start: int,
+    end: int,
+    whole_line: bool = False,
+    collect: bool = True,
+    searcher: Searcher | None = None,
+) -> ChunkResult:
+    """Busca coincidencias linea por linea en el intervalo [start, end) del archivo.
+
+    mm.find ubica cada fin de linea y solo la linea actual se copia del mmap;
+    el bloque completo nunca se lee a memoria.
+    """
+    searcher = searcher or _worker_searcher
+    matches_line = searcher.anchored.match_bytes if whole_line else searcher.contains
+
+    result = ChunkResult(path=path, start=start)
+    mm = _open_mmap(path)
+    if mm is None:
+        return result
+    with mm:
+        number = 0
+        pos = start
+        while pos < end:
+            newline = mm.find(b"\n", pos, end)
+            stop = end if newline < 0 else newline
+            line = mm[pos:stop]
+            if matches_line(line):
+                result.matches += 1
+                if collect:
+                    result.matched_lines.append((number, line))
+            number += 1
+            pos = stop + 1
+    result.lines = number
+    return result
+
+
+def grep_files(
+    regex: str,
+    paths: list[str],
+    jobs: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    whole_line: bool = False,
+    collect: bool = True,
+    utf8: bool = True,
+) -> Iterator[ChunkResult]:
+    """Genera los resultados por bloque, en el orden de los archivos y las lineas.
+
+    Los numeros de linea de matched_lines se ajustan para ser relativos al
+    inicio del archivo (base 1). Por defecto (utf8=True) la regex se compila
+    sobre los bytes UTF-8: los archivos se leen como UTF-8 sin decodificarlos,
+    y `.` o `[^a]` consumen un caracter completo aunque ocupe varios bytes.
+    Con utf8=False cada byte se lee como un caracter latin-1, para archivos
+    en latin-1 o binarios. Una regex invalida lanza ValueError.
+    """
+    searcher = compile_searcher(regex, utf8)
+    tasks = [(path, start, end) for path in paths for start, end in line_chunks(path, chunk_size)]
+
+    if jobs == 1 or len(tasks) <= 1:
+        results: Iterator[ChunkResult] = (
+            grep_chunk(path, start, end, whole_line, collect, searcher)
+            for path, start, end in tasks
+        )
+        yield from _number_lines(results)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(searcher,)
+    ) as executor:
+        results = executor.map(
+            grep_chunk,
+            [path for path, _, _ in tasks],
+            [start for _, start, _ in tasks],
+            [end for _, _, end in tasks],
+            [whole_line] * len(tasks),
+            [collect] * len(tasks),
+        )
+        yield from _number_lines(results)
+
+
+def _number_lines(results: Iterator[ChunkResult]) -> Iterator[ChunkResult]:
+    """Convierte los numeros de linea relativos al bloque en absolutos."""
+    offset = 0
+    for result in results:
+        if result.start == 0:
+            offset = 0
+        result.matched_lines = [(offset + n + 1, line) for n, line in result.matched_lines]
+        offset += result.lines
+        yield result
@@ -0,0 +1,187 @@
+"""
+Construccion perezosa (bajo demanda) del AFD directo.
+
+La tabla followpos se calcula completa al compilar, pero los estados del AFD
+y sus transiciones solo se materializan cuando la simulacion los alcanza por
+primera vez. Asi, patrones como (a|b)*a(a|b)(a|b)...(a|b), cuyo AFD completo
+tiene un numero exponencial de estados, cuestan tiempo y memoria
+proporcionales a la entrada realmente procesada.
+
+Los estados ya construidos se guardan en un cache limitado por bytes. Al
+superar el presupuesto, el cache se vacia por completo y la simulacion
+continua desde el estado actual, que se vuelve a internar (la misma politica
+que el cache de AFD de RE2).
+
+Un mismo LazyDFA se puede simular desde varios hilos (compile lo guarda en
+el cache compartido): las transiciones ya calculadas se leen sin lock, y el
+calculo de una transicion nueva, que modifica el cache de estados, se hace
+con el lock tomado. Cada simulacion trabaja sobre las listas del cache
+vigente al empezar; si otro hilo lo vacia, el estado actual se vuelve a
+internar en el cache nuevo a partir de su mascara de posiciones.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+
+from automaton.charset import SymbolIndex
+from automaton.direct_dfa import _augment, _label_masks, _leaf_classes
+from automaton.stats import stage
+from automaton.syntax_tree import _iter_bits, build_followpos_bitsets
+
+DEFAULT_MAX_BYTES = 8 << 20
+
+# Marcadores en las filas de transiciones: aun no calculada / sin transicion
+UNKNOWN = -1
+DEAD = -2
+
+# Costo fijo aproximado por estado (entero, fila, entradas de diccionario)
+_STATE_OVERHEAD = 160
+
+
+@dataclass
+class LazyDFA:
+    """AFD directo cuyos estados se construyen al simularlo."""
+
+    alphabet: list[str]
+    intervals: list[tuple[int, int, str]]
+    symbol_masks: list[int]
+    followpos: list[int]
+    first: int
+    end_mask: int
+    max_bytes: int = DEFAULT_MAX_BYTES
+    # Alfabeto de bytes UTF-8: las cadenas str se codifican antes de simular
+    utf8: bool = False
+    flushes: int = 0
+    computed: int = 0
+    # Cache de estados: mascara de posiciones, fila y aceptacion por estado
+    _masks: list[int] = field(default_factory=list, repr=False)
+    _ids: dict[int, int] = field(default_factory=dict, repr=False)
+    _rows: list[list[int]] = field(default_factory=list, repr=False)
+    _accept: list[bool] = field(default_factory=list, repr=False)
+    _bytes: int = field(default=0, repr=False)
+    _start: int = field(default=0, repr=False)
+    _symbols: SymbolIndex = field(init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._symbols = SymbolIndex(self.alphabet, self.intervals)
+        self._reset()
+
+    @property
+    def num_states(self) -> int:
+        """Cantidad de estados actualmente en el cache."""
+        return len(self._masks)
+
+    @property
+    def nbytes(self) -> int:
+        """Tamano estimado del cache de estados en bytes."""
+        return self._bytes
+
+    def match(self, text: str | bytes) -> bool:
+        """Retorna True si el AFD acepta la cadena completa."""
+        if self.utf8 and isinstance(text, str):
+            text = text.encode("utf-8")
+        ascii_classes, class_of = self._symbols.ascii, self._symbols.lookup
+        with self._lock:
+            masks, rows, accept = self._masks, self._rows, self._accept
+            state = self._start
+        for c in text:
+            code = c if isinstance(c, int) else ord(c)
+            k = ascii_classes[code] if code < 128 else class_of(code)
+            if k is None:
+                return False
+            target = rows[state][k]
+            if target == UNKNOWN:
+                with self._lock:
+                    if rows is not self._rows:
+                        # Otro hilo vacio el cache: reinternar el estado actual
+                        mask = masks[state]
+                        state = self._ids.get(mask)
+                        if state is None:
+                            state = self._intern(mask)
+                    target = self._step(state, k)
+                    masks, rows, accept = self._masks, self._rows, self._accept
+            if target == DEAD:
+                return False
+            state = target
+        return accept[state]
+
+    def clear(self) -> None:
+        """Vacia el cache de estados."""
+        with self._lock:
+            self._reset()
+
+    def _reset(self) -> None:
+        # Listas nuevas: las simulaciones en curso conservan las anteriores
+        self._masks = []
+        self._ids = {}
+        self._rows = []
+        self._accept = []
+        self._bytes = 0
+        self._start = self._intern(self.first)
+
+    def _intern(self, mask: int) -> int:
+        """Agrega el estado con la mascara dada al cache y retorna su id."""
+        state = len(self._masks)
+        self._masks.append(mask)
+        self._ids[mask] = state
+        self._rows.append([UNKNOWN] * len(self.alphabet))
+        self._accept.append(bool(mask & self.end_mask))
+        self._bytes += self._cost(mask)
+        return state
+
+    def _cost(self, mask: int) -> int:
+        return _STATE_OVERHEAD + 8 * len(self.alphabet) + mask.bit_length() // 8
+
+    def _step(self, state: int, k: int) -> int:
+        """Calcula la transicion (state, k), posiblemente vaciando el cache.
+
+        Si el cache se vacia, el id retornado pertenece al cache nuevo y la
+        transicion desde state (que ya no existe) no se registra. Se llama
+        con el lock tomado.
+        """
+        self.computed += 1
+        selected = self._masks[state] & self.symbol_masks[k]
+        mask = 0
+        for p in _iter_bits(selected):
+            mask |= self.followpos[p]
+        if not mask:
+            self._rows[state][k] = DEAD
+            return DEAD
+
+        target = self._ids.get(mask)
+        if target is None:
+            if self._bytes + self._cost(mask) > self.max_bytes and len(self._masks) > 1:
+                self.flushes += 1
+                self._reset()
+                target = self._ids.get(mask)
+                return self._intern(mask) if target is None else target
+            target = self._intern(mask)
+        self._rows[state][k] = target
+        return target
+
+
+def build_lazy_dfa(
+    regex: str, max_bytes: int = DEFAULT_MAX_BYTES, utf8: bool = False
+) -> LazyDFA:
+    """Prepara followpos de la regex sin construir ningun estado mas que el inicial."""
+    postfix, end_positions = _augment(regex, utf8)
+    with stage("followpos"):
+        first, pos_symbols, followpos = build_followpos_bitsets(postfix)
+    pos_classes, intervals = _leaf_classes(pos_symbols, end_positions)
+
+    masks = _label_masks(pos_classes)
+    alphabet = sorted(masks)
+
+    return LazyDFA(
+        alphabet=alphabet,
+        intervals=intervals,
+        symbol_masks=[masks[label] for label in alphabet],
+        followpos=followpos,
+        first=first,
+        end_mask=sum(1 << end for end in end_positions),
+        max_bytes=max_bytes,
+        utf8=utf8,
+    )
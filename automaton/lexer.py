@@ -0,0 +1,168 @@
+"""
+Analizador lexico (lexer) sobre el AFD directo multipatron.
+
+Las reglas (nombre, regex) se compilan a un solo AFD minimizado con un
+marcador de fin por regla. El texto se recorre en una sola pasada hacia
+adelante: desde el inicio de cada token se avanza hasta el estado muerto
+recordando la ultima posicion de aceptacion (maximal munch). Si varias
+reglas aceptan el mismo lexema gana la que aparece primero en la lista.
+
+La entrada puede ser una cadena o un flujo leido por bloques; el estado del
+AFD se conserva entre bloques, y solo se retiene en memoria el texto desde el
+inicio del token en curso.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import chain
+from typing import BinaryIO, TextIO
+
+from automaton.compiler import compile
+from automaton.matcher import DFAMatcher
+from automaton.search import _read_chunks
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class LexError(ValueError):
+    """Ninguna regla reconoce el texto en la posicion dada."""
+
+    def __init__(self, position: int, text: str | bytes) -> None:
+        super().__init__(f"caracter inesperado {text!r} en la posicion {position}")
+        self.position = position
+
+
+@dataclass(frozen=True)
+class Token:
+    """Token reconocido: nombre de la regla, lexema y desplazamiento inicial."""
+
+    kind: str
+    text: str | bytes
+    start: int
+
+
+@dataclass
+class Lexer:
+    """Reglas compiladas a un AFD multipatron."""
+
+    names: list[str]
+    matcher: DFAMatcher
+    # Regla ganadora de cada estado (-1 si no es de aceptacion)
+    rule_of: list[int]
+    skip: frozenset[str] = frozenset()
+
+    def tokenize(self, text: str | bytes) -> Iterator[Token]:
+        """Genera los tokens del texto completo."""
+        return self._lex([text])
+
+    def scan(
+        self,
+        stream: BinaryIO | TextIO,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[Token]:
+        """Genera los tokens leyendo el flujo por bloques."""
+        return self._lex(_read_chunks(stream, chunk_size))
+
+    def _classify(self, chunk: str | bytes) -> bytes | list[int]:
+        """Traduce un bloque de texto a identificadores de clase."""
+        matcher = self.matcher
+        if isinstance(chunk, str):
+            if not chunk.isascii():
+                return [matcher.class_of(c) for c in chunk]
+            chunk = chunk.encode("ascii")
+        return matcher._classify(chunk)
+
+    def _lex(self, chunks: Iterable[str | bytes]) -> Iterator[Token]:
+        """Recorre los bloques conservando el token en curso entre ellos."""
+        table, dead, start = self.matcher.table, self.matcher.dead, self.matcher.start
+        num_classes = self.matcher.num_classes
+        rule_of, names, skip = self.rule_of, self.names, self.skip
+
+        text: str | bytes | None = None
+        # Bloques leidos que aun no se unieron a text; se unen solo cuando un
+        # token (o un error) los necesita, asi un token que abarca muchos
+        # bloques no copia el texto retenido en cada bloque
+        pending: list[str | bytes] = []
+        classes: bytearray | list[int] = bytearray() if num_classes <= 256 else []
+        base = 0  # desplazamiento absoluto de text[0] y classes[0]
+        pos = 0  # inicio del token en curso, relativo a text
+        j = 0  # siguiente posicion a leer
+        state = start
+        last_end, last_rule = 0, -1
+
+        # El bloque final None indica el fin de la entrada
+        for chunk in chain(chunks, [None]):
+            final = chunk is None
+            if not final:
+                if not chunk:
+                    continue
+                if text is None:
+                    text = chunk
+                else:
+                    pending.append(chunk)
+                classes.extend(self._classify(chunk))
+            if text is None:
+                return
+            n = len(classes)
+
+            while pos < n:
+                # Avanzar hasta el estado muerto, recordando la ultima aceptacion
+                while j < n:
+                    state = table[state + classes[j]]
+                    j += 1
+                    if state == dead:
+                        break
+                    rule = rule_of[state // num_classes]
+                    if rule >= 0:
+                        last_end, last_rule = j, rule
+                else:
+                    if not final:
+                        # El token podria continuar en el siguiente bloque
+                        break
+
+                if pending and max(last_end, pos + 1) > len(text):
+                    # Unir los bloques pendientes y descartar los tokens ya emitidos
+                    text = text[pos:] + text[:0].join(pending)
+                    pending.clear()
+                    del classes[:pos]
+                    base += pos
+                    n -= pos
+                    j -= pos
+                    last_end -= pos
+                    pos = 0
+
+                if last_rule < 0:
+                    raise LexError(base + pos, text[pos : pos + 1])
+                if names[last_rule] not in skip:
+                    yield Token(names[last_rule], text[pos:last_end], base + pos)
+
+                # El siguiente token empieza donde termino este
+                pos = j = last_end
+                state, last_rule = start, -1
+
+def compile_lexer(
+    rules: Iterable[tuple[str, str]],
+    skip: Iterable[str] = (),
+) -> Lexer:
+    """Compila una lista de reglas (nombre, regex) en orden de prioridad.
+
+    Los tokens cuyas reglas estan en skip (por ejemplo espacios o
+    comentarios) se reconocen pero no se reportan. Las reglas que aceptan la
+    cadena vacia nunca producen tokens vacios.
+    """
+    rules = list(rules)
+    names = [name for name, _ in rules]
+    matcher = compile([regex for _, regex in rules])
+    rule_of = [min(patterns, default=-1) for patterns in matcher.patterns]
+    return Lexer(names=names, matcher=matcher, rule_of=rule_of, skip=frozenset(skip))
+
+
+def tokenize(
+    rules: Iterable[tuple[str, str]],
+    text: str | bytes,
+    skip: Iterable[str] = (),
+) -> Iterator[Token]:
+    """Genera los tokens de text segun las reglas dadas."""
+    return compile_lexer(rules, skip).tokenize(text)
@@ -0,0 +1,95 @@
+"""
+Limites de recursos para la construccion y minimizacion de AFD.
+
+Una regex como (a|b)*a(a|b)^n produce un AFD con 2^(n+1) estados; en un
+servicio que compila patrones de usuarios conviene abortar antes de agotar la
+memoria. Limits fija maximos de posiciones, estados y transiciones, y un
+tiempo de reloj. Las posiciones se verifican antes de calcular followpos; los
+estados, las transiciones y el tiempo despues de procesar cada estado de la
+construccion por subconjuntos (el exceso es a lo sumo un estado por simbolo
+del alfabeto), y el tiempo tambien en cada iteracion de Hopcroft.
+
+Al superar un limite se lanza BudgetExceeded con las estadisticas parciales.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Limits:
+    """Maximos permitidos; None significa sin limite."""
+
+    max_states: int | None = None
+    max_transitions: int | None = None
+    max_positions: int | None = None
+    # Segundos de reloj desde el inicio de la operacion
+    timeout: float | None = None
+
+
+class BudgetExceeded(RuntimeError):
+    """Se supero un limite de Limits durante la construccion o la minimizacion.
+
+    `limit` es el nombre del campo de Limits que se supero y `stats` un
+    diccionario con la etapa y los contadores alcanzados hasta ese momento.
+    """
+
+    def __init__(self, limit: str, maximum: float, stats: dict) -> None:
+        super().__init__(f"limite {limit}={maximum} superado en la etapa {stats.get('stage')}")
+        self.limit = limit
+        self.maximum = maximum
+        self.stats = stats
+
+    def __reduce__(self):
+        # Permite enviar la excepcion desde un proceso trabajador
+        return type(self), (self.limit, self.maximum, self.stats)
+
+
+class Budget:
+    """Verificador de Limits con el reloj ya iniciado."""
+
+    __slots__ = ("limits", "start", "deadline")
+
+    def __init__(self, limits: Limits) -> None:
+        self.limits = limits
+        self.start = time.monotonic()
+        self.deadline = None if limits.timeout is None else self.start + limits.timeout
+
+    def check_positions(self, positions: int) -> None:
+        maximum = self.limits.max_positions
+        if maximum is not None and positions > maximum:
+            self._exceeded("max_positions", maximum, "parse", positions=positions)
+
+    def check(self, stage: str, states: int, transitions: int) -> None:
+        """Verifica estados, transiciones y tiempo; lanza BudgetExceeded si se superan."""
+        limits = self.limits
+        if limits.max_states is not None and states > limits.max_states:
+            self._exceeded("max_states", limits.max_states, stage, states=states, transitions=transitions)
+        if limits.max_transitions is not None and transitions > limits.max_transitions:
+            self._exceeded(
+                "max_transitions", limits.max_transitions, stage, states=states, transitions=transitions
+            )
+        self.check_time(stage, states=states, transitions=transitions)
+
+    def check_time(self, stage: str, **counts: int) -> None:
+        """Verifica solo el tiempo; counts se agregan a las estadisticas parciales."""
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self._exceeded("timeout", self.limits.timeout, stage, **counts)
+
+    def remaining(self) -> Limits:
+        """Limits con el tiempo que queda, para encadenar otra operacion."""
+        if self.deadline is None:
+            return self.limits
+        left = max(0.0, self.deadline - time.monotonic())
+        return Limits(self.limits.max_states, self.limits.max_transitions, self.limits.max_positions, left)
+
+    def _exceeded(self, limit: str, maximum: float, stage: str, **counts: int) -> None:
+        stats = {"stage": stage, **counts, "elapsed": time.monotonic() - self.start}
+        raise BudgetExceeded(limit, maximum, stats)
+
+
+def budget_of(limits: Limits | None) -> Budget | None:
+    """Inicia el reloj de los limites dados (None si no hay limites)."""
+    return None if limits is None else Budget(limits)
@@ -0,0 +1,278 @@
+"""
+Matcher compilado: traduce un AFD a una tabla de transiciones densa de enteros.
+
+El AFD se reduce a:
+1. Un mapeo simbolo -> clase de equivalencia (simbolos con la misma columna
+   en la tabla comparten clase; la clase 0 agrupa los simbolos fuera del alfabeto).
+   Los simbolos que son clases de caracteres se guardan como intervalos
+   (lo, hi, clase) de code points
+2. Una tabla plana `array('i')` de (estados + 1) x clases, donde la ultima
+   fila es un estado muerto explicito que se transiciona a si mismo
+3. Un arreglo de banderas de aceptacion por estado y, en un AFD
+   multipatron, el conjunto de patrones que acepta cada estado
+
+Las entradas de la tabla guardan el desplazamiento de fila (estado * clases)
+en lugar del numero de estado, asi el ciclo de simulacion solo suma y no
+multiplica por cada simbolo.
+
+Un matcher compilado en modo utf8 (ver automaton/utf8.py) tiene un alfabeto
+de bytes: match_bytes recorre directamente la codificacion UTF-8, y match
+codifica las cadenas str antes de simular.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from automaton.charset import find_interval
+from automaton.compact_dfa import CompactDFA
+from automaton.direct_dfa import DFA
+from automaton.stats import stage
+
+# Bytes por bloque al clasificar buffers que no son bytes ni bytearray
+_BUFFER_CHUNK = 1 << 16
+
+
+@dataclass
+class DFAMatcher:
+    """AFD compilado a una tabla de transiciones densa."""
+
+    symbol_classes: dict[str, int] = field(default_factory=dict)
+    byte_classes: bytes | list[int] = bytes(256)
+    num_classes: int = 1
+    num_states: int = 0
+    table: array = field(default_factory=lambda: array("i"))
+    accept: bytearray = field(default_factory=bytearray)
+    start: int = 0
+    dead: int = 0
+    ranges: list[tuple[int, int, int]] = field(default_factory=list)
+    # Solo en AFD multipatron: patrones aceptados por estado (muerto incluido)
+    patterns: list[frozenset[int]] = field(default_factory=list)
+    # Alfabeto de bytes UTF-8 en lugar de code points
+    utf8: bool = False
+
+    def match(self, input_string: str) -> bool:
+        """Retorna True si la cadena completa es aceptada por el AFD."""
+        if self.utf8:
+            return self.match_bytes(input_string.encode("utf-8"))
+        if input_string.isascii():
+            return self.match_bytes(input_string.encode("ascii"))
+
+        table = self.table
+        get = self.symbol_classes.get
+        class_of = self.class_of
+        dead = self.dead
+        state = self.start
+        for symbol in input_string:
+            cls = get(symbol)
+            state = table[state + (class_of(symbol) if cls is None else cls)]
+            if state == dead:
+                return False
+        return bool(self.accept[state // self.num_classes])
+
+    def class_of(self, char: str) -> int:
+        """Clase del caracter (0 si no pertenece al alfabeto)."""
+        cls = self.symbol_classes.get(char)
+        if cls is None:
+            cls = find_interval(self.ranges, ord(char))
+        return 0 if cls is None else cls
+
+    def class_intervals(self) -> list[tuple[int, int, int]]:
+        """Todos los intervalos (lo, hi, clase) ordenados, simbolos simples incluidos."""
+        singles = [
+            (ord(s), ord(s), c) for s, c in self.symbol_classes.items() if len(s) == 1
+        ]
+        return sorted(singles + list(self.ranges))
+
+    def match_bytes(self, data: bytes | bytearray | memoryview) -> bool:
+        """Retorna True si la secuencia de bytes es aceptada por el AFD.
+
+        Cada byte se interpreta como el caracter con el mismo codigo (latin-1),
+        o como byte de UTF-8 si el matcher es utf8. Acepta cualquier objeto con
+        el protocolo de buffer (memoryview, mmap, array), que se recorre por
+        bloques sin copiarlo completo.
+        """
+        table = self.table
+        dead = self.dead
+        state = self.start
+        for classes in self._class_chunks(data):
+            for cls in classes:
+                state = table[state + cls]
+                if state == dead:
+                    return False
+        return bool(self.accept[state // self.num_classes])
+
+    def match_patterns(self, input_string: str | bytes) -> frozenset[int]:
+        """Indices de los patrones que aceptan la cadena completa.
+
+        Para un AFD de un solo patron retorna {0} si la cadena es aceptada.
+        """
+        if isinstance(input_string, str):
+            if self.utf8:
+                chunks = self._class_chunks(input_string.encode("utf-8"))
+            elif input_string.isascii():
+                chunks = [self._classify(input_string.encode("ascii"))]
+            else:
+                chunks = [[self.class_of(c) for c in input_string]]
+        else:
+            chunks = self._class_chunks(input_string)
+
+        table = self.table
+        dead = self.dead
+        state = self.start
+        for classes in chunks:
+            for cls in classes:
+                state = table[state + cls]
+                if state == dead:
+                    return frozenset()
+        s = state // self.num_classes
+        if self.patterns:
+            return self.patterns[s]
+        return frozenset({0}) if self.accept[s] else frozenset()
+
+    def _classify(self, data: bytes | bytearray) -> bytes | list[int]:
+        """Traduce bytes a identificadores de clase."""
+        if self.num_classes <= 256:
+            return data.translate(self.byte_classes)
+        byte_classes = self.byte_classes
+        return [byte_classes[b] for b in data]
+
+    def _class_chunks(self, data) -> Iterator[bytes | list[int]]:
+        """Clases de los bytes del buffer, por bloques.
+
+        bytes y bytearray se traducen de una vez; los demas buffers se leen
+        en bloques de _BUFFER_CHUNK bytes a traves de una memoryview.
+        """
+        if isinstance(data, (bytes, bytearray)):
+            yield self._classify(data)
+            return
+        with memoryview(data) as view, view.cast("B") as flat:
+            for i in range(0, len(flat), _BUFFER_CHUNK):
+                yield self._classify(flat[i : i + _BUFFER_CHUNK].tobytes())
+
+    def state_of(self, offset: int) -> int:
+        """Convierte un desplazamiento de fila al numero de estado."""
+        return offset // self.num_classes
+
+    @property
+    def nbytes(self) -> int:
+        """Tamano aproximado en bytes de la tabla de transiciones."""
+        return self.table.itemsize * len(self.table) + len(self.accept)
+
+    def __getstate__(self) -> dict:
+        # load_matcher deja la tabla y las banderas como vistas del buffer
+        # (memoryview), que no se serializan; se copian por valor
+        state = dict(self.__dict__)
+        if isinstance(self.table, memoryview):
+            state["table"] = array("i", self.table)
+        if isinstance(self.accept, memoryview):
+            state["accept"] = bytearray(self.accept)
+        return state
+
+
+def _column(dfa: DFA | CompactDFA, symbol: str) -> tuple[int, ...]:
+    """Destinos de todos los estados con el simbolo (-1 si no hay transicion)."""
+    if isinstance(dfa, CompactDFA):
+        k = dfa._columns.get(symbol)
+        if k is None:
+            return (-1,) * dfa.num_states
+        return tuple(dfa.table[k :: len(dfa.alphabet)])
+    return tuple(dfa.transitions.get((s, symbol), -1) for s in range(len(dfa.states)))
+
+
+def _transitions(dfa: DFA | CompactDFA):
+    """Genera las transiciones (estado, simbolo, destino) del AFD."""
+    if isinstance(dfa, CompactDFA):
+        width = len(dfa.alphabet)
+        for i, t in enumerate(dfa.table):
+            if t >= 0:
+                yield i // width, dfa.alphabet[i % width], t
+    else:
+        for (s, symbol), t in dfa.transitions.items():
+            yield s, symbol, t
+
+
+def _symbol_partition(*dfas: DFA | CompactDFA) -> dict[str, int]:
+    """Agrupa los simbolos cuyas columnas son identicas en todos los AFD dados."""
+    alphabet = set().union(*(dfa.alphabet for dfa in dfas))
+    column_ids: dict[tuple[int, ...], int] = {}
+    classes: dict[str, int] = {}
+    for symbol in sorted(alphabet):
+        column = tuple(t for dfa in dfas for t in _column(dfa, symbol))
+        if column not in column_ids:
+            column_ids[column] = len(column_ids) + 1
+        classes[symbol] = column_ids[column]
+    return classes
+
+
+def _byte_classes(
+    symbol_classes: dict[str, int],
+    num_classes: int,
+    ranges: list[tuple[int, int, int]] = (),
+) -> bytes | list[int]:
+    """Tabla de 256 entradas byte -> clase (el byte se lee como latin-1)."""
+    byte_table = [0] * 256
+    for lo, hi, cls in ranges:
+        for code in range(lo, min(hi, 255) + 1):
+            byte_table[code] = cls
+    for symbol, cls in symbol_classes.items():
+        if len(symbol) == 1 and ord(symbol) < 256:
+            byte_table[ord(symbol)] = cls
+    return bytes(byte_table) if num_classes <= 256 else byte_table
+
+
+def compile_matcher(
+    dfa: DFA | CompactDFA,
+    default: int | None = None,
+    symbol_classes: dict[str, int] | None = None,
+    utf8: bool | None = None,
+) -> DFAMatcher:
+    """Compila el AFD (directo o minimizado) a un matcher de tabla densa.
+
+    default es el estado destino de las transiciones ausentes y de los simbolos
+    fuera del alfabeto (por defecto el estado muerto). symbol_classes permite
+    compartir un mismo mapeo de clases entre varios AFD. Acepta tambien un
+    CompactDFA, cuya tabla se lee sin convertirla a DFA. utf8 indica que el
+    AFD se construyo en modo de bytes (build_direct_dfa(..., utf8=True));
+    por defecto se toma de dfa.utf8.
+    """
+    if utf8 is None:
+        utf8 = dfa.utf8
+    with stage("compile"):
+        n = dfa.num_states if isinstance(dfa, CompactDFA) else len(dfa.states)
+        if symbol_classes is None:
+            symbol_classes = _symbol_partition(dfa)
+        num_classes = 1 + max(symbol_classes.values(), default=0)
+        dead = n * num_classes
+        fill = dead if default is None else default * num_classes
+
+        # Todas las celdas apuntan al destino por defecto hasta que se llenen
+        table = array("i", [fill]) * (n * num_classes) + array("i", [dead]) * num_classes
+        for s, symbol, t in _transitions(dfa):
+            table[s * num_classes + symbol_classes[symbol]] = t * num_classes
+
+        accept = bytearray(n + 1)
+        for s in dfa.accept_states:
+            accept[s] = 1
+
+        ranges = [(lo, hi, symbol_classes[label]) for lo, hi, label in dfa.intervals]
+
+        patterns: list[frozenset[int]] = []
+        if dfa.accept_patterns:
+            patterns = [dfa.accept_patterns.get(s, frozenset()) for s in range(n + 1)]
+
+        return DFAMatcher(
+            symbol_classes=symbol_classes,
+            byte_classes=_byte_classes(symbol_classes, num_classes, ranges),
+            ranges=ranges,
+            num_classes=num_classes,
+            num_states=n,
+            table=table,
+            accept=accept,
+            start=dfa.start_state * num_classes if n else dead,
+            dead=dead,
+            patterns=patterns,
+            utf8=utf8,
+        )
@@ -1,109 +1,296 @@
 """
 Minimizacion de AFD usando el algoritmo de refinamiento de particiones
 de Hopcroft. Produce un AFD equivalente con el numero minimo de estados,
-fusionando estados indistinguibles.
+fusionando estados indistinguibles. En un AFD multipatron la particion
+inicial separa los estados de aceptacion por conjunto de patrones.
+
+Estructuras usadas para el tiempo O(k n log n):
+1. Un estado muerto explicito que completa las transiciones ausentes
+2. Un indice inverso de transiciones por simbolo (formato CSR)
+3. Bloques contiguos en un arreglo de estados, con un marcador de division
+   por bloque; marcar un estado es un intercambio O(1) dentro de su bloque
+4. Una cola (deque) de bloques pendientes, con bandera de pertenencia
+
+minimize_compact aplica el mismo refinamiento directamente sobre la tabla
+plana de un CompactDFA, sin conjuntos de posiciones ni diccionario de
+transiciones; junto con build_compact_dfa forma el camino de poca memoria
+de compile(low_memory=True).
 """
 
 from __future__ import annotations
 
+from array import array
+from collections import deque
+from collections.abc import Hashable, Sequence
+
+from automaton.compact_dfa import CompactDFA, _accept_bitmap
 from automaton.direct_dfa import DFA
+from automaton.limits import Budget, Limits, budget_of
+from automaton.stats import current_stats, stage
+
+
+def _inverse_index(
+    delta: Sequence[Sequence[int]], num_states: int
+) -> list[tuple[array, array]]:
+    """Para cada simbolo, (offsets, sources): los predecesores de t son
+    sources[offsets[t]:offsets[t + 1]]."""
+    inverse = []
+    for row in delta:
+        offsets = array("i", [0]) * (num_states + 1)
+        for t in row:
+            offsets[t + 1] += 1
+        for t in range(num_states):
+            offsets[t + 1] += offsets[t]
+        fill = offsets[:-1]
+        sources = array("i", [0]) * num_states
+        for s, t in enumerate(row):
+            sources[fill[t]] = s
+            fill[t] += 1
+        inverse.append((offsets, sources))
+    return inverse
+
+
+def _refine(
+    delta: Sequence[Sequence[int]],
+    labels: list[Hashable],
+    num_states: int,
+    budget: Budget | None = None,
+) -> list[int]:
+    """Refina la particion inicial por etiqueta y retorna el bloque de cada estado.
+
+    La etiqueta de un estado es su bandera de aceptacion o, en un AFD
+    multipatron, el conjunto de patrones que acepta.
+    """
+    inverse = _inverse_index(delta, num_states)
+
+    # Particion inicial: un bloque contiguo por etiqueta
+    groups: dict[Hashable, list[int]] = {}
+    for s in range(num_states):
+        groups.setdefault(labels[s], []).append(s)
+    elems: list[int] = []
+    first: list[int] = []
+    end: list[int] = []
+    block_of = [0] * num_states
+    for b, members in enumerate(groups.values()):
+        first.append(len(elems))
+        elems.extend(members)
+        end.append(len(elems))
+        for s in members:
+            block_of[s] = b
+    loc = [0] * num_states
+    for i, s in enumerate(elems):
+        loc[s] = i
+    marked = [0] * len(first)
+
+    # Basta con encolar todos los bloques iniciales menos el mas grande
+    largest = max(range(len(first)), key=lambda b: end[b] - first[b])
+    worklist: deque[int] = deque(b for b in range(len(first)) if b != largest)
+    in_worklist = [b != largest for b in range(len(first))]
+
+    while worklist:
+        if budget is not None:
+            budget.check_time("minimize", states=num_states, blocks=len(first))
+        splitter_id = worklist.popleft()
+        in_worklist[splitter_id] = False
+        splitter = elems[first[splitter_id] : end[splitter_id]]
+
+        for offsets, sources in inverse:
+            # Marcar los predecesores del splitter moviendolos al frente de su bloque
+            touched: list[int] = []
+            for t in splitter:
+                for i in range(offsets[t], offsets[t + 1]):
+                    s = sources[i]
+                    b = block_of[s]
+                    m = first[b] + marked[b]
+                    if loc[s] < m:
+                        continue
+                    if marked[b] == 0:
+                        touched.append(b)
+                    other = elems[m]
+                    elems[m], elems[loc[s]] = s, other
+                    loc[other], loc[s] = loc[s], m
+                    marked[b] += 1
+
+            for b in touched:
+                m = marked[b]
+                marked[b] = 0
+                size = end[b] - first[b]
+                if m == size:
+                    continue
+
+                # Se divide el bloque; el nuevo id queda con la parte mas pequena
+                new_id = len(first)
+                if m <= size - m:
+                    first.append(first[b])
+                    end.append(first[b] + m)
+                    first[b] += m
+                else:
+                    first.append(first[b] + m)
+                    end.append(end[b])
+                    end[b] = first[b] + m
+                marked.append(0)
+                for i in range(first[new_id], end[new_id]):
+                    block_of[elems[i]] = new_id
+
+                # Si b estaba pendiente, ambas partes lo estan; si no, la menor
+                in_worklist.append(True)
+                worklist.append(new_id)
+
+    return block_of
+
 
+def minimize_dfa(dfa: DFA, limits: Limits | None = None) -> DFA:
+    """Minimiza el AFD y retorna uno nuevo equivalente con menos estados.
 
-def minimize_dfa(dfa: DFA) -> DFA:
-    """Minimiza el AFD y retorna uno nuevo equivalente con menos estados."""
+    Con limits solo se verifica el tiempo (la minimizacion no agrega estados)
+    y se lanza BudgetExceeded si se agota.
+    """
+    budget = budget_of(limits)
     n = len(dfa.states)
     if n == 0:
         return dfa
 
-    all_states = set(range(n))
-    non_accept = all_states - dfa.accept_states
+    with stage("minimize"):
+        # Completar el AFD con un estado muerto explicito (indice n)
+        alphabet = sorted(dfa.alphabet)
+        dead = n
+        delta = []
+        for symbol in alphabet:
+            row = [dfa.transitions.get((s, symbol), dead) for s in range(n)]
+            row.append(dead)
+            delta.append(row)
+        accepting = [s in dfa.accept_states for s in range(n)] + [False]
 
-    # Particion inicial: estados de aceptacion vs no aceptacion
-    partitions: list[set[int]] = []
-    if dfa.accept_states:
-        partitions.append(set(dfa.accept_states))
-    if non_accept:
-        partitions.append(non_accept)
+        # En un AFD multipatron, estados que aceptan patrones distintos son distinguibles
+        labels: list[Hashable] = accepting
+        if dfa.accept_patterns:
+            labels = [dfa.accept_patterns.get(s, frozenset()) for s in range(n)]
+            labels.append(frozenset())
 
-    worklist: list[set[int]] = list(partitions)
-    alphabet = sorted(dfa.alphabet)
+        block_of = _refine(delta, labels, n + 1, budget)
+        dead_block = block_of[dead]
 
-    while worklist:
-        splitter = worklist.pop(0)
+        # Numerar los bloques en orden BFS desde el inicial (que queda como 0);
+        # los bloques equivalentes al estado muerto se descartan
+        min_dfa = DFA(utf8=dfa.utf8)
+        min_dfa.alphabet = set(dfa.alphabet)
+        min_dfa.intervals = list(dfa.intervals)
+        min_dfa.start_state = 0
 
-        for symbol in alphabet:
-            # Estados que transicionan hacia el splitter con este simbolo
-            predecessors: set[int] = set()
-            for s in all_states:
-                target = dfa.transitions.get((s, symbol))
-                if target is not None and target in splitter:
-                    predecessors.add(s)
-
-            if not predecessors:
+        start_block = block_of[dfa.start_state]
+        representative = {start_block: dfa.start_state}
+        number = {start_block: 0}
+        queue: deque[int] = deque([start_block])
+        while queue:
+            block = queue.popleft()
+            s = representative[block]
+            idx = number[block]
+            if accepting[s]:
+                min_dfa.accept_states.add(idx)
+                if s in dfa.accept_patterns:
+                    min_dfa.accept_patterns[idx] = dfa.accept_patterns[s]
+            if block == dead_block:
                 continue
+            for k, symbol in enumerate(alphabet):
+                t = delta[k][s]
+                target = block_of[t]
+                if target == dead_block:
+                    continue
+                if target not in number:
+                    number[target] = len(number)
+                    representative[target] = t
+                    queue.append(target)
+                min_dfa.transitions[(idx, symbol)] = number[target]
 
-            new_partitions: list[set[int]] = []
-            for group in partitions:
-                intersection = group & predecessors
-                difference = group - predecessors
-
-                if intersection and difference:
-                    # Se divide el grupo en dos
-                    new_partitions.append(intersection)
-                    new_partitions.append(difference)
-
-                    if group in worklist:
-                        worklist.remove(group)
-                        worklist.append(intersection)
-                        worklist.append(difference)
-                    else:
-                        # Agregar el subgrupo mas pequeno al worklist
-                        if len(intersection) <= len(difference):
-                            worklist.append(intersection)
-                        else:
-                            worklist.append(difference)
-                else:
-                    new_partitions.append(group)
+        min_dfa.states = [frozenset() for _ in number]
 
-            partitions = new_partitions
+    stats = current_stats()
+    if stats is not None:
+        # Cada division agrega un bloque a los de la particion inicial
+        stats.hopcroft_splits += max(block_of) + 1 - len(set(labels))
+        stats.min_states += len(number)
+    return min_dfa
 
-    # Construir el AFD minimizado
-    state_to_partition: dict[int, int] = {}
-    for idx, group in enumerate(partitions):
-        for s in group:
-            state_to_partition[s] = idx
 
-    min_dfa = DFA()
-    min_dfa.alphabet = set(dfa.alphabet)
-    min_dfa.states = [frozenset() for _ in partitions]
-    min_dfa.start_state = state_to_partition[dfa.start_state]
+def minimize_compact(dfa: CompactDFA, limits: Limits | None = None) -> CompactDFA:
+    """Minimiza un CompactDFA trabajando solo sobre arreglos planos.
 
-    for idx, group in enumerate(partitions):
-        if group & dfa.accept_states:
-            min_dfa.accept_states.add(idx)
+    Produce los mismos estados, en el mismo orden, que
+    minimize_dfa(dfa.to_dfa()), pero sin materializar el diccionario de
+    transiciones; las columnas de la tabla se completan con el estado muerto
+    (indice n) en arreglos array('i').
+    """
+    budget = budget_of(limits)
+    n = dfa.num_states
+    if n == 0:
+        return dfa
 
-    for idx, group in enumerate(partitions):
-        representative = next(iter(group))
-        for symbol in alphabet:
-            target = dfa.transitions.get((representative, symbol))
-            if target is not None:
-                min_dfa.transitions[(idx, symbol)] = state_to_partition[target]
+    with stage("minimize"):
+        width = len(dfa.alphabet)
+        dead = n
+        delta = []
+        for k in range(width):
+            row = dfa.table[k::width]
+            for s in range(n):
+                if row[s] < 0:
+                    row[s] = dead
+            row.append(dead)
+            delta.append(row)
+        accepting = [dfa.is_accepting(s) for s in range(n)] + [False]
 
-    # Renumerar para que el estado inicial sea 0
-    if min_dfa.start_state != 0:
-        old_start = min_dfa.start_state
-        remap = {i: i for i in range(len(partitions))}
-        remap[0] = old_start
-        remap[old_start] = 0
+        labels: list[Hashable] = accepting
+        if dfa.accept_patterns:
+            labels = [dfa.accept_patterns.get(s, frozenset()) for s in range(n)]
+            labels.append(frozenset())
 
-        new_transitions: dict[tuple[int, str], int] = {}
-        for (s, sym), t in min_dfa.transitions.items():
-            new_transitions[(remap[s], sym)] = remap[t]
+        block_of = _refine(delta, labels, n + 1, budget)
+        del delta
+        dead_block = block_of[dead]
 
-        new_accept = {remap[s] for s in min_dfa.accept_states}
+        # Misma numeracion BFS que minimize_dfa; las filas se escriben en orden
+        table = array("i")
+        accept_states: list[int] = []
+        accept_patterns: dict[int, frozenset[int]] = {}
+        start_block = block_of[dfa.start_state]
+        representative = {start_block: dfa.start_state}
+        number = {start_block: 0}
+        queue: deque[int] = deque([start_block])
+        while queue:
+            block = queue.popleft()
+            s = representative[block]
+            idx = number[block]
+            if accepting[s]:
+                accept_states.append(idx)
+                if s in dfa.accept_patterns:
+                    accept_patterns[idx] = dfa.accept_patterns[s]
+            if block == dead_block:
+                table.extend(array("i", [-1]) * width)
+                continue
+            row = s * width
+            for k in range(width):
+                t = dfa.table[row + k]
+                target = dead_block if t < 0 else block_of[t]
+                if target == dead_block:
+                    table.append(-1)
+                    continue
+                if target not in number:
+                    number[target] = len(number)
+                    representative[target] = t
+                    queue.append(target)
+                table.append(number[target])
 
-        min_dfa.transitions = new_transitions
-        min_dfa.accept_states = new_accept
-        min_dfa.start_state = 0
+        min_dfa = CompactDFA(
+            alphabet=list(dfa.alphabet),
+            num_states=len(number),
+            table=table,
+            accept=_accept_bitmap(accept_states, len(number)),
+            intervals=list(dfa.intervals),
+            accept_patterns=accept_patterns,
+            utf8=dfa.utf8,
+        )
 
+    stats = current_stats()
+    if stats is not None:
+        stats.hopcroft_splits += max(block_of) + 1 - len(set(labels))
+        stats.min_states += len(number)
     return min_dfa
@@ -0,0 +1,100 @@
+"""
+Simulacion del AFN de posiciones (Glushkov) sin determinizar.
+
+La tabla followpos ya es un AFN: sus estados son las posiciones del arbol y
+de la posicion p se pasa a las de followpos(p). PositionNFA simula ese AFN
+con un conjunto de estados a la vez, representado como un entero bitset (el
+mismo que usa build_direct_dfa_bitset como estado del AFD): por cada simbolo
+se seleccionan las posiciones activas que lo aceptan y se unen sus filas
+followpos.
+
+Construirlo cuesta solo el calculo de followpos, y cada simbolo de la entrada
+cuesta a lo sumo m operaciones sobre bitsets de m bits, de modo que una
+simulacion es O(n*m) garantizado sin importar cuantos estados tendria el
+AFD. Conviene para patrones que se evaluan sobre poca entrada; para mucha
+entrada, el AFD (completo o perezoso) amortiza su construccion.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from automaton.charset import SymbolIndex
+from automaton.direct_dfa import _augment, _label_masks, _leaf_classes
+from automaton.stats import stage
+from automaton.syntax_tree import build_followpos_bitsets
+
+
+@dataclass
+class PositionNFA:
+    """AFN de posiciones con conjuntos de estados como bitsets."""
+
+    alphabet: list[str]
+    intervals: list[tuple[int, int, str]]
+    # Posiciones cuyo simbolo cubre cada etiqueta del alfabeto
+    symbol_masks: list[int]
+    followpos: list[int]
+    first: int
+    # Posicion del marcador # de cada patron
+    end_positions: list[int]
+    end_mask: int = 0
+    _symbols: SymbolIndex = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.end_mask = sum(1 << end for end in self.end_positions)
+        self._symbols = SymbolIndex(self.alphabet, self.intervals)
+
+    @property
+    def num_positions(self) -> int:
+        return len(self.followpos) - 1
+
+    def match(self, text: str | bytes) -> bool:
+        """Retorna True si el AFN acepta la cadena completa."""
+        return bool(self._run(text) & self.end_mask)
+
+    def match_patterns(self, text: str | bytes) -> frozenset[int]:
+        """Indices de los patrones que aceptan la cadena completa."""
+        state = self._run(text)
+        return frozenset(i for i, end in enumerate(self.end_positions) if state >> end & 1)
+
+    def _run(self, text: str | bytes) -> int:
+        """Conjunto de posiciones alcanzado al final de la entrada (0 si se vacia)."""
+        follow, masks = self.followpos, self.symbol_masks
+        ascii_classes, class_of = self._symbols.ascii, self._symbols.lookup
+        codes = text if isinstance(text, (bytes, bytearray)) else map(ord, text)
+
+        state = self.first
+        for code in codes:
+            k = ascii_classes[code] if code < 128 else class_of(code)
+            if k is None:
+                return 0
+            selected = state & masks[k]
+            # Union de followpos de las posiciones seleccionadas, bit por bit
+            state = 0
+            while selected:
+                low = selected & -selected
+                state |= follow[low.bit_length() - 1]
+                selected ^= low
+            if not state:
+                return 0
+        return state
+
+
+def build_position_nfa(regex: str | list[str]) -> PositionNFA:
+    """Calcula followpos de la regex (o lista de regex) sin construir el AFD."""
+    postfix, end_positions = _augment(regex)
+    with stage("followpos"):
+        first, pos_symbols, followpos = build_followpos_bitsets(postfix)
+    pos_classes, intervals = _leaf_classes(pos_symbols, end_positions)
+
+    masks = _label_masks(pos_classes)
+    alphabet = sorted(masks)
+
+    return PositionNFA(
+        alphabet=alphabet,
+        intervals=intervals,
+        symbol_masks=[masks[label] for label in alphabet],
+        followpos=followpos,
+        first=first,
+        end_positions=end_positions,
+    )
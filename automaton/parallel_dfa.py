@@ -0,0 +1,177 @@
+"""
+Construccion por subconjuntos en paralelo, nivel por nivel.
+
+build_compact_dfa procesa los estados uno a uno en un solo proceso. Para
+patrones con 10^5-10^6 estados, build_compact_dfa_parallel recorre el AFD por
+niveles del BFS: la frontera (los estados creados en el nivel anterior) se
+divide en bloques y cada proceso trabajador calcula, para cada estado de su
+bloque y cada simbolo, el OR de las filas followpos. El proceso principal
+interna los sucesores en la tabla central de estados, en el orden de los
+bloques, y los nuevos forman la siguiente frontera.
+
+Como los bloques se internan en orden, la numeracion de estados es la misma
+que la de build_compact_dfa. Los trabajadores reciben followpos y las
+mascaras de simbolos una sola vez, al iniciar el pool; cada bloque viaja
+como una lista de enteros y regresa con sus sucesores sin repetir. Las
+fronteras pequenas se expanden en el proceso principal, donde enviar el
+trabajo costaria mas que hacerlo. Con mas de BITSET_MAX_POSITIONS posiciones
+cada bitset pesa demasiado para enviarlo a los trabajadores, y se usa la
+construccion por conjuntos de build_compact_dfa en un solo proceso.
+"""
+
+from __future__ import annotations
+
+import os
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from automaton.compact_dfa import CompactDFA, _accept_bitmap, build_compact_dfa
+from automaton.direct_dfa import BITSET_MAX_POSITIONS, _augment, _label_masks, _leaf_classes
+from automaton.limits import Limits, budget_of
+from automaton.stats import current_stats, record_states, stage
+from automaton.syntax_tree import _iter_bits, build_followpos_bitsets
+
+# Fronteras con menos estados que esto se expanden sin usar el pool
+PARALLEL_MIN_FRONTIER = 512
+# Bloques por trabajador en cada nivel (mas bloques reparten mejor la carga)
+CHUNKS_PER_WORKER = 4
+
+# Tablas del proceso trabajador, fijadas por _init_worker
+_followpos: list[int] = []
+_symbol_masks: list[int] = []
+
+
+def _init_worker(followpos: list[int], symbol_masks: list[int]) -> None:
+    global _followpos, _symbol_masks
+    _followpos = followpos
+    _symbol_masks = symbol_masks
+
+
+def _expand(
+    chunk: list[int], followpos: list[int], symbol_masks: list[int]
+) -> tuple[list[int], array]:
+    """Sucesores de un bloque de estados.
+
+    Retorna los sucesores distintos del bloque y una tabla con una fila por
+    estado: indice en esa lista, o -1 si no hay transicion.
+    """
+    successors: list[int] = []
+    local: dict[int, int] = {}
+    rows = array("i")
+    for current in chunk:
+        for mask in symbol_masks:
+            next_state = 0
+            for p in _iter_bits(current & mask):
+                next_state |= followpos[p]
+            if not next_state:
+                rows.append(-1)
+                continue
+            index = local.get(next_state)
+            if index is None:
+                index = local[next_state] = len(successors)
+                successors.append(next_state)
+            rows.append(index)
+    return successors, rows
+
+
+def _expand_worker(chunk: list[int]) -> tuple[list[int], array]:
+    return _expand(chunk, _followpos, _symbol_masks)
+
+
+def _chunks(frontier: list[int], workers: int) -> list[list[int]]:
+    size = -(-len(frontier) // (workers * CHUNKS_PER_WORKER))
+    return [frontier[i : i + size] for i in range(0, len(frontier), size)]
+
+
+def build_compact_dfa_parallel(
+    regex: str | list[str],
+    workers: int | None = None,
+    keep_positions: bool = False,
+    limits: Limits | None = None,
+    utf8: bool = False,
+) -> CompactDFA:
+    """Construye el mismo CompactDFA que build_compact_dfa con varios procesos.
+
+    workers es la cantidad de procesos (por defecto os.cpu_count()); con 1
+    no se crea pool. Los limites se verifican despues de internar cada
+    bloque. utf8 tiene el mismo sentido que en build_direct_dfa.
+    """
+    workers = workers or os.cpu_count() or 1
+    budget = budget_of(limits)
+    postfix, end_positions = _augment(regex, utf8)
+    if budget is not None:
+        budget.check_positions(end_positions[-1])
+    if end_positions[-1] > BITSET_MAX_POSITIONS:
+        return build_compact_dfa(regex, keep_positions, limits, utf8)
+    with stage("followpos"):
+        first, pos_symbols, followpos = build_followpos_bitsets(postfix)
+    pos_classes, intervals = _leaf_classes(pos_symbols, end_positions)
+
+    masks = _label_masks(pos_classes)
+    alphabet = sorted(masks)
+    symbol_masks = [masks[symbol] for symbol in alphabet]
+
+    table = array("i")
+    state_masks: list[int] = [first]
+    state_map: dict[int, int] = {first: 0}
+
+    pool: Executor | None = None
+    try:
+        with stage("subset"):
+            frontier = [first]
+            while frontier:
+                if workers > 1 and len(frontier) >= PARALLEL_MIN_FRONTIER:
+                    if pool is None:
+                        pool = ProcessPoolExecutor(
+                            workers, initializer=_init_worker, initargs=(followpos, symbol_masks)
+                        )
+                    results = pool.map(_expand_worker, _chunks(frontier, workers))
+                else:
+                    results = [_expand(frontier, followpos, symbol_masks)]
+
+                level_start = len(state_masks)
+                for successors, rows in results:
+                    # Indice local del bloque -> id global del estado
+                    ids = []
+                    for next_state in successors:
+                        state_id = state_map.get(next_state)
+                        if state_id is None:
+                            state_id = len(state_masks)
+                            state_map[next_state] = state_id
+                            state_masks.append(next_state)
+                        ids.append(state_id)
+                    table.extend([-1 if i < 0 else ids[i] for i in rows])
+                    if budget is not None:
+                        budget.check("subset", len(state_masks), len(table))
+                frontier = state_masks[level_start:]
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    stats = current_stats()
+    if stats is not None:
+        record_states(stats, (mask.bit_count() for mask in state_masks))
+
+    end_mask = 0
+    for end in end_positions:
+        end_mask |= 1 << end
+    pattern_of = {end: i for i, end in enumerate(end_positions)}
+    accepting = [s for s, mask in enumerate(state_masks) if mask & end_mask]
+
+    accept_patterns: dict[int, frozenset[int]] = {}
+    if not isinstance(regex, str):
+        accept_patterns = {
+            s: frozenset(pattern_of[p] for p in _iter_bits(state_masks[s] & end_mask))
+            for s in accepting
+        }
+
+    return CompactDFA(
+        alphabet=alphabet,
+        num_states=len(state_masks),
+        table=table,
+        accept=_accept_bitmap(accepting, len(state_masks)),
+        intervals=intervals,
+        accept_patterns=accept_patterns,
+        states=[frozenset(_iter_bits(m)) for m in state_masks] if keep_positions else None,
+        utf8=utf8,
+    )
@@ -0,0 +1,242 @@
+"""
+Busqueda de coincidencias en textos grandes con semantica leftmost-longest.
+
+Se usan dos tablas compiladas que comparten el mismo mapeo de clases:
+1. El AFD de busqueda (.*r) construido desde followpos, que detecta en una
+   sola pasada hacia adelante el primer punto donde termina una coincidencia
+2. El AFD anclado (r minimizado), que determina el inicio mas a la izquierda
+   y el final mas largo de esa coincidencia. El resultado de los recorridos
+   anclados largos se memoriza por (posicion, estado): un inicio posterior
+   que llega al mismo estado en la misma posicion lo reutiliza en lugar de
+   volver a recorrer el texto, asi la busqueda es lineal aunque un inicio
+   candidato avance hasta el final sin coincidir (x[^y]*y|a sobre xaxa...)
+
+La entrada se consume por bloques desde un archivo o mmap; el estado del
+AFD de busqueda se conserva entre bloques y solo se retiene en memoria el
+texto desde el inicio mas antiguo de una coincidencia aun posible.
+Las coincidencias vacias no se reportan.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import BinaryIO, TextIO
+
+from automaton.direct_dfa import build_direct_dfa, build_search_dfa
+from automaton.matcher import DFAMatcher, _symbol_partition, compile_matcher
+from automaton.minimization import minimize_dfa
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+# Los recorridos anclados mas largos que esto se memorizan por (posicion, estado)
+_MEMO_AFTER = 32
+
+
+@dataclass
+class Searcher:
+    """Par de matchers (anclado y de busqueda) para encontrar coincidencias."""
+
+    anchored: DFAMatcher
+    search: DFAMatcher
+
+    def finditer(self, text: str | bytes) -> Iterator[tuple[int, int]]:
+        """Genera los intervalos (inicio, fin) de las coincidencias en el texto."""
+        return self._scan([text])
+
+    def scan(
+        self,
+        stream: BinaryIO | TextIO,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[tuple[int, int]]:
+        """Genera los intervalos (inicio, fin) leyendo el flujo por bloques.
+
+        El flujo puede ser un archivo (binario o de texto) o un mmap; los
+        desplazamientos son en bytes o en caracteres segun el caso.
+        """
+        return self._scan(_read_chunks(stream, chunk_size))
+
+    def contains(self, data: bytes | bytearray | memoryview) -> bool:
+        """Retorna True si hay alguna coincidencia dentro de los bytes dados.
+
+        Como match_bytes, acepta cualquier objeto con el protocolo de buffer.
+
+        Como en finditer, las coincidencias vacias no cuentan: con un patron
+        como a* solo se aceptan los bytes que contienen alguna a.
+        """
+        table, state = self.search.table, self.search.start
+        accept, num_classes = self.search.accept, self.search.num_classes
+        for classes in self.search._class_chunks(data):
+            for cls in classes:
+                state = table[state + cls]
+                if accept[state // num_classes]:
+                    return True
+        return False
+
+    def _classify(self, chunk: str | bytes) -> bytes | list[int]:
+        """Traduce un bloque de texto a identificadores de clase."""
+        matcher = self.search
+        if isinstance(chunk, str):
+            if matcher.utf8:
+                return matcher._classify(chunk.encode("utf-8"))
+            if not chunk.isascii():
+                return [matcher.class_of(c) for c in chunk]
+            chunk = chunk.encode("ascii")
+        return matcher._classify(chunk)
+
+    def _scan(self, chunks: Iterable[str | bytes]) -> Iterator[tuple[int, int]]:
+        """Recorre los bloques conservando el estado entre ellos."""
+        chunks = iter(chunks)
+        stable, sstart = self.search.table, self.search.start
+        saccept, sclasses = self.search.accept, self.search.num_classes
+        atable, astart = self.anchored.table, self.anchored.start
+        aaccept, aclasses = self.anchored.accept, self.anchored.num_classes
+        adead = self.anchored.dead
+
+        buf: bytearray | list[int] = bytearray()
+        buf_base = 0  # desplazamiento absoluto de buf[0]
+        base = 0  # inicio mas antiguo de una coincidencia aun posible
+        pos = 0  # posicion del AFD de busqueda
+        eof = False
+        # Estado anclado desde `base`, avanzado hasta `apos`
+        astate, apos = astart, 0
+
+        def fill() -> bool:
+            """Lee el siguiente bloque; descarta el texto anterior a `base`."""
+            nonlocal buf, buf_base, eof
+            if eof:
+                return False
+            for chunk in chunks:
+                if chunk:
+                    break
+            else:
+                eof = True
+                return False
+            classes = self._classify(chunk)
+            if base - buf_base >= len(buf):
+                buf = list(classes) if isinstance(classes, list) else bytearray(classes)
+            else:
+                del buf[: base - buf_base]
+                buf.extend(classes)
+            buf_base = base
+            return True
+
+        # Recorridos anclados largos: i * stride + estado -> ultimo fin
+        # alcanzable despues de la posicion i desde ese estado, o -1
+        memo: dict[int, int] = {}
+        memo_end = 0  # posicion mas alta registrada en memo
+        stride = len(atable)
+
+        def longest(start: int) -> int:
+            """Fin de la coincidencia anclada mas larga desde start, o -1."""
+            nonlocal memo_end
+            state, i, last = astart, start, -1
+            # Los primeros _MEMO_AFTER simbolos se recorren sin memo
+            stop = start + _MEMO_AFTER
+            while i < stop:
+                if i - buf_base >= len(buf) and not fill():
+                    return last
+                state = atable[state + buf[i - buf_base]]
+                i += 1
+                if state == adead:
+                    return last
+                if aaccept[state // aclasses]:
+                    last = i
+
+            path = []
+            while True:
+                key = i * stride + state
+                found = memo.get(key)
+                if found is not None:
+                    last = max(last, found)
+                    break
+                path.append(key)
+                if i - buf_base >= len(buf) and not fill():
+                    break
+                state = atable[state + buf[i - buf_base]]
+                i += 1
+                if state == adead:
+                    break
+                if aaccept[state // aclasses]:
+                    last = i
+            for key in path:
+                memo[key] = last if last > key // stride else -1
+            memo_end = max(memo_end, i)
+            return last
+
+        state = sstart
+        while True:
+            # Fase 1: avanzar el AFD de busqueda hasta que termine una coincidencia
+            while True:
+                if pos - buf_base >= len(buf):
+                    # Antes de leer, descartar inicios que ya no pueden coincidir
+                    if state == sstart:
+                        base, astate, apos = pos, astart, pos
+                    while base < pos:
+                        while apos < pos and astate != adead:
+                            astate = atable[astate + buf[apos - buf_base]]
+                            apos += 1
+                        if astate != adead:
+                            break
+                        base += 1
+                        astate, apos = astart, base
+                    if not fill():
+                        return
+                state = stable[state + buf[pos - buf_base]]
+                pos += 1
+                if saccept[state // sclasses]:
+                    break
+
+            # Fase 2: el inicio mas a la izquierda y su final mas largo
+            for start in range(base, pos):
+                end = longest(start)
+                if end > start:
+                    yield (start, end)
+                    break
+            base = pos = end
+            state = sstart
+            astate, apos = astart, pos
+            if memo_end <= base:
+                # Ninguna entrada sirve para inicios desde base
+                memo.clear()
+
+
+def _read_chunks(stream: BinaryIO | TextIO, chunk_size: int) -> Iterator[str | bytes]:
+    """Lee el flujo en bloques de chunk_size hasta agotarlo."""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def compile_searcher(regex: str, utf8: bool = False) -> Searcher:
+    """Compila la regex a un Searcher.
+
+    El AFD de busqueda no se minimiza: el estado vacio debe seguir siendo
+    distinguible para saber cuando no hay ninguna coincidencia en curso.
+    Con utf8=True ambos AFD son de bytes UTF-8 y los desplazamientos que se
+    reportan son en bytes, tambien para texto str.
+    """
+    anchored = minimize_dfa(build_direct_dfa(regex, utf8=utf8))
+    search = build_search_dfa(regex, utf8=utf8)
+    classes = _symbol_partition(anchored, search)
+    return Searcher(
+        anchored=compile_matcher(anchored, symbol_classes=classes, utf8=utf8),
+        search=compile_matcher(
+            search, default=search.start_state, symbol_classes=classes, utf8=utf8
+        ),
+    )
+
+
+def finditer(regex: str, text: str | bytes) -> Iterator[tuple[int, int]]:
+    """Genera los intervalos (inicio, fin) de las coincidencias de regex en text."""
+    return compile_searcher(regex).finditer(text)
+
+
+def scan_file(
+    regex: str,
+    stream: BinaryIO | TextIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple[int, int]]:
+    """Genera los intervalos de las coincidencias de regex leyendo el flujo por bloques."""
+    return compile_searcher(regex).scan(stream, chunk_size)
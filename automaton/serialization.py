@@ -0,0 +1,398 @@
+"""
+Formatos de serializacion de AFD.
+
+Formato binario compacto para AFD compilados (DFAMatcher):
+
+Disposicion (little-endian, todas las secciones alineadas a 4 bytes):
+1. Encabezado: magic, version de formato, estados, clases, simbolos,
+   intervalos, desplazamiento del estado inicial y del estado muerto
+2. Code points de los simbolos simples del alfabeto (int32 x simbolos)
+3. Clase de cada simbolo (int32 x simbolos)
+4. Intervalos de clases de caracteres (int32 x 3 x intervalos: lo, hi, clase)
+5. Tabla de transiciones premultiplicada (int32 x (estados + 1) x clases)
+6. Banderas de aceptacion (uint8 x (estados + 1)), con relleno a 4 bytes
+7. Solo si la bandera TAGGED esta activa (AFD multipatron): desplazamientos
+   (int32 x (estados + 2)) e indices de patrones (int32 x etiquetas), en
+   formato CSR: los patrones del estado s son ids[offsets[s]:offsets[s + 1]]
+
+La tabla se puede leer directamente desde un mmap sin copiarla, de modo que
+varios procesos que cargan el mismo archivo comparten las paginas.
+
+Formato binario de AFD sin compilar (DFA o CompactDFA), que conserva las
+etiquetas del alfabeto y se carga como CompactDFA:
+1. Encabezado: magic, version, banderas (TAGGED, UTF8), estados, simbolos,
+   bytes de etiquetas, intervalos, estado inicial y cantidad de etiquetas
+   de patron
+2. Longitud en bytes de cada etiqueta (int32 x simbolos) y las etiquetas en
+   UTF-8, con relleno a 4 bytes
+3. Intervalos (int32 x 3 x intervalos: lo, hi, indice de la etiqueta)
+4. Tabla de transiciones (int32 x estados x simbolos, -1 sin transicion)
+5. Mapa de bits de aceptacion, con relleno a 4 bytes
+6. Solo con TAGGED: patrones por estado en CSR (int32 x (estados + 1) e
+   int32 x etiquetas)
+
+Cargar la tabla es una copia de bytes, por lo que un AFD de 10^6
+transiciones se carga en milisegundos. dfa_to_json y dfa_from_json dan una
+forma JSON legible para depurar; la salida DOT esta en visualization.py.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+
+from automaton.compact_dfa import CompactDFA, to_compact
+from automaton.direct_dfa import DFA
+from automaton.matcher import DFAMatcher, _byte_classes
+
+MAGIC = b"ADFA"
+FORMAT_VERSION = 3
+
+# Banderas del encabezado
+TAGGED = 1
+# Alfabeto de bytes UTF-8 (DFAMatcher.utf8, DFA.utf8, CompactDFA.utf8)
+UTF8 = 2
+
+_HEADER = struct.Struct("<4sHHiiiiiii")
+
+DFA_MAGIC = b"ADFT"
+DFA_FORMAT_VERSION = 1
+JSON_FORMAT = "automaton-dfa"
+
+_DFA_HEADER = struct.Struct("<4sHHiiiiii")
+
+
+class FormatError(ValueError):
+    """El buffer no contiene un AFD serializado valido."""
+
+
+def _padded(n: int) -> int:
+    return (n + 3) & ~3
+
+
+def dump_matcher(matcher: DFAMatcher) -> bytes:
+    """Serializa el matcher al formato binario."""
+    symbols = sorted(
+        (ord(s), c) for s, c in matcher.symbol_classes.items() if len(s) == 1
+    )
+    codes = array("i", [code for code, _ in symbols])
+    classes = array("i", [c for _, c in symbols])
+    ranges = array("i", [v for r in matcher.ranges for v in r])
+    table = array("i", matcher.table)
+    offsets = array("i")
+    ids = array("i")
+    if matcher.patterns:
+        offsets.append(0)
+        for patterns in matcher.patterns:
+            ids.extend(sorted(patterns))
+            offsets.append(len(ids))
+    if sys.byteorder != "little":
+        for arr in (codes, classes, ranges, table, offsets, ids):
+            arr.byteswap()
+
+    accept = bytes(matcher.accept)
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        (TAGGED if matcher.patterns else 0) | (UTF8 if matcher.utf8 else 0),
+        matcher.num_states,
+        matcher.num_classes,
+        len(symbols),
+        len(matcher.ranges),
+        matcher.start,
+        matcher.dead,
+        len(ids),
+    )
+    return b"".join(
+        [
+            header,
+            codes.tobytes(),
+            classes.tobytes(),
+            ranges.tobytes(),
+            table.tobytes(),
+            accept,
+            bytes(_padded(len(accept)) - len(accept)),
+            offsets.tobytes(),
+            ids.tobytes(),
+        ]
+    )
+
+
+def load_matcher(buffer) -> DFAMatcher:
+    """Reconstruye un matcher desde un buffer (bytes, memoryview o mmap).
+
+    En plataformas little-endian la tabla de transiciones es una vista del
+    buffer original, sin copia.
+    """
+    view = memoryview(buffer)
+    if len(view) < _HEADER.size:
+        raise FormatError("buffer demasiado corto")
+    (
+        magic,
+        version,
+        flags,
+        num_states,
+        num_classes,
+        num_symbols,
+        num_ranges,
+        start,
+        dead,
+        num_tags,
+    ) = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise FormatError("magic invalido")
+    if version != FORMAT_VERSION:
+        raise FormatError(f"version de formato no soportada: {version}")
+
+    table_len = (num_states + 1) * num_classes
+    tag_len = num_states + 2 + num_tags if flags & TAGGED else 0
+    expected = (
+        _HEADER.size
+        + 4 * (2 * num_symbols + 3 * num_ranges + table_len)
+        + _padded(num_states + 1)
+        + 4 * tag_len
+    )
+    if num_states < 0 or num_classes < 1 or len(view) < expected:
+        raise FormatError("buffer truncado")
+
+    offset = _HEADER.size
+    sections: list[memoryview] = []
+    for length in (num_symbols, num_symbols, 3 * num_ranges, table_len):
+        end = offset + 4 * length
+        sections.append(view[offset:end])
+        offset = end
+    accept = view[offset : offset + num_states + 1]
+    offset += _padded(num_states + 1)
+
+    patterns: list[frozenset[int]] = []
+    if flags & TAGGED:
+        tags = array("i", bytes(view[offset : offset + 4 * tag_len]))
+        if sys.byteorder != "little":
+            tags.byteswap()
+        offsets, ids = tags[: num_states + 2], tags[num_states + 2 :]
+        patterns = [
+            frozenset(ids[offsets[s] : offsets[s + 1]]) for s in range(num_states + 1)
+        ]
+
+    if sys.byteorder == "little":
+        codes, classes, flat_ranges, table = (s.cast("i") for s in sections)
+    else:
+        codes, classes, flat_ranges, table = (array("i", bytes(s)) for s in sections)
+        for arr in (codes, classes, flat_ranges, table):
+            arr.byteswap()
+
+    symbol_classes = {chr(code): cls for code, cls in zip(codes, classes)}
+    ranges = [tuple(flat_ranges[i : i + 3]) for i in range(0, len(flat_ranges), 3)]
+    return DFAMatcher(
+        symbol_classes=symbol_classes,
+        byte_classes=_byte_classes(symbol_classes, num_classes, ranges),
+        ranges=ranges,
+        num_classes=num_classes,
+        num_states=num_states,
+        table=table,
+        accept=accept,
+        start=start,
+        dead=dead,
+        patterns=patterns,
+        utf8=bool(flags & UTF8),
+    )
+
+
+def _to_little(*arrays: array) -> None:
+    if sys.byteorder != "little":
+        for arr in arrays:
+            arr.byteswap()
+
+
+def dump_dfa(dfa: DFA | CompactDFA) -> bytes:
+    """Serializa un DFA o CompactDFA al formato binario de AFD sin compilar."""
+    compact = dfa if isinstance(dfa, CompactDFA) else to_compact(dfa)
+    n, width = compact.num_states, len(compact.alphabet)
+    columns = {symbol: k for k, symbol in enumerate(compact.alphabet)}
+
+    encoded = [symbol.encode("utf-8") for symbol in compact.alphabet]
+    lengths = array("i", map(len, encoded))
+    labels = b"".join(encoded)
+    intervals = array(
+        "i", [v for lo, hi, label in compact.intervals for v in (lo, hi, columns[label])]
+    )
+    table = array("i", compact.table)
+    accept = bytes(compact.accept)
+
+    offsets = array("i")
+    ids = array("i")
+    if compact.accept_patterns:
+        offsets.append(0)
+        for s in range(n):
+            ids.extend(sorted(compact.accept_patterns.get(s, ())))
+            offsets.append(len(ids))
+    _to_little(lengths, intervals, table, offsets, ids)
+
+    flags = (TAGGED if compact.accept_patterns else 0) | (UTF8 if compact.utf8 else 0)
+    header = _DFA_HEADER.pack(
+        DFA_MAGIC,
+        DFA_FORMAT_VERSION,
+        flags,
+        n,
+        width,
+        len(labels),
+        len(compact.intervals),
+        compact.start_state,
+        len(ids),
+    )
+    return b"".join(
+        [
+            header,
+            lengths.tobytes(),
+            labels,
+            bytes(_padded(len(labels)) - len(labels)),
+            intervals.tobytes(),
+            table.tobytes(),
+            accept,
+            bytes(_padded(len(accept)) - len(accept)),
+            offsets.tobytes(),
+            ids.tobytes(),
+        ]
+    )
+
+
+def load_dfa(buffer) -> CompactDFA:
+    """Reconstruye un CompactDFA desde un buffer (bytes, memoryview o mmap)."""
+    view = memoryview(buffer)
+    if len(view) < _DFA_HEADER.size:
+        raise FormatError("buffer demasiado corto")
+    (
+        magic,
+        version,
+        flags,
+        num_states,
+        num_symbols,
+        label_bytes,
+        num_intervals,
+        start,
+        num_tags,
+    ) = _DFA_HEADER.unpack_from(view)
+    if magic != DFA_MAGIC:
+        raise FormatError("magic invalido")
+    if version != DFA_FORMAT_VERSION:
+        raise FormatError(f"version de formato no soportada: {version}")
+
+    bitmap_len = (num_states + 7) >> 3
+    tag_len = num_states + 1 + num_tags if flags & TAGGED else 0
+    expected = (
+        _DFA_HEADER.size
+        + 4 * num_symbols
+        + _padded(label_bytes)
+        + 4 * (3 * num_intervals + num_states * num_symbols)
+        + _padded(bitmap_len)
+        + 4 * tag_len
+    )
+    if num_states < 0 or num_symbols < 0 or len(view) < expected:
+        raise FormatError("buffer truncado")
+
+    def ints(offset: int, count: int) -> array:
+        arr = array("i")
+        arr.frombytes(view[offset : offset + 4 * count])
+        _to_little(arr)
+        return arr
+
+    offset = _DFA_HEADER.size
+    lengths = ints(offset, num_symbols)
+    offset += 4 * num_symbols
+    labels = bytes(view[offset : offset + label_bytes])
+    offset += _padded(label_bytes)
+    alphabet: list[str] = []
+    cursor = 0
+    for length in lengths:
+        alphabet.append(labels[cursor : cursor + length].decode("utf-8"))
+        cursor += length
+
+    flat = ints(offset, 3 * num_intervals)
+    offset += 12 * num_intervals
+    intervals = [
+        (flat[i], flat[i + 1], alphabet[flat[i + 2]]) for i in range(0, len(flat), 3)
+    ]
+    table = ints(offset, num_states * num_symbols)
+    offset += 4 * num_states * num_symbols
+    accept = bytearray(view[offset : offset + bitmap_len])
+    offset += _padded(bitmap_len)
+
+    accept_patterns: dict[int, frozenset[int]] = {}
+    if flags & TAGGED:
+        tags = ints(offset, tag_len)
+        offsets, ids = tags[: num_states + 1], tags[num_states + 1 :]
+        accept_patterns = {
+            s: frozenset(ids[offsets[s] : offsets[s + 1]])
+            for s in range(num_states)
+            if offsets[s] != offsets[s + 1]
+        }
+
+    return CompactDFA(
+        alphabet=alphabet,
+        num_states=num_states,
+        table=table,
+        accept=accept,
+        start_state=start,
+        intervals=intervals,
+        accept_patterns=accept_patterns,
+        utf8=bool(flags & UTF8),
+    )
+
+
+def dfa_to_json(dfa: DFA | CompactDFA, indent: int | None = None) -> str:
+    """Forma JSON del AFD, para depurar y para intercambio con otras herramientas.
+
+    Las transiciones se listan como [origen, simbolo, destino]; los
+    conjuntos de posiciones se incluyen solo si el AFD los conserva.
+    """
+    if isinstance(dfa, CompactDFA):
+        has_positions = dfa.states is not None
+        dfa = dfa.to_dfa()
+    else:
+        has_positions = any(dfa.states)
+
+    data = {
+        "format": JSON_FORMAT,
+        "version": DFA_FORMAT_VERSION,
+        "alphabet": sorted(dfa.alphabet),
+        "num_states": len(dfa.states),
+        "start_state": dfa.start_state,
+        "accept_states": sorted(dfa.accept_states),
+        "transitions": sorted([s, symbol, t] for (s, symbol), t in dfa.transitions.items()),
+        "intervals": [list(iv) for iv in dfa.intervals],
+    }
+    if dfa.accept_patterns:
+        data["accept_patterns"] = {
+            str(s): sorted(patterns) for s, patterns in sorted(dfa.accept_patterns.items())
+        }
+    if dfa.utf8:
+        data["utf8"] = True
+    if has_positions:
+        data["states"] = [sorted(state) for state in dfa.states]
+    return json.dumps(data, indent=indent, ensure_ascii=False)
+
+
+def dfa_from_json(text: str) -> DFA:
+    """Reconstruye un DFA desde la forma JSON de dfa_to_json."""
+    data = json.loads(text)
+    if data.get("format") != JSON_FORMAT:
+        raise FormatError("no es un AFD en formato JSON")
+    if data.get("version") != DFA_FORMAT_VERSION:
+        raise FormatError(f"version de formato no soportada: {data.get('version')}")
+
+    dfa = DFA(utf8=bool(data.get("utf8", False)))
+    dfa.alphabet = set(data["alphabet"])
+    if "states" in data:
+        dfa.states = [frozenset(state) for state in data["states"]]
+    else:
+        dfa.states = [frozenset() for _ in range(data["num_states"])]
+    dfa.start_state = data["start_state"]
+    dfa.accept_states = set(data["accept_states"])
+    dfa.transitions = {(s, symbol): t for s, symbol, t in data["transitions"]}
+    dfa.intervals = [tuple(iv) for iv in data["intervals"]]
+    dfa.accept_patterns = {
+        int(s): frozenset(patterns) for s, patterns in data.get("accept_patterns", {}).items()
+    }
+    return dfa
@@ -0,0 +1,239 @@
+"""
+Servidor HTTP minimo (solo biblioteca estandar) para evaluar regex por lotes.
+
+Escucha en localhost o en un socket Unix y atiende cada conexion con
+asyncio; la compilacion se delega al pool de procesos de automaton.aio, de
+modo que un patron grande no detiene las demas solicitudes. Las conexiones
+son persistentes (HTTP/1.1 keep-alive) salvo que el cliente pida cerrarlas.
+
+Rutas:
+    POST /match   {"regex": "...", "inputs": ["...", ...]}
+                  -> {"results": [true, false, ...]}
+                  Si "regex" es una lista, cada resultado es la lista de
+                  indices de los patrones que aceptan la cadena. Si la
+                  regex supera los limites del servidor responde 422 con
+                  el limite y las estadisticas parciales.
+    GET  /stats   Contadores del cache, de compile_async y percentiles de
+                  latencia de las ultimas solicitudes
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from dataclasses import asdict
+
+from automaton.aio import async_stats, match_async
+from automaton.compiler import cache_info
+from automaton.limits import BudgetExceeded, Limits
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Limites de una solicitud
+MAX_HEADER_BYTES = 16 << 10
+MAX_BODY_BYTES = 64 << 20
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+}
+
+
+class HTTPError(Exception):
+    """Error que se responde al cliente con el codigo dado."""
+
+    def __init__(
+        self, status: int, message: str, *, close: bool = False, **details: object
+    ) -> None:
+        super().__init__(message)
+        self.status = status
+        # La conexion se cierra tras responder (el resto del flujo es ilegible)
+        self.close = close
+        self.details = details
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Percentil q (0-100) por rango mas cercano de una lista ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LatencyRecorder:
+    """Guarda las latencias de las ultimas solicitudes (ventana acotada)."""
+
+    def __init__(self, window: int = 10_000) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+
+    def summary(self) -> dict[str, float]:
+        values = sorted(self._samples)
+        return {
+            "count": self.count,
+            "p50_ms": 1e3 * percentile(values, 50),
+            "p90_ms": 1e3 * percentile(values, 90),
+            "p99_ms": 1e3 * percentile(values, 99),
+            "max_ms": 1e3 * (values[-1] if values else 0.0),
+        }
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, dict[str, str], bytes] | None:
+    """Lee una solicitud; retorna None si el cliente cerro la conexion."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise HTTPError(400, "solicitud incompleta") from None
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(413, "encabezados demasiado grandes", close=True) from None
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, path, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "linea de solicitud invalida") from None
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    value = headers.get("content-length", "0")
+    # Sin signo ni espacios: int() aceptaria "-1", "+5" o "1_000"
+    if not (value.isascii() and value.isdigit()):
+        raise HTTPError(400, "Content-Length invalido", close=True)
+    length = int(value)
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "cuerpo demasiado grande", close=True)
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body
+
+
+def _response(status: int, payload: object, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+class MatchServer:
+    """Atiende las solicitudes de match por lotes."""
+
+    def __init__(self, limits: Limits | None = None) -> None:
+        self.limits = limits
+        self.latency = LatencyRecorder()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Atiende una conexion hasta que el cliente la cierre."""
+        try:
+            while True:
+                keep_alive = True
+                try:
+                    request = await _read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    start = time.perf_counter()
+                    status, payload = 200, await self._dispatch(method, path, body)
+                    if path == "/match":
+                        self.latency.add(time.perf_counter() - start)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e), **e.details}
+                    keep_alive = keep_alive and not e.close
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> object:
+        if path == "/stats":
+            if method != "GET":
+                raise HTTPError(405, "use GET")
+            return {
+                "cache": asdict(cache_info()),
+                "compile": asdict(async_stats()),
+                "latency": self.latency.summary(),
+            }
+        if path != "/match":
+            raise HTTPError(404, f"ruta desconocida: {path}")
+        if method != "POST":
+            raise HTTPError(405, "use POST")
+
+        try:
+            request = json.loads(body)
+            regex = request["regex"]
+            inputs = request["inputs"]
+            minimize = bool(request.get("minimize", True))
+        except (ValueError, KeyError, TypeError):
+            raise HTTPError(400, 'se esperaba {"regex": ..., "inputs": [...]}') from None
+        if not isinstance(inputs, list) or not all(isinstance(w, str) for w in inputs):
+            raise HTTPError(400, '"inputs" debe ser una lista de cadenas')
+        if not isinstance(regex, str) and not (
+            isinstance(regex, list) and regex and all(isinstance(r, str) for r in regex)
+        ):
+            raise HTTPError(400, '"regex" debe ser una cadena o una lista de cadenas')
+
+        try:
+            results = await match_async(regex, inputs, minimize, self.limits)
+        except BudgetExceeded as e:
+            raise HTTPError(422, str(e), limit=e.limit, stats=e.stats) from None
+        except ValueError as e:
+            raise HTTPError(400, f"regex invalida: {e}") from None
+        except Exception as e:
+            # Cualquier otro fallo de la compilacion responde 400 en lugar de cerrar la conexion
+            raise HTTPError(400, f"no se pudo compilar la regex: {e!r}") from None
+        if isinstance(regex, list):
+            results = [sorted(patterns) for patterns in results]
+        return {"results": results}
+
+
+async def start_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_path: str | None = None,
+    limits: Limits | None = None,
+) -> asyncio.AbstractServer:
+    """Inicia el servidor en host:port o, si se indica, en el socket Unix."""
+    server = MatchServer(limits)
+    if unix_path is not None:
+        return await asyncio.start_unix_server(server.handle, path=unix_path, limit=MAX_HEADER_BYTES)
+    return await asyncio.start_server(server.handle, host, port, limit=MAX_HEADER_BYTES)
+
+
+async def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_path: str | None = None,
+    limits: Limits | None = None,
+) -> None:
+    """Inicia el servidor y atiende solicitudes hasta ser cancelado."""
+    server = await start_server(host, port, unix_path, limits)
+    for sock in server.sockets:
+        address = sock.getsockname()
+        where = address if isinstance(address, str) else f"http://{address[0]}:{address[1]}"
+        print(f"Escuchando en {where}", flush=True)
+    async with server:
+        await server.serve_forever()
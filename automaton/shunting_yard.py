@@ -1,7 +1,16 @@
 """
 Algoritmo Shunting-Yard para convertir expresiones regulares de notacion
-infija a postfija. Maneja insercion de concatenacion implicita, desazucarado
-de operadores (+ y ?) y precedencia de operadores.
+infija a postfija. Maneja insercion de concatenacion implicita y precedencia
+de operadores. Los operadores + y ? pasan tal cual al postfijo; el arbol
+sintactico los trata como nodos propios. El desazucarado textual
+(a+ -> aa*, a? -> (a|ε)) se conserva solo para mostrar los pasos intermedios.
+
+La regex se divide primero en tokens: operadores, parentesis y operandos.
+Un operando es un simbolo simple, un escape (\\x, \\n, \\d, ...) o una clase
+de caracteres ([a-z0-9], [^abc]). El punto '.' de la regex del usuario es
+el comodin (cualquier caracter excepto salto de linea) y se convierte en la
+clase [^\\n]; en las cadenas intermedias con concatenacion explicita y en el
+postfijo, '.' es el operador de concatenacion.
 """
 
 from __future__ import annotations
@@ -10,90 +19,165 @@ OPERATORS = {"|", ".", "*", "+", "?"}
 PRECEDENCE = {"|": 1, ".": 2, "*": 3, "+": 3, "?": 3}
 RIGHT_ASSOC = {"*", "+", "?"}
 
+ANY = "[^\\n]"
+
 
 def _is_operand(c: str) -> bool:
     return c not in OPERATORS and c not in ("(", ")")
 
 
-def insert_explicit_concat(regex: str) -> str:
-    """Inserta el operador de concatenacion explicito '.' donde esta implicito."""
-    result: list[str] = []
+def tokenize(regex: str, dot_is_concat: bool = False) -> list[str]:
+    """Divide la regex en tokens.
+
+    Con dot_is_concat=False (regex del usuario) '.' es el comodin; con True
+    (cadenas con concatenacion explicita o postfijo) es el operador.
+    """
+    tokens: list[str] = []
     i = 0
     while i < len(regex):
         c = regex[i]
+        if c == "\\":
+            if i + 1 >= len(regex):
+                raise ValueError("escape '\\' al final de la expresion")
+            tokens.append(regex[i : i + 2])
+            i += 2
+        elif c == "[":
+            # La clase termina en el primer ']' no escapado (un ']' inicial es literal)
+            j = i + 1
+            if j < len(regex) and regex[j] == "^":
+                j += 1
+            if j < len(regex) and regex[j] == "]":
+                j += 1
+            while j < len(regex) and regex[j] != "]":
+                j += 2 if regex[j] == "\\" else 1
+            if j >= len(regex):
+                raise ValueError(f"clase de caracteres sin cerrar: {regex[i:]!r}")
+            tokens.append(regex[i : j + 1])
+            i = j + 1
+        elif c == "." and not dot_is_concat:
+            tokens.append(ANY)
+            i += 1
+        else:
+            tokens.append(c)
+            i += 1
+    return tokens
+
+
+def _validate(tokens: list[str]) -> None:
+    """Lanza ValueError si a algun operador le falta un operando o los parentesis no cierran."""
+    depth = 0
+    # True si el token anterior cierra un operando (simbolo, ')' u operador unario)
+    operand = False
+    prev = ""
+    for c in tokens:
+        if c == "(":
+            depth += 1
+            operand = False
+        elif c == ")":
+            if depth == 0:
+                raise ValueError("')' sin '(' correspondiente")
+            if prev == "(":
+                raise ValueError("grupo vacio '()'")
+            if not operand:
+                raise ValueError("'|' sin operando a la derecha")
+            depth -= 1
+        elif c == "|":
+            if not operand:
+                raise ValueError("'|' sin operando a la izquierda")
+            operand = False
+        elif c in RIGHT_ASSOC:
+            if not operand:
+                raise ValueError(f"'{c}' sin operando")
+        else:
+            operand = True
+        prev = c
+    if depth:
+        raise ValueError("'(' sin cerrar")
+    if tokens and not operand:
+        raise ValueError("'|' sin operando a la derecha")
+
+
+def _concat_tokens(tokens: list[str]) -> list[str]:
+    """Inserta el operador de concatenacion explicito '.' entre tokens."""
+    result: list[str] = []
+    for i, c in enumerate(tokens):
         result.append(c)
 
-        if i + 1 < len(regex):
-            next_c = regex[i + 1]
+        if i + 1 < len(tokens):
+            next_c = tokens[i + 1]
             # Se inserta '.' entre: operando|)|*|+|? seguido de operando|(
             if (
                 (_is_operand(c) or c in (")", "*", "+", "?"))
                 and (_is_operand(next_c) or next_c == "(")
             ):
                 result.append(".")
-        i += 1
 
-    return "".join(result)
+    return result
 
 
-def _desugar(regex: str) -> str:
-    """Expande azucar sintactico: a+ -> a.a* y a? -> (a|ε)."""
+def insert_explicit_concat(regex: str) -> str:
+    """Inserta el operador de concatenacion explicito '.' donde esta implicito."""
+    return "".join(_concat_tokens(tokenize(regex)))
+
+
+def _group_start(result: list[str]) -> int:
+    """Indice del '(' que abre el grupo cerrado por result[-1] == ')'."""
+    depth = 1
+    j = len(result) - 2
+    while j >= 0 and depth > 0:
+        if result[j] == ")":
+            depth += 1
+        elif result[j] == "(":
+            depth -= 1
+        j -= 1
+    return j + 1
+
+
+def _desugar_tokens(tokens: list[str]) -> list[str]:
+    """Expande azucar sintactico: a+ -> aa* y a? -> (a|ε)."""
     result: list[str] = []
-    i = 0
-    while i < len(regex):
-        c = regex[i]
+    for c in tokens:
         if c == "+":
-            # a+ se convierte en a.a*; si el token previo es ')' se duplica el grupo
+            # a+ se convierte en aa*; si el token previo es ')' se duplica el grupo
             if result and result[-1] == ")":
-                depth = 1
-                j = len(result) - 2
-                while j >= 0 and depth > 0:
-                    if result[j] == ")":
-                        depth += 1
-                    elif result[j] == "(":
-                        depth -= 1
-                    j -= 1
-                group = result[j + 1 :]
-                result.extend(["."] + list(group) + ["*"])
+                group = result[_group_start(result) :]
+                result.extend(list(group) + ["*"])
             elif result:
                 prev = result[-1]
-                result.extend([".", prev, "*"])
+                result.extend([prev, "*"])
         elif c == "?":
             # a? se convierte en (a|ε)
             if result and result[-1] == ")":
-                depth = 1
-                j = len(result) - 2
-                while j >= 0 and depth > 0:
-                    if result[j] == ")":
-                        depth += 1
-                    elif result[j] == "(":
-                        depth -= 1
-                    j -= 1
-                group = result[j + 1 :]
-                result[j + 1 :] = ["("] + list(group) + ["|", "ε", ")"]
+                j = _group_start(result)
+                group = result[j:]
+                result[j:] = ["("] + list(group) + ["|", "ε", ")"]
             elif result:
                 prev = result.pop()
                 result.extend(["(", prev, "|", "ε", ")"])
         else:
             result.append(c)
-        i += 1
-    return "".join(result)
+    return result
 
 
-def shunting_yard(regex: str) -> str:
-    """Convierte una regex infija a notacion postfija.
+def _desugar(regex: str) -> str:
+    """Expande azucar sintactico: a+ -> aa* y a? -> (a|ε)."""
+    return "".join(_desugar_tokens(tokenize(regex)))
 
-    Operadores soportados: | (union), . (concatenacion), * (cerradura de Kleene),
-    + (cerradura positiva), ? (opcional).
+
+def to_postfix(regex: str | list[str]) -> list[str]:
+    """Convierte una regex infija (o su lista de tokens) a la lista de tokens en postfijo.
+
+    Lanza ValueError si la regex esta mal formada: un operador sin operando
+    ("a|", "*", "a(|b)"), un grupo vacio o parentesis que no cierran.
     """
-    # Primero desazucarar + y ?, luego insertar concatenacion explicita
-    regex = _desugar(regex)
-    regex = insert_explicit_concat(regex)
+    tokens = tokenize(regex) if isinstance(regex, str) else regex
+    _validate(tokens)
+    tokens = _concat_tokens(tokens)
 
     output: list[str] = []
     stack: list[str] = []
 
-    for c in regex:
+    for c in tokens:
         if _is_operand(c):
             output.append(c)
         elif c == "(":
@@ -120,4 +204,13 @@ def shunting_yard(regex: str) -> str:
     while stack:
         output.append(stack.pop())
 
-    return "".join(output)
+    return output
+
+
+def shunting_yard(regex: str) -> str:
+    """Convierte una regex infija a notacion postfija.
+
+    Operadores soportados: | (union), . (concatenacion), * (cerradura de Kleene),
+    + (cerradura positiva), ? (opcional).
+    """
+    return "".join(to_postfix(regex))
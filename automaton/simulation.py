@@ -1,21 +1,70 @@
 """
 Simulacion de AFD: procesa una cadena de entrada y determina si es aceptada.
+Incluye simulacion por lotes que avanza muchas cadenas a la vez, y
+simulacion de una sola entrada muy larga por composicion de mapas de estados.
 """
 
 from __future__ import annotations
 
+import os
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import Executor, Future
+
+from automaton.compact_dfa import CompactDFA
 from automaton.direct_dfa import DFA
+from automaton.lazy_dfa import LazyDFA
+from automaton.matcher import DFAMatcher, compile_matcher
+from automaton.nfa import PositionNFA
+from automaton.stats import BuildStats, current_stats
+from automaton.utf8 import byte_string
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Maximo de celdas (filas x columnas) por bloque en la simulacion vectorizada
+_BLOCK_CELLS = 1 << 22
+# Celdas (carriles x estados) que avanza cada paso de state_map
+_LANE_CELLS = 1 << 16
+# Simbolos por segmento en simulate_long
+DEFAULT_SEGMENT = 1 << 22
+# simulate_long compone mapas solo hasta esta cantidad de estados (muerto
+# incluido); calibrado con benchmarks/bench_long.py
+MAX_MAP_STATES = 16
 
 
-def simulate_dfa(dfa: DFA, input_string: str) -> bool:
+def simulate_dfa(dfa: DFA | CompactDFA | LazyDFA | PositionNFA, input_string: str) -> bool:
     """Simula el AFD sobre la cadena dada.
     Retorna True si la cadena es aceptada, False en caso contrario.
+    Un LazyDFA construye los estados que la cadena alcanza durante la simulacion;
+    un PositionNFA simula el AFN de posiciones sin construir estados. Un AFD
+    utf8 simula los bytes de la codificacion UTF-8 de la cadena.
     """
+    stats = current_stats()
+    if stats is not None and isinstance(dfa, (DFA, CompactDFA)):
+        if dfa.utf8:
+            input_string = byte_string(input_string)
+        state = _walk_traced(dfa, input_string, stats)
+        if state is None:
+            return False
+        return dfa.is_accepting(state) if isinstance(dfa, CompactDFA) else state in dfa.accept_states
+
+    if isinstance(dfa, (CompactDFA, LazyDFA, PositionNFA)):
+        return dfa.match(input_string)
+    if dfa.utf8:
+        input_string = byte_string(input_string)
+
     current_state = dfa.start_state
 
     for symbol in input_string:
         if symbol not in dfa.alphabet:
-            return False
+            # Caracter cubierto por una clase de caracteres, si existe
+            symbol = dfa.symbol_of(symbol)
+            if symbol is None:
+                return False
 
         next_state = dfa.transitions.get((current_state, symbol))
         if next_state is None:
@@ -24,3 +73,322 @@ def simulate_dfa(dfa: DFA, input_string: str) -> bool:
         current_state = next_state
 
     return current_state in dfa.accept_states
+
+
+def simulate_patterns(dfa: DFA, input_string: str) -> frozenset[int]:
+    """Simula un AFD multipatron y retorna los indices de los patrones aceptados.
+
+    Para un AFD de un solo patron retorna {0} si la cadena es aceptada.
+    """
+    if dfa.utf8:
+        input_string = byte_string(input_string)
+    stats = current_stats()
+    if stats is not None:
+        state = _walk_traced(dfa, input_string, stats)
+        if state is None or state not in dfa.accept_states:
+            return frozenset()
+        return dfa.accept_patterns.get(state, frozenset({0}))
+
+    current_state = dfa.start_state
+
+    for symbol in input_string:
+        if symbol not in dfa.alphabet:
+            symbol = dfa.symbol_of(symbol)
+            if symbol is None:
+                return frozenset()
+
+        next_state = dfa.transitions.get((current_state, symbol))
+        if next_state is None:
+            return frozenset()
+
+        current_state = next_state
+
+    if current_state not in dfa.accept_states:
+        return frozenset()
+    return dfa.accept_patterns.get(current_state, frozenset({0}))
+
+
+def _walk_traced(dfa: DFA | CompactDFA, input_string: str, stats: BuildStats) -> int | None:
+    """Recorre la cadena contando las transiciones; retorna el estado final o None."""
+    stats.simulations += 1
+    if isinstance(dfa, CompactDFA):
+        step = dfa.transition
+    else:
+        transitions = dfa.transitions
+        step = lambda state, symbol: transitions.get((state, symbol))
+
+    state = dfa.start_state
+    for char in input_string:
+        symbol = dfa.symbol_of(char)
+        if symbol is None:
+            return None
+        state = step(state, symbol)
+        if state is None:
+            return None
+        stats.transitions += 1
+    return state
+
+
+def simulate_many(
+    dfa: DFA | DFAMatcher,
+    inputs: Iterable[str] | Iterable[bytes],
+    as_array: bool = False,
+):
+    """Simula el AFD sobre muchas cadenas y retorna una lista de booleanos.
+
+    Con NumPy disponible, las cadenas se agrupan por longitud y todas las de un
+    grupo avanzan en paralelo por la tabla de transiciones (una indexacion
+    vectorizada por columna). Acepta arreglos NumPy de tipo 'S' o 'U', que se
+    reinterpretan sin copiar la entrada. Con as_array=True retorna un arreglo
+    NumPy de booleanos.
+    """
+    matcher = dfa if isinstance(dfa, DFAMatcher) else compile_matcher(dfa)
+    if matcher.utf8:
+        # El AFD es de bytes: las cadenas str se simulan por su codificacion
+        if HAS_NUMPY and isinstance(inputs, np.ndarray):
+            if inputs.dtype.kind == "U":
+                inputs = np.char.encode(inputs, "utf-8")
+        else:
+            inputs = [w.encode("utf-8") if isinstance(w, str) else w for w in inputs]
+
+    if not HAS_NUMPY:
+        if as_array:
+            raise RuntimeError("as_array=True requiere NumPy")
+        return [
+            matcher.match(w) if isinstance(w, str) else matcher.match_bytes(w)
+            for w in inputs
+        ]
+
+    if isinstance(inputs, np.ndarray) and inputs.dtype.kind in ("S", "U"):
+        result = _simulate_column(matcher, inputs)
+    else:
+        result = _simulate_grouped(matcher, list(inputs))
+
+    return result if as_array else result.tolist()
+
+
+def _numpy_tables(matcher: DFAMatcher):
+    """Tabla 2D (estados x clases+1) con una columna extra de relleno.
+
+    La clase de relleno deja el estado sin cambios; se usa para los NUL
+    finales de los arreglos 'S'/'U' de longitud fija.
+    """
+    ncls = matcher.num_classes
+    rows = matcher.num_states + 1
+    table = np.empty((rows, ncls + 1), dtype=np.int32)
+    table[:, :ncls] = np.frombuffer(matcher.table, dtype=np.int32).reshape(
+        rows, ncls
+    ) // ncls
+    table[:, ncls] = np.arange(rows, dtype=np.int32)
+    accept = np.frombuffer(bytes(matcher.accept), dtype=np.uint8).astype(bool)
+    return table, accept, ncls
+
+
+def _code_classes(matcher: DFAMatcher, codes):
+    """Traduce un arreglo de codigos (bytes o code points) a clases."""
+    intervals = matcher.class_intervals()
+    if codes.dtype == np.uint8 or not intervals:
+        lut = np.array(list(matcher.byte_classes), dtype=np.int32)
+        if codes.dtype == np.uint8:
+            return lut[codes]
+        return np.where(codes < 256, lut[np.minimum(codes, 255)], 0)
+
+    lows = np.array([lo for lo, _, _ in intervals], dtype=np.int64)
+    highs = np.array([hi for _, hi, _ in intervals], dtype=np.int64)
+    values = np.array([c for _, _, c in intervals], dtype=np.int32)
+    idx = np.searchsorted(lows, codes, side="right") - 1
+    safe = np.maximum(idx, 0)
+    return np.where((idx >= 0) & (codes <= highs[safe]), values[safe], 0)
+
+
+def _run_block(table, accept, start: int, dead: int, classes):
+    """Avanza en paralelo todas las filas de una matriz (filas x longitud)."""
+    states = np.full(classes.shape[0], start, dtype=np.int32)
+    for column in np.ascontiguousarray(classes.T):
+        states = table[states, column]
+        if (states == dead).all():
+            break
+    return accept[states]
+
+
+def _simulate_column(matcher: DFAMatcher, column):
+    """Simula sobre un arreglo NumPy 'S' o 'U' de ancho fijo sin copiarlo."""
+    table, accept, pad = _numpy_tables(matcher)
+    n = len(column)
+    width = column.dtype.itemsize // (4 if column.dtype.kind == "U" else 1)
+    result = np.empty(n, dtype=bool)
+    if n == 0 or width == 0:
+        result[:] = accept[matcher.start // matcher.num_classes]
+        return result
+
+    code_type = np.uint32 if column.dtype.kind == "U" else np.uint8
+    codes = np.ascontiguousarray(column).view(code_type).reshape(n, width)
+    lengths = np.char.str_len(column)
+    start = matcher.start // matcher.num_classes
+    dead = matcher.num_states
+
+    step = max(1, _BLOCK_CELLS // width)
+    for lo in range(0, n, step):
+        block = _code_classes(matcher, codes[lo : lo + step])
+        block_lengths = lengths[lo : lo + step]
+        if (block_lengths < width).any():
+            block[np.arange(width)[None, :] >= block_lengths[:, None]] = pad
+        result[lo : lo + step] = _run_block(table, accept, start, dead, block)
+    return result
+
+
+def _simulate_grouped(matcher: DFAMatcher, inputs: list):
+    """Agrupa cadenas por longitud y simula cada grupo en bloque."""
+    table, accept, _ = _numpy_tables(matcher)
+    start = matcher.start // matcher.num_classes
+    dead = matcher.num_states
+    result = np.empty(len(inputs), dtype=bool)
+
+    groups: dict[int, list[int]] = {}
+    for i, w in enumerate(inputs):
+        groups.setdefault(len(w), []).append(i)
+
+    for length, indices in groups.items():
+        if length == 0:
+            result[indices] = accept[start]
+            continue
+        step = max(1, _BLOCK_CELLS // length)
+        for lo in range(0, len(indices), step):
+            chunk = indices[lo : lo + step]
+            codes = _encode_group([inputs[i] for i in chunk], length)
+            block = _code_classes(matcher, codes)
+            result[chunk] = _run_block(table, accept, start, dead, block)
+    return result
+
+
+def _encode_group(words: list, length: int):
+    """Concatena cadenas de igual longitud en una matriz de codigos."""
+    if isinstance(words[0], str):
+        joined = "".join(words)
+        if joined.isascii():
+            flat = np.frombuffer(joined.encode("ascii"), dtype=np.uint8)
+        else:
+            flat = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+    else:
+        flat = np.frombuffer(b"".join(words), dtype=np.uint8)
+    return flat.reshape(len(words), length)
+
+
+def _offset_table(matcher: DFAMatcher):
+    """Tabla plana con desplazamientos de fila (estado * ancho) y su ancho.
+
+    Incluye la columna de relleno de _numpy_tables, que deja el estado igual.
+    """
+    table, accept, pad = _numpy_tables(matcher)
+    width = pad + 1
+    return (table.astype(np.intp) * width).ravel(), width, accept
+
+
+def _input_codes(matcher: DFAMatcher, data):
+    """Codigos de la entrada; los buffers de bytes se ven sin copiarlos."""
+    if isinstance(data, str):
+        if matcher.utf8 or data.isascii():
+            return np.frombuffer(data.encode("utf-8"), dtype=np.uint8)
+        return np.frombuffer(data.encode("utf-32-le"), dtype=np.uint32)
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def _compose(maps):
+    """Compone en arbol los mapas (k x estados), el primero se aplica antes."""
+    rows = maps.shape[1]
+    while len(maps) > 1:
+        if len(maps) % 2:
+            maps = np.vstack([maps, np.arange(rows, dtype=maps.dtype)])
+        maps = np.take_along_axis(maps[1::2], maps[0::2], axis=1)
+    return maps[0]
+
+
+def _segment_map(flat, width: int, rows: int, classes):
+    """Mapa estado -> estado de un segmento de clases.
+
+    El segmento se divide en carriles consecutivos que avanzan juntos: en
+    cada paso, todos los estados de partida de todos los carriles leen el
+    siguiente simbolo de su carril con una sola indexacion. Al final se
+    componen los mapas de los carriles en orden.
+    """
+    n = len(classes)
+    if n == 0:
+        return np.arange(rows, dtype=np.intp)
+    lanes = max(1, min(n, _LANE_CELLS // rows))
+    length = -(-n // lanes)
+    padded = np.full(lanes * length, width - 1, dtype=classes.dtype)
+    padded[:n] = classes
+    columns = np.ascontiguousarray(padded.reshape(lanes, length).T)
+
+    offsets = np.tile(np.arange(rows, dtype=np.intp) * width, (lanes, 1))
+    for column in columns:
+        offsets = flat[offsets + column[:, None]]
+    return _compose(offsets // width)
+
+
+def state_map(dfa: DFA | CompactDFA | DFAMatcher, data):
+    """Mapa de estados de la entrada: mapa[s] es el estado al llegar desde s.
+
+    Los estados son los del matcher compilado (el estado muerto es el
+    ultimo). Los mapas de entradas consecutivas a y b se componen como
+    state_map(b)[state_map(a)], por lo que cada parte de una entrada se
+    puede procesar por separado. Requiere NumPy.
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("state_map requiere NumPy")
+    matcher = dfa if isinstance(dfa, DFAMatcher) else compile_matcher(dfa)
+    flat, width, _ = _offset_table(matcher)
+    classes = _code_classes(matcher, _input_codes(matcher, data))
+    return _segment_map(flat, width, matcher.num_states + 1, classes)
+
+
+def simulate_long(
+    dfa: DFA | CompactDFA | DFAMatcher,
+    data,
+    segment_size: int = DEFAULT_SEGMENT,
+    executor: Executor | None = None,
+    max_states: int = MAX_MAP_STATES,
+) -> bool:
+    """Simula una sola entrada larga (str, bytes, memoryview o mmap).
+
+    Pensado para AFD minimizados con pocos estados: cada segmento de la
+    entrada se reduce a su mapa estado -> estado (ver state_map), avanzando
+    todos los estados de partida a la vez con NumPy, y los mapas se componen
+    en orden. El resultado es exacto. Con executor, los segmentos se calculan
+    en sus procesos (a lo sumo dos por nucleo en vuelo) y la entrada
+    larga se reparte entre nucleos. Con mas de max_states estados (muerto
+    incluido) se usa la simulacion secuencial del matcher, que entonces es
+    mas rapida.
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("simulate_long requiere NumPy")
+    matcher = dfa if isinstance(dfa, DFAMatcher) else compile_matcher(dfa)
+    rows = matcher.num_states + 1
+    if rows > max_states:
+        return matcher.match(data) if isinstance(data, str) else matcher.match_bytes(data)
+
+    flat, width, accept = _offset_table(matcher)
+    codes = _input_codes(matcher, data)
+    state = matcher.start // matcher.num_classes
+
+    def segments():
+        for lo in range(0, len(codes), segment_size):
+            classes = _code_classes(matcher, codes[lo : lo + segment_size])
+            # uint8 reduce lo que se copia al dividir en carriles y lo que se
+            # envia a los procesos trabajadores
+            yield classes.astype(np.uint8) if width <= 256 else classes
+
+    if executor is None:
+        for classes in segments():
+            state = _segment_map(flat, width, rows, classes)[state]
+        return bool(accept[state])
+
+    window = 2 * (os.cpu_count() or 1)
+    pending: deque[Future] = deque()
+    for classes in segments():
+        pending.append(executor.submit(_segment_map, flat, width, rows, classes))
+        if len(pending) >= window:
+            state = pending.popleft().result()[state]
+    while pending:
+        state = pending.popleft().result()[state]
+    return bool(accept[state])
@@ -0,0 +1,145 @@
+"""
+Estadisticas opcionales de construccion y simulacion.
+
+Dentro de un bloque `with collect_stats() as stats:` las funciones del paquete
+acumulan en `stats` el tiempo de cada etapa y los contadores del proceso:
+
+    parse      regex -> postfijo (incluye las clases de caracteres)
+    followpos  arbol sintactico y tabla followpos
+    subset     construccion por subconjuntos
+    minimize   minimizacion de Hopcroft
+    compile    traduccion a la tabla densa de DFAMatcher
+
+Fuera de un bloque no se mide nada: cada punto de instrumentacion consulta
+una bandera global y sigue de largo. Los puntos estan en las etapas (una vez
+por construccion) y en cada llamada a simulate_dfa, nunca dentro del ciclo
+por simbolo. El colector se guarda en una ContextVar, por lo que bloques en
+hilos o tareas asyncio distintas no se mezclan.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+_current: ContextVar[BuildStats | None] = ContextVar("automaton_stats", default=None)
+# Cantidad de bloques collect_stats activos en cualquier contexto. Solo se
+# modifica con _active_lock: `+= 1` no es atomico entre hilos y un conteo
+# desviado dejaria la medicion apagada o encendida para siempre
+_active = 0
+_active_lock = threading.Lock()
+
+_NO_STAGE = nullcontext()
+
+
+@dataclass
+class BuildStats:
+    """Contadores acumulados dentro de un bloque collect_stats."""
+
+    # Segundos por etapa, sumados sobre todas las construcciones del bloque
+    timings: dict[str, float] = field(default_factory=dict)
+    # AFD construidos (build_direct_dfa, build_compact_dfa, ...)
+    builds: int = 0
+    # Posiciones del arbol sintactico (hojas, marcadores # incluidos)
+    positions: int = 0
+    # Estados antes y despues de minimize_dfa
+    states: int = 0
+    min_states: int = 0
+    # Bloques creados por divisiones durante el refinamiento de Hopcroft
+    hopcroft_splits: int = 0
+    # Mayor cantidad de posiciones en un estado del AFD
+    peak_state_size: int = 0
+    # Cadenas simuladas y transiciones recorridas por simulate_dfa
+    simulations: int = 0
+    transitions: int = 0
+    # Funcion opcional que recibe cada etapa terminada: trace(etapa, segundos)
+    trace: Callable[[str, float], None] | None = field(default=None, repr=False)
+
+    def as_dict(self) -> dict:
+        """Contadores como diccionario serializable a JSON."""
+        return {
+            "timings": dict(self.timings),
+            "builds": self.builds,
+            "positions": self.positions,
+            "states": self.states,
+            "min_states": self.min_states,
+            "hopcroft_splits": self.hopcroft_splits,
+            "peak_state_size": self.peak_state_size,
+            "simulations": self.simulations,
+            "transitions": self.transitions,
+        }
+
+    def log(self, logger: logging.Logger | None = None, level: int = logging.INFO) -> None:
+        """Emite los contadores como un registro estructurado.
+
+        El mensaje lleva el JSON de as_dict y el registro tiene el mismo
+        diccionario en el atributo `automaton_stats`.
+        """
+        data = self.as_dict()
+        (logger or logging.getLogger("automaton")).log(
+            level, "automaton stats %s", json.dumps(data), extra={"automaton_stats": data}
+        )
+
+
+@contextmanager
+def collect_stats(
+    trace: Callable[[str, float], None] | None = None,
+) -> Iterator[BuildStats]:
+    """Acumula estadisticas de todo lo que se ejecute dentro del bloque."""
+    global _active
+    stats = BuildStats(trace=trace)
+    token = _current.set(stats)
+    with _active_lock:
+        _active += 1
+    try:
+        yield stats
+    finally:
+        with _active_lock:
+            _active -= 1
+        _current.reset(token)
+
+
+def current_stats() -> BuildStats | None:
+    """Colector activo en este contexto, o None si no se estan midiendo."""
+    return _current.get() if _active else None
+
+
+class _Stage:
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats: BuildStats, name: str) -> None:
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc: object) -> None:
+        elapsed = time.perf_counter() - self.start
+        timings = self.stats.timings
+        timings[self.name] = timings.get(self.name, 0.0) + elapsed
+        if self.stats.trace is not None:
+            self.stats.trace(self.name, elapsed)
+
+
+def stage(name: str):
+    """Context manager que suma la duracion del bloque a la etapa dada."""
+    stats = current_stats()
+    return _NO_STAGE if stats is None else _Stage(stats, name)
+
+
+def record_states(stats: BuildStats, state_sizes: Iterator[int] | list[int]) -> None:
+    """Registra un AFD construido a partir de los tamanos de sus estados."""
+    count = peak = 0
+    for size in state_sizes:
+        count += 1
+        peak = max(peak, size)
+    stats.builds += 1
+    stats.states += count
+    stats.peak_state_size = max(stats.peak_state_size, peak)
@@ -2,136 +2,225 @@
 Construccion del arbol sintactico a partir de una expresion regular en postfijo.
 Calcula nullable, firstpos, lastpos y followpos para la construccion directa
 del AFD (Dragon Book, Seccion 3.9).
+
+El arbol se guarda en arreglos planos y todo se calcula en una sola pasada
+iterativa sobre el postfijo, sin recursion, por lo que admite regex de cientos
+de miles de simbolos. Los operadores + y ? son nodos propios: a+ no duplica
+el subarbol de a.
 """
 
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
 
-
-@dataclass
-class Node:
-    """Nodo base del arbol sintactico."""
-
-    nullable: bool = False
-    firstpos: set[int] = field(default_factory=set)
-    lastpos: set[int] = field(default_factory=set)
-
-
-@dataclass
-class LeafNode(Node):
-    """Hoja que representa un simbolo individual o epsilon."""
-
-    symbol: str = ""
-    position: int = -1
+from automaton.shunting_yard import tokenize
 
 
-@dataclass
-class CatNode(Node):
-    """Nodo de concatenacion (c1 . c2)."""
+# Tipos de nodo del arbol plano
+LEAF = 0
+EPSILON = 1
+CAT = 2
+OR = 3
+STAR = 4
+PLUS = 5
+OPTIONAL = 6
 
-    left: Node = field(default_factory=Node)
-    right: Node = field(default_factory=Node)
+_OPERATOR_KINDS = {".": CAT, "|": OR, "*": STAR, "+": PLUS, "?": OPTIONAL}
 
 
 @dataclass
-class OrNode(Node):
-    """Nodo de union (c1 | c2)."""
+class SyntaxTree:
+    """Arbol sintactico guardado en arreglos planos indexados por nodo.
+
+    Los nodos se numeran en el orden del postfijo (post-orden), de modo que
+    los hijos siempre tienen un indice menor que su padre y la raiz es el
+    ultimo nodo. Los operadores unarios guardan su hijo en left.
+    firstpos y lastpos son los de la raiz; los de cada nodo solo existen
+    mientras se construye su padre.
+    """
 
-    left: Node = field(default_factory=Node)
-    right: Node = field(default_factory=Node)
+    kind: bytearray = field(default_factory=bytearray)
+    left: array = field(default_factory=lambda: array("i"))
+    right: array = field(default_factory=lambda: array("i"))
+    # Posicion de cada hoja (-1 en los demas nodos)
+    position: array = field(default_factory=lambda: array("i"))
+    nullable: bytearray = field(default_factory=bytearray)
+    firstpos: frozenset[int] = frozenset()
+    lastpos: frozenset[int] = frozenset()
+    pos_symbols: dict[int, str] = field(default_factory=dict)
+    followpos: dict[int, set[int]] = field(default_factory=dict)
 
+    @property
+    def root(self) -> int:
+        return len(self.kind) - 1
 
-@dataclass
-class StarNode(Node):
-    """Nodo de cerradura de Kleene (c1*)."""
 
-    child: Node = field(default_factory=Node)
+def _union(a: set[int], b: set[int]) -> set[int]:
+    """Une dos conjuntos que ya no se usan por separado (el menor en el mayor)."""
+    if len(a) < len(b):
+        a, b = b, a
+    a |= b
+    return a
 
 
-def build_syntax_tree(
-    postfix: str,
-) -> tuple[Node, dict[int, str], dict[int, set[int]]]:
+def build_syntax_tree(postfix: str | list[str]) -> SyntaxTree:
     """Construye el arbol sintactico a partir de la regex en postfijo.
 
-    Retorna la raiz del arbol, el mapeo posicion->simbolo y la tabla followpos.
+    Acepta la cadena postfija o su lista de tokens. El postfijo ya es un
+    recorrido en post-orden, asi que nullable, firstpos, lastpos y followpos
+    se calculan en la misma pasada iterativa que crea los nodos, con una pila
+    de (firstpos, lastpos) de los subarboles aun sin padre. Cada conjunto
+    pertenece a un solo subarbol, por lo que las uniones se hacen en el
+    conjunto mayor sin copiarlo.
     """
-    stack: list[Node] = []
-    pos_counter = 0
-    pos_symbols: dict[int, str] = {}
+    if isinstance(postfix, str):
+        postfix = tokenize(postfix, dot_is_concat=True)
+
+    tree = SyntaxTree()
+    kind, left, right = tree.kind, tree.left, tree.right
+    position, nullable = tree.position, tree.nullable
+    pos_symbols, followpos = tree.pos_symbols, tree.followpos
+
+    # Pila de (nodo, firstpos, lastpos) de los subarboles pendientes
+    stack: list[tuple[int, set[int], set[int]]] = []
+
+    try:
+        for c in postfix:
+            node = len(kind)
+            op = _OPERATOR_KINDS.get(c)
+
+            if op == CAT or op == OR:
+                r, r_first, r_last = stack.pop()
+                l, l_first, l_last = stack.pop()
+                left.append(l)
+                right.append(r)
+                position.append(-1)
+                if op == CAT:
+                    # Regla CAT: para cada i en lastpos(izq), agregar firstpos(der)
+                    for i in l_last:
+                        followpos[i] |= r_first
+                    null = nullable[l] and nullable[r]
+                    first = _union(l_first, r_first) if nullable[l] else l_first
+                    last = _union(r_last, l_last) if nullable[r] else r_last
+                else:
+                    null = nullable[l] or nullable[r]
+                    first = _union(l_first, r_first)
+                    last = _union(l_last, r_last)
+
+            elif op is not None:
+                child, first, last = stack.pop()
+                left.append(child)
+                right.append(-1)
+                position.append(-1)
+                if op != OPTIONAL:
+                    # Regla STAR (tambien para +): lastpos(hijo) agrega firstpos(hijo)
+                    for i in last:
+                        followpos[i] |= first
+                null = op != PLUS or nullable[child]
+
+            elif c == "ε":
+                op = EPSILON
+                left.append(-1)
+                right.append(-1)
+                position.append(-1)
+                null, first, last = True, set(), set()
+
+            else:
+                # Hoja con simbolo del alfabeto
+                op = LEAF
+                pos = len(pos_symbols) + 1
+                pos_symbols[pos] = c
+                followpos[pos] = set()
+                left.append(-1)
+                right.append(-1)
+                position.append(pos)
+                null, first, last = False, {pos}, {pos}
+
+            kind.append(op)
+            nullable.append(null)
+            stack.append((node, first, last))
+    except IndexError:
+        raise ValueError("postfijo mal formado: operador sin operandos") from None
+    if len(stack) > 1:
+        raise ValueError("postfijo mal formado: operandos sin operador")
+
+    if stack:
+        _, first, last = stack[-1]
+        tree.firstpos, tree.lastpos = frozenset(first), frozenset(last)
+    return tree
+
+
+def build_followpos_bitsets(
+    postfix: str | list[str],
+) -> tuple[int, dict[int, str], list[int]]:
+    """Calcula firstpos de la raiz y followpos usando enteros como bitsets.
+
+    El bit p de cada entero representa la posicion p. Se recorre el postfijo
+    una sola vez con una pila de (nullable, firstpos, lastpos); las reglas
+    CAT y STAR se aplican al crear cada nodo, sin construir el arbol.
+    Retorna firstpos(raiz), el mapeo posicion->simbolo y followpos como
+    lista indexada por posicion (el indice 0 no se usa).
+    """
+    if isinstance(postfix, str):
+        postfix = tokenize(postfix, dot_is_concat=True)
 
-    for c in postfix:
-        if c == ".":
-            right = stack.pop()
-            left = stack.pop()
-            node = CatNode(left=left, right=right)
-            node.nullable = left.nullable and right.nullable
-            node.firstpos = (
-                left.firstpos | right.firstpos if left.nullable else set(left.firstpos)
-            )
-            node.lastpos = (
-                right.lastpos | left.lastpos if right.nullable else set(right.lastpos)
-            )
-            stack.append(node)
-
-        elif c == "|":
-            right = stack.pop()
-            left = stack.pop()
-            node = OrNode(left=left, right=right)
-            node.nullable = left.nullable or right.nullable
-            node.firstpos = left.firstpos | right.firstpos
-            node.lastpos = left.lastpos | right.lastpos
-            stack.append(node)
-
-        elif c == "*":
-            child = stack.pop()
-            node = StarNode(child=child)
-            node.nullable = True
-            node.firstpos = set(child.firstpos)
-            node.lastpos = set(child.lastpos)
-            stack.append(node)
-
-        elif c == "ε":
-            node = LeafNode(symbol="ε", position=-1)
-            node.nullable = True
-            node.firstpos = set()
-            node.lastpos = set()
-            stack.append(node)
-
-        else:
-            # Hoja con simbolo del alfabeto
-            pos_counter += 1
-            pos = pos_counter
-            pos_symbols[pos] = c
-            node = LeafNode(symbol=c, position=pos)
-            node.nullable = False
-            node.firstpos = {pos}
-            node.lastpos = {pos}
-            stack.append(node)
-
-    root = stack[0] if stack else LeafNode()
-
-    followpos: dict[int, set[int]] = {p: set() for p in pos_symbols}
-    _compute_followpos(root, followpos)
-
-    return root, pos_symbols, followpos
-
-
-def _compute_followpos(node: Node, followpos: dict[int, set[int]]) -> None:
-    """Calcula followpos recursivamente para todas las posiciones del arbol."""
-    if isinstance(node, CatNode):
-        _compute_followpos(node.left, followpos)
-        _compute_followpos(node.right, followpos)
-        # Regla CAT: para cada i en lastpos(izq), agregar firstpos(der) a followpos(i)
-        for i in node.left.lastpos:
-            followpos[i] |= node.right.firstpos
-
-    elif isinstance(node, OrNode):
-        _compute_followpos(node.left, followpos)
-        _compute_followpos(node.right, followpos)
-
-    elif isinstance(node, StarNode):
-        _compute_followpos(node.child, followpos)
-        # Regla STAR: para cada i en lastpos(hijo), agregar firstpos(hijo) a followpos(i)
-        for i in node.child.lastpos:
-            followpos[i] |= node.child.firstpos
+    stack: list[tuple[bool, int, int]] = []
+    pos_symbols: dict[int, str] = {}
+    followpos: list[int] = [0]
+
+    try:
+        for c in postfix:
+            if c == ".":
+                r_null, r_first, r_last = stack.pop()
+                l_null, l_first, l_last = stack.pop()
+                # Regla CAT: para cada i en lastpos(izq), agregar firstpos(der)
+                for i in _iter_bits(l_last):
+                    followpos[i] |= r_first
+                stack.append(
+                    (
+                        l_null and r_null,
+                        l_first | r_first if l_null else l_first,
+                        l_last | r_last if r_null else r_last,
+                    )
+                )
+
+            elif c == "|":
+                r_null, r_first, r_last = stack.pop()
+                l_null, l_first, l_last = stack.pop()
+                stack.append((l_null or r_null, l_first | r_first, l_last | r_last))
+
+            elif c == "*" or c == "+":
+                null, first, last = stack.pop()
+                # Regla STAR (tambien para +): lastpos(hijo) agrega firstpos(hijo)
+                for i in _iter_bits(last):
+                    followpos[i] |= first
+                stack.append((c == "*" or null, first, last))
+
+            elif c == "?":
+                _, first, last = stack.pop()
+                stack.append((True, first, last))
+
+            elif c == "ε":
+                stack.append((True, 0, 0))
+
+            else:
+                pos = len(followpos)
+                pos_symbols[pos] = c
+                followpos.append(0)
+                stack.append((False, 1 << pos, 1 << pos))
+    except IndexError:
+        raise ValueError("postfijo mal formado: operador sin operandos") from None
+    if len(stack) > 1:
+        raise ValueError("postfijo mal formado: operandos sin operador")
+
+    first = stack[0][1] if stack else 0
+    return first, pos_symbols, followpos
+
+
+def _iter_bits(mask: int):
+    """Genera los indices de los bits encendidos de mask."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
@@ -0,0 +1,120 @@
+"""
+Modo de bytes: AFD sobre la codificacion UTF-8 de la regex.
+
+Cada hoja del arbol sintactico es un conjunto de code points. En modo de
+bytes, las hojas con code points no ASCII se reemplazan en el postfijo por la
+alternacion de secuencias de rangos de bytes que codifican exactamente ese
+conjunto en UTF-8 (la division de rangos de RE2). Por ejemplo, [a-zá] pasa a
+ser ([a-z]|\\xc3\\xa1), y [^\\n] una alternacion de una a cuatro clases
+concatenadas.
+
+Los bytes se representan con el caracter latin-1 del mismo codigo, de modo
+que el resto de la construccion no cambia y el alfabeto del AFD queda dentro
+de 0-255. La tabla byte -> clase de DFAMatcher cubre entonces todo el
+alfabeto, y match_bytes recorre bytes, bytearray, memoryview o mmap sin
+decodificarlos. Los sustitutos (U+D800-U+DFFF) no existen en UTF-8 y se
+excluyen, por lo que solo se aceptan secuencias bien formadas.
+"""
+
+from __future__ import annotations
+
+from automaton.charset import MAX_CODE, CharSet, parse_atom
+
+ByteSequence = tuple[tuple[int, int], ...]
+
+_SURROGATES = (0xD800, 0xDFFF)
+# Mayor code point que se codifica con 1, 2 y 3 bytes
+_LENGTH_LIMITS = (0x7F, 0x7FF, 0xFFFF)
+
+# Operadores del postfijo y caracteres que se escapan fuera y dentro de clases
+_OPERAND_SPECIAL = set("|.*+?()[\\")
+_CLASS_SPECIAL = set("\\]^-[")
+
+
+def _split_same_length(lo: int, hi: int, out: list[ByteSequence]) -> None:
+    """Divide [lo, hi] (misma longitud de codificacion) en rangos por byte."""
+    n = len(chr(lo).encode("utf-8"))
+    for i in range(1, n):
+        m = (1 << 6 * i) - 1
+        if lo & ~m != hi & ~m:
+            if lo & m:
+                _split_same_length(lo, lo | m, out)
+                _split_same_length((lo | m) + 1, hi, out)
+                return
+            if hi & m != m:
+                _split_same_length(lo, (hi & ~m) - 1, out)
+                _split_same_length(hi & ~m, hi, out)
+                return
+    out.append(tuple(zip(chr(lo).encode("utf-8"), chr(hi).encode("utf-8"))))
+
+
+def utf8_sequences(charset: CharSet) -> list[ByteSequence]:
+    """Secuencias de rangos de bytes cuyas concatenaciones codifican el conjunto.
+
+    Cada secuencia ((lo1, hi1), (lo2, hi2), ...) acepta los bytes b1 b2 ...
+    con lo_i <= b_i <= hi_i; las secuencias son disjuntas.
+    """
+    sequences: list[ByteSequence] = []
+    for lo, hi in charset:
+        pieces = [(lo, hi)]
+        if lo <= _SURROGATES[1] and hi >= _SURROGATES[0]:
+            pieces = [(lo, _SURROGATES[0] - 1), (_SURROGATES[1] + 1, hi)]
+        for a, b in pieces:
+            for limit in (*_LENGTH_LIMITS, MAX_CODE):
+                if a > b:
+                    break
+                if a <= limit:
+                    _split_same_length(a, min(b, limit), sequences)
+                    a = limit + 1
+    return sequences
+
+
+def _escape(code: int, special: set[str]) -> str:
+    c = chr(code)
+    return "\\" + c if c in special else c
+
+
+def _byte_token(lo: int, hi: int) -> str:
+    """Token operando para el rango de bytes [lo, hi] (como caracteres latin-1)."""
+    if lo == hi:
+        return _escape(lo, _OPERAND_SPECIAL)
+    return f"[{_escape(lo, _CLASS_SPECIAL)}-{_escape(hi, _CLASS_SPECIAL)}]"
+
+
+def _encode_operand(token: str) -> list[str] | None:
+    """Postfijo de bytes equivalente al operando, o None si es solo ASCII."""
+    charset = parse_atom(token)
+    if not charset or charset[-1][1] < 0x80:
+        return None
+    postfix: list[str] = []
+    for i, sequence in enumerate(utf8_sequences(charset)):
+        for j, (lo, hi) in enumerate(sequence):
+            postfix.append(_byte_token(lo, hi))
+            if j:
+                postfix.append(".")
+        if i:
+            postfix.append("|")
+    return postfix
+
+
+def utf8_postfix(postfix: list[str]) -> list[str]:
+    """Reemplaza los operandos no ASCII del postfijo por sus secuencias UTF-8."""
+    result: list[str] = []
+    encoded: dict[str, list[str] | None] = {}
+    for token in postfix:
+        if token in (".", "|", "*", "+", "?", "ε"):
+            result.append(token)
+            continue
+        if token not in encoded:
+            encoded[token] = _encode_operand(token)
+        replacement = encoded[token]
+        if replacement is None:
+            result.append(token)
+        else:
+            result.extend(replacement)
+    return result
+
+
+def byte_string(text: str) -> str:
+    """Bytes UTF-8 del texto como caracteres latin-1 (el alfabeto de un AFD utf8)."""
+    return text.encode("utf-8").decode("latin-1")
@@ -1,12 +1,30 @@
 """
 Generacion de diagramas de AFD con Graphviz e impresion de la tabla
 de transiciones en consola.
+
+write_dot escribe el mismo grafo en formato DOT sin depender de Graphviz,
+para abrirlo con otras herramientas o renderizarlo despues con `dot`, y
+write_tsv la tabla de transiciones separada por tabuladores. Ambos escriben
+estado por estado en el archivo dado, sin armar la salida completa en
+memoria.
+
+Para AFD grandes se puede mostrar solo una parte: la vecindad de k saltos de
+un estado (neighbourhood) o el grafo condensado de componentes fuertemente
+conexas (condense), donde cada componente es un nodo. render_dfa cambia a la
+vista condensada si el AFD supera max_states y corta el proceso de Graphviz
+al pasar timeout segundos.
 """
 
 from __future__ import annotations
 
+import io
 import os
+import subprocess
+import sys
+from collections.abc import Collection, Iterator
+from typing import TextIO
 
+from automaton.compact_dfa import CompactDFA
 from automaton.direct_dfa import DFA
 
 try:
@@ -15,25 +33,226 @@ try:
 except ImportError:
     HAS_GRAPHVIZ = False
 
+# render_dfa dibuja a lo sumo tantos nodos; si no, usa el grafo condensado
+RENDER_MAX_STATES = 300
+# Segundos maximos del proceso dot de Graphviz en render_dfa
+RENDER_TIMEOUT = 30.0
+# print_dfa_table imprime a lo sumo tantas filas por defecto
+TABLE_MAX_STATES = 500
 
-def render_dfa(
-    dfa: DFA,
-    filename: str = "dfa",
-    output_dir: str = "output",
+
+def _num_states(dfa: DFA | CompactDFA) -> int:
+    return dfa.num_states if isinstance(dfa, CompactDFA) else len(dfa.states)
+
+
+def _grouped_rows(dfa: DFA | CompactDFA) -> Iterator[tuple[int, dict[int, list[str]]]]:
+    """Genera, por estado, sus destinos con los simbolos que llevan a cada uno."""
+    if isinstance(dfa, CompactDFA):
+        width = len(dfa.alphabet)
+        for s in range(dfa.num_states):
+            targets: dict[int, list[str]] = {}
+            row = s * width
+            for k, symbol in enumerate(dfa.alphabet):
+                t = dfa.table[row + k]
+                if t >= 0:
+                    targets.setdefault(t, []).append(symbol)
+            yield s, targets
+        return
+
+    rows: dict[int, dict[int, list[str]]] = {}
+    for (src, symbol), dst in dfa.transitions.items():
+        rows.setdefault(src, {}).setdefault(dst, []).append(symbol)
+    for s in range(len(dfa.states)):
+        yield s, rows.get(s, {})
+
+
+def _edges(dfa: DFA | CompactDFA) -> Iterator[tuple[int, int]]:
+    """Genera los pares (origen, destino) de todas las transiciones."""
+    if isinstance(dfa, CompactDFA):
+        width = len(dfa.alphabet)
+        for i, t in enumerate(dfa.table):
+            if t >= 0:
+                yield i // width, t
+    else:
+        for (src, _), dst in dfa.transitions.items():
+            yield src, dst
+
+
+def neighbourhood(dfa: DFA | CompactDFA, state: int, hops: int = 2) -> set[int]:
+    """Estados a lo sumo a `hops` transiciones de state, en ambos sentidos.
+
+    Cada salto recorre todas las transiciones una vez, sin construir listas
+    de adyacencia, por lo que la memoria extra es solo la del resultado.
+    """
+    seen = {state}
+    frontier = {state}
+    for _ in range(hops):
+        found: set[int] = set()
+        for src, dst in _edges(dfa):
+            if src in frontier and dst not in seen:
+                found.add(dst)
+            elif dst in frontier and src not in seen:
+                found.add(src)
+        if not found:
+            break
+        seen |= found
+        frontier = found
+    return seen
+
+
+def condense(dfa: DFA | CompactDFA) -> tuple[list[int], int]:
+    """Componentes fuertemente conexas (Tarjan iterativo).
+
+    Retorna la componente de cada estado y la cantidad de componentes. Las
+    componentes se numeran en orden topologico inverso: las aristas entre
+    componentes distintas van de un numero mayor a uno menor.
+    """
+    n = _num_states(dfa)
+    successors: list[list[int]] = [[] for _ in range(n)]
+    for src, dst in _edges(dfa):
+        successors[src].append(dst)
+
+    index = [-1] * n
+    low = [0] * n
+    component = [-1] * n
+    on_stack = [False] * n
+    stack: list[int] = []
+    count = counter = 0
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        # Pila de llamadas: (estado, siguiente sucesor por visitar)
+        calls = [(root, 0)]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while calls:
+            v, i = calls[-1]
+            if i < len(successors[v]):
+                calls[-1] = (v, i + 1)
+                w = successors[v][i]
+                if index[w] < 0:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    calls.append((w, 0))
+                elif on_stack[w]:
+                    low[v] = min(low[v], index[w])
+                continue
+            calls.pop()
+            if calls:
+                parent = calls[-1][0]
+                low[parent] = min(low[parent], low[v])
+            if low[v] == index[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = count
+                    if w == v:
+                        break
+                count += 1
+    return component, count
+
+
+def _dot_string(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def write_dot(
+    dfa: DFA | CompactDFA,
+    out: TextIO,
     title: str = "DFA",
-    view: bool = False,
-) -> str | None:
-    """Renderiza el AFD como imagen PNG usando Graphviz.
-    Retorna la ruta de la imagen generada, o None si Graphviz no esta disponible.
+    states: Collection[int] | None = None,
+) -> None:
+    """Escribe el AFD en formato DOT en el archivo de texto dado, sin Graphviz.
+
+    Como render_dfa, las transiciones con el mismo origen y destino se
+    combinan en una arista con sus simbolos separados por comas. Con states
+    solo se escriben esos estados y las transiciones entre ellos.
     """
-    if not HAS_GRAPHVIZ:
-        print("[AVISO] paquete graphviz no instalado. Se omite la visualizacion.")
-        print("  Instalar con: pip install graphviz")
-        print("  Tambien instalar binarios de Graphviz: https://graphviz.org/download/")
-        return None
+    accepting = dfa.accept_states
+    out.write(f"digraph {_dot_string(title)} {{\n")
+    out.write("  rankdir=LR;\n  node [shape=circle];\n")
+    if states is None or dfa.start_state in states:
+        out.write(f"  start [shape=point];\n  start -> q{dfa.start_state};\n")
+    for s, targets in _grouped_rows(dfa):
+        if states is not None and s not in states:
+            continue
+        out.write(f"  q{s} [shape=doublecircle];\n" if s in accepting else f"  q{s};\n")
+        for t, symbols in targets.items():
+            if states is None or t in states:
+                label = _dot_string(", ".join(sorted(symbols)))
+                out.write(f"  q{s} -> q{t} [label={label}];\n")
+    out.write("}\n")
 
-    os.makedirs(output_dir, exist_ok=True)
 
+def write_condensed_dot(dfa: DFA | CompactDFA, out: TextIO, title: str = "DFA") -> int:
+    """Escribe el grafo condensado de componentes fuertemente conexas en DOT.
+
+    Cada componente es un nodo con su cantidad de estados (doble circulo si
+    contiene algun estado de aceptacion, caja si tiene mas de un estado) y
+    cada arista indica cuantas transiciones une. Retorna la cantidad de
+    componentes.
+    """
+    component, count = condense(dfa)
+    sizes = [0] * count
+    for c in component:
+        sizes[c] += 1
+    accepting = [False] * count
+    for s in dfa.accept_states:
+        accepting[component[s]] = True
+    links: dict[tuple[int, int], int] = {}
+    for src, dst in _edges(dfa):
+        a, b = component[src], component[dst]
+        if a != b:
+            links[(a, b)] = links.get((a, b), 0) + 1
+
+    out.write(f"digraph {_dot_string(title)} {{\n  rankdir=LR;\n")
+    out.write(f"  start [shape=point];\n  start -> c{component[dfa.start_state]};\n")
+    for c in range(count):
+        shape = "doublecircle" if accepting[c] else ("box" if sizes[c] > 1 else "circle")
+        label = f"C{c}" if sizes[c] == 1 else f"C{c}\\n{sizes[c]} estados"
+        out.write(f'  c{c} [shape={shape}, label="{label}"];\n')
+    for (a, b), transitions in links.items():
+        out.write(f'  c{a} -> c{b} [label="{transitions}"];\n')
+    out.write("}\n")
+    return count
+
+
+def to_dot(dfa: DFA | CompactDFA, title: str = "DFA") -> str:
+    """Texto DOT del AFD (ver write_dot)."""
+    buffer = io.StringIO()
+    write_dot(dfa, buffer, title)
+    return buffer.getvalue()
+
+
+def write_tsv(
+    dfa: DFA | CompactDFA,
+    out: TextIO,
+    states: Collection[int] | None = None,
+) -> None:
+    """Escribe la tabla de transiciones separada por tabuladores.
+
+    Una fila por estado con el destino de cada simbolo ("-" si no hay
+    transicion) y una ultima columna 1/0 de aceptacion.
+    """
+    alphabet = sorted(dfa.alphabet)
+    accepting = dfa.accept_states
+    out.write("\t".join(["estado", *alphabet, "acepta"]) + "\n")
+    for s, targets in _grouped_rows(dfa):
+        if states is not None and s not in states:
+            continue
+        row = dict.fromkeys(alphabet, "-")
+        for t, symbols in targets.items():
+            for symbol in symbols:
+                row[symbol] = f"q{t}"
+        out.write(f"q{s}\t" + "\t".join(row.values()) + f"\t{int(s in accepting)}\n")
+
+
+def _styled_graph(dfa: DFA | CompactDFA, title: str, states: Collection[int] | None):
+    """Digraph de Graphviz con el estilo de render_dfa para los estados dados."""
     dot = graphviz.Digraph(title, format="png")
 
     # Configuracion general del grafo para mayor claridad
@@ -73,21 +292,18 @@ def render_dfa(
     )
 
     # Flecha de entrada al estado inicial
-    dot.node("start", shape="point", width="0.0", height="0.0")
-    dot.edge("start", f"q{dfa.start_state}", penwidth="2", color="#2c3e50")
+    if states is None or dfa.start_state in states:
+        dot.node("start", shape="point", width="0.0", height="0.0")
+        dot.edge("start", f"q{dfa.start_state}", penwidth="2", color="#2c3e50")
 
-    for i in range(len(dfa.states)):
+    accepting = dfa.accept_states
+    for i, targets in _grouped_rows(dfa):
+        if states is not None and i not in states:
+            continue
         label = f"q{i}"
 
-        if i in dfa.accept_states and i == dfa.start_state:
-            # Estado inicial y de aceptacion
-            dot.node(
-                f"q{i}", label=label, shape="doublecircle",
-                fillcolor="#a8d8a8", color="#2e7d32", fontcolor="#1b5e20",
-                penwidth="3",
-            )
-        elif i in dfa.accept_states:
-            # Estado de aceptacion
+        if i in accepting:
+            # Estado de aceptacion (inicial o no)
             dot.node(
                 f"q{i}", label=label, shape="doublecircle",
                 fillcolor="#a8d8a8", color="#2e7d32", fontcolor="#1b5e20",
@@ -104,59 +320,128 @@ def render_dfa(
             # Estado regular
             dot.node(f"q{i}", label=label, shape="circle")
 
-    # Agrupar transiciones con mismo (origen, destino) para combinar etiquetas
-    edge_labels: dict[tuple[int, int], list[str]] = {}
-    for (src, symbol), dst in dfa.transitions.items():
-        key = (src, dst)
-        if key not in edge_labels:
-            edge_labels[key] = []
-        edge_labels[key].append(symbol)
-
-    for (src, dst), symbols in edge_labels.items():
-        label = ", ".join(sorted(symbols))
-
-        if src == dst:
-            # Self-loop: resaltar para que sea facil de identificar
-            dot.edge(
-                f"q{src}", f"q{dst}", label=f"  {label}  ",
-                color="#8e44ad", fontcolor="#6a1b9a",
-                penwidth="1.8",
+        # Transiciones con mismo (origen, destino) combinan sus etiquetas
+        for dst, symbols in targets.items():
+            if states is not None and dst not in states:
+                continue
+            edge_label = ", ".join(sorted(symbols))
+            if i == dst:
+                # Self-loop: resaltar para que sea facil de identificar
+                dot.edge(
+                    f"q{i}", f"q{dst}", label=f"  {edge_label}  ",
+                    color="#8e44ad", fontcolor="#6a1b9a",
+                    penwidth="1.8",
+                )
+            else:
+                dot.edge(f"q{i}", f"q{dst}", label=f"  {edge_label}  ")
+    return dot
+
+
+def render_dfa(
+    dfa: DFA | CompactDFA,
+    filename: str = "dfa",
+    output_dir: str = "output",
+    title: str = "DFA",
+    view: bool = False,
+    max_states: int = RENDER_MAX_STATES,
+    timeout: float | None = RENDER_TIMEOUT,
+    around: int | None = None,
+    hops: int = 2,
+    condensed: bool = False,
+) -> str | None:
+    """Renderiza el AFD como imagen PNG usando Graphviz.
+    Retorna la ruta de la imagen generada, o None si Graphviz no esta disponible.
+
+    Con around se dibuja solo la vecindad de `hops` saltos de ese estado; con
+    condensed, el grafo de componentes fuertemente conexas. Si la vista
+    elegida tiene mas de max_states estados se usa la condensada, y si aun
+    asi los supera no se dibuja nada. El proceso dot se cancela a los
+    timeout segundos.
+    """
+    if not HAS_GRAPHVIZ:
+        print("[AVISO] paquete graphviz no instalado. Se omite la visualizacion.")
+        print("  Instalar con: pip install graphviz")
+        print("  Tambien instalar binarios de Graphviz: https://graphviz.org/download/")
+        return None
+
+    states = neighbourhood(dfa, around, hops) if around is not None else None
+    shown = _num_states(dfa) if states is None else len(states)
+    if condensed or shown > max_states:
+        buffer = io.StringIO()
+        count = write_condensed_dot(dfa, buffer, title)
+        if count > max_states:
+            print(
+                f"[AVISO] {shown} estados y {count} componentes superan max_states={max_states}."
+                " Se omite la visualizacion; usar around= o write_dot."
             )
-        else:
-            dot.edge(f"q{src}", f"q{dst}", label=f"  {label}  ")
+            return None
+        if not condensed:
+            print(f"[AVISO] {shown} estados superan max_states={max_states}; se dibujan {count} componentes.")
+        source = buffer.getvalue()
+    else:
+        source = _styled_graph(dfa, title, states).source
 
-    filepath = os.path.join(output_dir, filename)
-    dot.render(filepath, cleanup=True)
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, filename) + ".png"
+    try:
+        subprocess.run(
+            ["dot", "-Tpng", "-o", output_path],
+            input=source.encode("utf-8"),
+            capture_output=True,
+            check=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        print(f"[AVISO] Graphviz no termino en {timeout} s. Se omite la visualizacion.")
+        return None
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"[AVISO] no se pudo ejecutar Graphviz: {e}")
+        return None
 
-    output_path = f"{filepath}.png"
     print(f"  Diagrama del AFD guardado en: {output_path}")
 
     if view:
         try:
-            dot.view()
+            graphviz.view(output_path)
         except Exception:
             pass
 
     return output_path
 
 
-def print_dfa_table(dfa: DFA) -> None:
-    """Imprime la tabla de transiciones del AFD en consola."""
+def print_dfa_table(
+    dfa: DFA | CompactDFA,
+    max_states: int | None = TABLE_MAX_STATES,
+    out: TextIO | None = None,
+) -> None:
+    """Imprime la tabla de transiciones del AFD en consola.
+
+    Se imprimen a lo sumo max_states filas (None para todas); cada fila se
+    arma de una vez y se escribe en out (por defecto sys.stdout).
+    """
+    out = out or sys.stdout
     alphabet = sorted(dfa.alphabet)
+    accepting = dfa.accept_states
 
     header = (
         f"{'Estado':>8} | "
         + " | ".join(f"{s:>6}" for s in alphabet)
         + " | Acepta"
     )
-    print(header)
-    print("-" * len(header))
-
-    for i in range(len(dfa.states)):
-        row = f"{'q' + str(i):>8} | "
-        for symbol in alphabet:
-            target = dfa.transitions.get((i, symbol))
-            cell = f"q{target}" if target is not None else "-"
-            row += f"{cell:>6} | "
-        row += "Si" if i in dfa.accept_states else "No"
-        print(row)
+    out.write(header + "\n" + "-" * len(header) + "\n")
+
+    total = _num_states(dfa)
+    for i, targets in _grouped_rows(dfa):
+        if max_states is not None and i >= max_states:
+            out.write(f"... ({total - max_states} estados mas; usar write_tsv para la tabla completa)\n")
+            break
+        cells = dict.fromkeys(alphabet, "-")
+        for t, symbols in targets.items():
+            for symbol in symbols:
+                cells[symbol] = f"q{t}"
+        out.write(
+            f"{'q' + str(i):>8} | "
+            + "".join(f"{cell:>6} | " for cell in cells.values())
+            + ("Si" if i in accepting else "No")
+            + "\n"
+        )
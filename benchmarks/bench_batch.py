@@ -0,0 +1,54 @@
+"""
+Benchmark: simulate_dfa en un ciclo de Python contra simulate_many.
+
+Uso:
+    python -m benchmarks.bench_batch
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from automaton.direct_dfa import build_direct_dfa
+from automaton.minimization import minimize_dfa
+from automaton.simulation import HAS_NUMPY, simulate_dfa, simulate_many
+
+
+def main(count: int = 200_000, max_length: int = 32) -> None:
+    dfa = minimize_dfa(build_direct_dfa("(a|b)*abb(a|b)*"))
+    rng = random.Random(0)
+    lines = [
+        "".join(rng.choice("ab") for _ in range(rng.randint(0, max_length)))
+        for _ in range(count)
+    ]
+
+    start = time.perf_counter()
+    expected = [simulate_dfa(dfa, w) for w in lines]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = simulate_many(dfa, lines)
+    batch_time = time.perf_counter() - start
+    assert result == expected, "resultados distintos"
+
+    print(f"  Cadenas:         {count}")
+    print(f"  NumPy:           {'Si' if HAS_NUMPY else 'No'}")
+    print(f"  simulate_dfa:    {loop_time:.3f}s")
+    print(f"  simulate_many:   {batch_time:.3f}s ({loop_time / batch_time:.1f}x)")
+
+    if HAS_NUMPY:
+        import numpy as np
+
+        fixed = np.array(
+            ["".join(rng.choice("ab") for _ in range(max_length)) for _ in range(count)],
+            dtype=f"S{max_length}",
+        )
+        start = time.perf_counter()
+        simulate_many(dfa, fixed, as_array=True)
+        column_time = time.perf_counter() - start
+        print(f"  columna 'S':     {column_time:.3f}s (sin copia de entrada)")
+
+
+if __name__ == "__main__":
+    main()
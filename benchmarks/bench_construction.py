@@ -0,0 +1,110 @@
+"""
+Benchmark: build_direct_dfa (conjuntos) contra build_direct_dfa_bitset, y
+escalamiento del arbol sintactico con regex muy largas.
+
+Uso:
+    python -m benchmarks.bench_construction
+
+El primer corpus son alternaciones grandes de palabras clave, donde la
+cantidad de posiciones crece con el numero de palabras. El segundo son
+literales largos y grupos anidados con +, que miden que la construccion del
+arbol y de followpos sea lineal. El tercero son literales largos construidos
+con ambos caminos: con una posicion por estado, los bitsets crecen
+cuadraticamente y dejan de convenir cerca de BITSET_MAX_POSITIONS.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from automaton.direct_dfa import (
+    BITSET_MAX_POSITIONS,
+    build_direct_dfa,
+    build_direct_dfa_bitset,
+)
+from automaton.shunting_yard import to_postfix
+from automaton.syntax_tree import build_syntax_tree
+
+
+def keyword_alternation(count: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    words = {
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 8)))
+        for _ in range(count)
+    }
+    return "(" + "|".join(sorted(words)) + ")"
+
+
+def long_regexes(size: int, seed: int = 0) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    literal = "".join(rng.choice("abcdefgh") for _ in range(size))
+    nested = "(" * (size // 3) + "a)+" * (size // 3)
+    return [("literal", literal), ("anidado +", nested)]
+
+
+def tree_scaling() -> None:
+    print(f"{'Regex':>10} | {'Simbolos':>9} | {'Postfijo':>9} | {'Arbol':>8} | {'us/simbolo':>10}")
+    print("-" * 60)
+    for size in (1_000, 10_000, 100_000):
+        for name, regex in long_regexes(size):
+            start = time.perf_counter()
+            postfix = to_postfix(regex)
+            parse_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            build_syntax_tree(postfix)
+            tree_time = time.perf_counter() - start
+
+            print(
+                f"{name:>10} | {len(regex):>9} | {parse_time:>8.3f}s | {tree_time:>7.3f}s "
+                f"| {1e6 * (parse_time + tree_time) / len(regex):>10.2f}"
+            )
+
+
+def literal_crossover() -> None:
+    print(f"Literales (BITSET_MAX_POSITIONS = {BITSET_MAX_POSITIONS})")
+    print(f"{'Posiciones':>10} | {'sets':>8} | {'bitset':>8} | {'x':>5}")
+    print("-" * 42)
+    for size in (1_000, 4_000, 16_000):
+        regex = long_regexes(size)[0][1]
+
+        start = time.perf_counter()
+        build_direct_dfa(regex)
+        set_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        build_direct_dfa_bitset(regex)
+        bit_time = time.perf_counter() - start
+
+        print(f"{size:>10} | {set_time:>7.3f}s | {bit_time:>7.3f}s | {set_time / bit_time:>4.1f}x")
+
+
+def main() -> None:
+    print(f"{'Palabras':>9} | {'Posiciones':>10} | {'Estados':>8} | {'sets':>8} | {'bitset':>8} | {'x':>5}")
+    print("-" * 65)
+    for count in (50, 200, 800):
+        regex = keyword_alternation(count)
+        positions = sum(c.isalpha() for c in regex)
+
+        start = time.perf_counter()
+        dfa = build_direct_dfa(regex)
+        set_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        build_direct_dfa_bitset(regex)
+        bit_time = time.perf_counter() - start
+
+        print(
+            f"{count:>9} | {positions:>10} | {len(dfa.states):>8} | {set_time:>7.2f}s "
+            f"| {bit_time:>7.2f}s | {set_time / bit_time:>4.1f}x"
+        )
+
+    print()
+    tree_scaling()
+    print()
+    literal_crossover()
+
+
+if __name__ == "__main__":
+    main()
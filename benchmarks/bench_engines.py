@@ -0,0 +1,55 @@
+"""
+Benchmark: costo total (compilar + evaluar) del AFN de posiciones, el AFD
+perezoso y el AFD completo segun el volumen de entrada, y el motor que elige
+compile_auto. Sirve para calibrar NFA_MAX_VOLUME y DFA_VOLUME_PER_SYMBOL en
+automaton/compiler.py.
+
+Uso:
+    python -m benchmarks.bench_engines
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from automaton.compiler import cache_clear, choose_engine, compile
+from automaton.lazy_dfa import build_lazy_dfa
+from automaton.nfa import build_position_nfa
+from benchmarks.bench_construction import keyword_alternation
+
+# Cada texto se genera sobre un alfabeto que mantiene vivo al automata
+PATTERNS = [
+    ("pequena", "(a|b)*abb", "ab"),
+    ("exponencial", "(a|b)*a" + "(a|b)" * 12, "ab"),
+    ("palabras", "[a-z]*" + keyword_alternation(200), "abcdefghijklmnopqrstuvwxyz"),
+    ("literal", "[a-c]*" + "".join(random.Random(0).choice("abc") for _ in range(300)), "abc"),
+]
+VOLUMES = [1_000, 30_000, 300_000]
+
+
+def _total(build, text: str) -> float:
+    cache_clear()
+    start = time.perf_counter()
+    build().match(text)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    rng = random.Random(0)
+    print(f"{'Patron':>12} | {'Volumen':>8} | {'AFN':>8} | {'Perezoso':>8} | {'AFD':>8} | {'auto':>6}")
+    print("-" * 66)
+    for name, regex, alphabet in PATTERNS:
+        for volume in VOLUMES:
+            text = "".join(rng.choice(alphabet) for _ in range(volume))
+            nfa = _total(lambda: build_position_nfa(regex), text)
+            lazy = _total(lambda: build_lazy_dfa(regex), text)
+            dfa = _total(lambda: compile(regex), text)
+            print(
+                f"{name:>12} | {volume:>8} | {nfa:>7.3f}s | {lazy:>7.3f}s | {dfa:>7.3f}s "
+                f"| {choose_engine(regex, volume):>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
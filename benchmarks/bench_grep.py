@@ -0,0 +1,50 @@
+"""
+Benchmark: rendimiento de grep_files segun la cantidad de procesos.
+
+Uso:
+    python -m benchmarks.bench_grep
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+import time
+
+from automaton.grep import grep_files
+
+
+def _write_corpus(path: str, lines: int, seed: int = 0) -> int:
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        for _ in range(lines):
+            f.write("".join(rng.choice("abcx") for _ in range(rng.randint(0, 80))) + "\n")
+    return os.path.getsize(path)
+
+
+def main(lines: int = 400_000, regex: str = "abba(c|x)+") -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.txt")
+        size = _write_corpus(path, lines)
+        print(f"  Corpus: {size / 1e6:.1f} MB, regex: {regex}")
+        print(f"{'Procesos':>10} | {'Tiempo':>8} | {'MB/s':>8} | {'Aceleracion':>11}")
+        print("-" * 48)
+
+        base_time = None
+        jobs = 1
+        while jobs <= (os.cpu_count() or 1):
+            start = time.perf_counter()
+            for _ in grep_files(regex, [path], jobs=jobs, chunk_size=1 << 20, collect=False):
+                pass
+            elapsed = time.perf_counter() - start
+            base_time = base_time or elapsed
+            print(
+                f"{jobs:>10} | {elapsed:>7.2f}s | {size / 1e6 / elapsed:>8.1f} "
+                f"| {base_time / elapsed:>10.2f}x"
+            )
+            jobs *= 2
+
+
+if __name__ == "__main__":
+    main()
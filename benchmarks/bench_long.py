@@ -0,0 +1,70 @@
+"""
+Benchmark: una sola entrada larga con match_bytes (secuencial) contra
+simulate_long (composicion de mapas de estados con NumPy), en un proceso y
+repartida en un pool de procesos, segun la cantidad de estados del AFD.
+
+El costo por simbolo de simulate_long crece con los estados (cada paso
+avanza todos los estados de partida), por lo que conviene con AFD
+minimizados pequenos; sirve para calibrar MAX_MAP_STATES en
+automaton/simulation.py.
+
+Uso:
+    python -m benchmarks.bench_long [--size MB] [--workers N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from automaton.compiler import compile
+from automaton.simulation import HAS_NUMPY, simulate_long
+
+# (a|b)*a(a|b)^n tiene 2^(n+1) estados minimizados
+PATTERNS = ["(a|b)*abb"] + ["(a|b)*a" + "(a|b)" * n for n in (2, 3, 4)]
+FORCE = 1 << 10
+
+
+def _timed(fn) -> tuple[float, bool]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_long")
+    parser.add_argument("--size", type=int, default=20, help="Tamano de la entrada en MB")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+    if not HAS_NUMPY:
+        print("simulate_long requiere NumPy")
+        return
+
+    rng = random.Random(0)
+    block = "".join(rng.choice("ab") for _ in range(1 << 16)).encode()
+    data = block * ((args.size << 20) // len(block)) + b"abb"
+
+    print(f"Entrada: {len(data) / 2**20:.0f} MB, {args.workers} procesos")
+    print(f"{'Estados':>8} | {'secuencial':>10} | {'mapas':>8} | {'x':>5} | {'pool':>8} | {'x':>5}")
+    print("-" * 60)
+    with ProcessPoolExecutor(args.workers) as executor:
+        for regex in PATTERNS:
+            matcher = compile(regex)
+            base, expected = _timed(lambda: matcher.match_bytes(data))
+            # Se fuerza la composicion de mapas aunque supere MAX_MAP_STATES
+            maps, result = _timed(lambda: simulate_long(matcher, data, max_states=FORCE))
+            pooled, pooled_result = _timed(
+                lambda: simulate_long(matcher, data, executor=executor, max_states=FORCE)
+            )
+            assert result == pooled_result == expected
+            print(
+                f"{matcher.num_states:>8} | {base:>9.2f}s | {maps:>7.2f}s | {base / maps:>5.1f} "
+                f"| {pooled:>7.2f}s | {base / pooled:>5.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
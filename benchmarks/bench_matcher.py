@@ -0,0 +1,58 @@
+"""
+Benchmark: simulate_dfa contra el matcher de tabla densa (compile_matcher).
+
+Uso:
+    python -m benchmarks.bench_matcher
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from automaton.direct_dfa import build_direct_dfa
+from automaton.matcher import compile_matcher
+from automaton.minimization import minimize_dfa
+from automaton.simulation import simulate_dfa
+
+PATTERNS = [
+    "(a|b)*abb",
+    "(a|b|c|d)*(abc|bcd)+",
+    "(0|1|2|3|4|5|6|7|8|9)+(x|y)?",
+]
+
+
+def _random_lines(alphabet: str, count: int, length: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(alphabet) for _ in range(length)) for _ in range(count)
+    ]
+
+
+def _time(fn, lines: list[str]) -> tuple[float, int]:
+    start = time.perf_counter()
+    accepted = sum(1 for line in lines if fn(line))
+    return time.perf_counter() - start, accepted
+
+
+def main(count: int = 20_000, length: int = 64) -> None:
+    print(f"{'Patron':>28} | {'simulate_dfa':>12} | {'match':>10} | {'x':>6}")
+    print("-" * 66)
+    for pattern in PATTERNS:
+        dfa = minimize_dfa(build_direct_dfa(pattern))
+        matcher = compile_matcher(dfa)
+        alphabet = "".join(sorted(dfa.alphabet))
+        lines = _random_lines(alphabet, count, length)
+
+        base_time, base_hits = _time(lambda w: simulate_dfa(dfa, w), lines)
+        fast_time, fast_hits = _time(matcher.match, lines)
+        assert base_hits == fast_hits, "resultados distintos"
+
+        print(
+            f"{pattern:>28} | {base_time:>11.3f}s | {fast_time:>9.3f}s "
+            f"| {base_time / fast_time:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
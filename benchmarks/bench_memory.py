@@ -0,0 +1,64 @@
+"""
+Benchmark: pico de memoria y tiempo de compile() con y sin low_memory sobre
+el corpus de bench_pipeline.
+
+Sin low_memory, compile construye un DFA con conjuntos de posiciones y
+diccionarios de transiciones y lo minimiza; con low_memory escribe la tabla
+array('i') directamente (build_compact_dfa) y la minimiza sobre arreglos
+(minimize_compact), sin materializar nunca los conjuntos de posiciones.
+
+Uso:
+    python -m benchmarks.bench_memory [--quick]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from automaton.compiler import cache_clear, compile
+from benchmarks.bench_pipeline import CORPUS
+
+
+def _measure(regex: str, low_memory: bool) -> tuple[int, float, int]:
+    """Pico de bytes asignados, segundos y estados del matcher resultante."""
+    cache_clear()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        matcher = compile(regex, low_memory=low_memory)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak, seconds, matcher.num_states
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_memory")
+    parser.add_argument("--quick", action="store_true", help="Solo los tamanos pequenos")
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'Familia':>12} | {'Tamano':>7} | {'Estados':>8} | {'Pico MiB':>9} | {'low MiB':>9} "
+        f"| {'Reduccion':>9} | {'Tiempo':>8} | {'low':>8}"
+    )
+    print("-" * 92)
+    for family, (generate, sizes, quick_sizes) in CORPUS.items():
+        for size in quick_sizes if args.quick else sizes:
+            regex, _ = generate(size)
+            peak, seconds, states = _measure(regex, low_memory=False)
+            low_peak, low_seconds, low_states = _measure(regex, low_memory=True)
+            assert states == low_states
+            print(
+                f"{family:>12} | {size:>7} | {states:>8} | {peak / 2**20:>9.1f} | {low_peak / 2**20:>9.1f} "
+                f"| {peak / low_peak:>8.1f}x | {seconds:>7.3f}s | {low_seconds:>7.3f}s"
+            )
+    cache_clear()
+
+
+if __name__ == "__main__":
+    main()
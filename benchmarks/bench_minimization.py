@@ -0,0 +1,51 @@
+"""
+Benchmark: escalamiento de minimize_dfa (Hopcroft) con AFD aleatorios.
+
+Uso:
+    python -m benchmarks.bench_minimization [max_exponente]
+
+Con max_exponente=6 se llega a 10^6 estados. La columna t/(n log n) debe
+mantenerse aproximadamente constante.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import sys
+import time
+
+from automaton.direct_dfa import DFA
+from automaton.minimization import minimize_dfa
+
+
+def random_dfa(n: int, alphabet: str = "ab", seed: int = 0) -> DFA:
+    """AFD completo aleatorio de n estados con ~la mitad de aceptacion."""
+    rng = random.Random(seed)
+    dfa = DFA()
+    dfa.states = [frozenset()] * n
+    dfa.alphabet = set(alphabet)
+    dfa.transitions = {
+        (s, symbol): rng.randrange(n) for s in range(n) for symbol in alphabet
+    }
+    dfa.accept_states = {s for s in range(n) if rng.random() < 0.5}
+    return dfa
+
+
+def main(max_exponent: int = 5) -> None:
+    print(f"{'Estados':>10} | {'Minimo':>8} | {'Tiempo':>8} | {'t/(n log n) [us]':>16}")
+    print("-" * 52)
+    for exponent in range(3, max_exponent + 1):
+        for n in (10**exponent, 3 * 10**exponent):
+            if n > 10**max_exponent:
+                break
+            dfa = random_dfa(n)
+            start = time.perf_counter()
+            min_dfa = minimize_dfa(dfa)
+            elapsed = time.perf_counter() - start
+            per = elapsed / (n * math.log2(n)) * 1e6
+            print(f"{n:>10} | {len(min_dfa.states):>8} | {elapsed:>7.2f}s | {per:>16.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,64 @@
+"""
+Benchmark: build_compact_dfa_parallel con 1, 2, 4, ... procesos contra
+build_compact_dfa, en patrones que producen 10^4-10^6 estados.
+
+La aceleracion esta acotada por la parte secuencial (internar los sucesores
+en el proceso principal), por lo que crece mas en patrones cuyos estados
+tienen muchas posiciones: ahi domina el OR de las filas followpos, que es lo
+que se reparte.
+
+Uso:
+    python -m benchmarks.bench_parallel [--max-workers N] [--quick]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from automaton.compact_dfa import build_compact_dfa
+from automaton.parallel_dfa import build_compact_dfa_parallel
+
+PATTERNS = [
+    ("exponencial 14", "(a|b)*a" + "(a|b)" * 14),
+    ("exponencial 17", "(a|b)*a" + "(a|b)" * 17),
+    ("cuatro simbolos", "(a|b|c|d)*a" + "(a|b|c|d)" * 15),
+]
+QUICK_PATTERNS = PATTERNS[:1]
+
+
+def _worker_counts(maximum: int) -> list[int]:
+    counts = [1]
+    while counts[-1] * 2 <= maximum:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != maximum:
+        counts.append(maximum)
+    return counts
+
+
+def _timed(build) -> tuple[float, int]:
+    start = time.perf_counter()
+    dfa = build()
+    return time.perf_counter() - start, dfa.num_states
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_parallel")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--quick", action="store_true", help="Solo el patron mas pequeno")
+    args = parser.parse_args(argv)
+
+    print(f"Nucleos disponibles: {os.cpu_count()}")
+    print(f"{'Patron':>15} | {'Estados':>8} | {'Procesos':>8} | {'Tiempo':>8} | {'Aceleracion':>11}")
+    print("-" * 62)
+    for name, regex in QUICK_PATTERNS if args.quick else PATTERNS:
+        base, states = _timed(lambda: build_compact_dfa(regex))
+        print(f"{name:>15} | {states:>8} | {'serial':>8} | {base:>7.3f}s | {1.0:>10.2f}x")
+        for workers in _worker_counts(args.max_workers):
+            seconds, _ = _timed(lambda: build_compact_dfa_parallel(regex, workers=workers))
+            print(f"{name:>15} | {states:>8} | {workers:>8} | {seconds:>7.3f}s | {base / seconds:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
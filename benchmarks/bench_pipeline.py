@@ -0,0 +1,281 @@
+"""
+Benchmark reproducible de cada etapa del proceso regex -> AFD -> match.
+
+Mide to_postfix, build_syntax_tree, build_direct_dfa, minimize_dfa y
+simulate_dfa sobre un corpus de familias de patrones, algunas patologicas,
+con tamanos crecientes:
+
+    exponencial   (a|b)*a(a|b)^n: el AFD tiene 2^(n+1) estados
+    alternacion   n palabras clave en una sola alternacion
+    anidado       n grupos anidados con +
+    literal       un literal de n simbolos
+    clases        n clases de caracteres concatenadas, con cuantificadores
+
+Para cada etapa reporta el mejor tiempo de varias rondas sobre todo el
+corpus, con el recolector de basura desactivado durante cada medicion, y el
+pico de memoria asignada (tracemalloc, medido en una corrida aparte para no
+alterar los tiempos). Los resultados se pueden guardar en JSON y comparar
+contra una corrida anterior para detectar regresiones; en las etapas de menos
+de 10 ms el ruido del reloj y del planificador pesa mas, y la tolerancia de
+tiempo es al menos SHORT_TOLERANCE.
+
+Uso:
+    python -m benchmarks.bench_pipeline [--quick] [--repeat N] [--json ARCHIVO]
+                                        [--baseline ARCHIVO] [--tolerance 0.25]
+
+Con --baseline el proceso termina con codigo 1 si alguna etapa empeora en
+tiempo o en memoria mas que la tolerancia.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+
+from automaton._version import __version__
+from automaton.direct_dfa import build_direct_dfa
+from automaton.minimization import minimize_dfa
+from automaton.shunting_yard import to_postfix
+from automaton.simulation import simulate_dfa
+from automaton.syntax_tree import build_syntax_tree
+from benchmarks.bench_construction import keyword_alternation
+
+STAGES = ("postfix", "tree", "dfa", "minimize", "simulate")
+
+# Diferencias de tiempo menores que esto se consideran ruido
+NOISE_SECONDS = 1e-3
+# Etapas mas cortas que esto se comparan con al menos SHORT_TOLERANCE
+SHORT_STAGE_SECONDS = 10e-3
+SHORT_TOLERANCE = 1.0
+# Rondas sobre el corpus; se toma el mejor tiempo de cada etapa
+DEFAULT_REPEAT = 7
+# En cada ronda, las etapas se repiten hasta sumar al menos este tiempo
+MIN_BATCH_SECONDS = 20e-3
+# Diferencias de memoria menores que esto se consideran ruido
+NOISE_BYTES = 64 << 10
+
+
+def _random_text(alphabet: str, length: int, seed: int) -> str:
+    rng = random.Random(seed)
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+def _exponential(n: int) -> tuple[str, list[str]]:
+    return "(a|b)*a" + "(a|b)" * n, [_random_text("ab", 20_000, n)]
+
+
+def _alternation(n: int) -> tuple[str, list[str]]:
+    regex = keyword_alternation(n)
+    words = regex[1:-1].split("|")
+    return regex, words + [w + "x" for w in words]
+
+
+def _nesting(n: int) -> tuple[str, list[str]]:
+    return "(" * n + "a)+" * n, ["a" * n, "a" * (4 * n), "a" * (n - 1)]
+
+
+def _literal(n: int) -> tuple[str, list[str]]:
+    text = _random_text("abcdefgh", n, n)
+    return text, [text, text[:-1], text[: n // 2] + "x" + text[n // 2 + 1 :]]
+
+
+def _classes(n: int) -> tuple[str, list[str]]:
+    parts = ["[a-f]+", "\\d?", "[^xyz]", "(\\w|-)*"]
+    regex = "".join(parts[i % len(parts)] for i in range(n))
+    return regex, [_random_text("abcdef019-", 20_000, n)]
+
+
+# Familia -> (generador, tamanos completos, tamanos con --quick)
+CORPUS: dict[str, tuple[Callable[[int], tuple[str, list[str]]], list[int], list[int]]] = {
+    "exponencial": (_exponential, [4, 8, 12], [4, 8]),
+    "alternacion": (_alternation, [100, 400, 1600], [100, 400]),
+    "anidado": (_nesting, [100, 1000, 4000], [100, 1000]),
+    "literal": (_literal, [1_000, 10_000, 50_000], [1_000, 10_000]),
+    "clases": (_classes, [8, 32, 128], [8, 32]),
+}
+
+
+@dataclass
+class StageResult:
+    family: str
+    size: int
+    stage: str
+    seconds: float
+    peak_bytes: int
+    # Estados del AFD (minimizado en "minimize" y "simulate")
+    states: int
+
+
+def _stages(regex: str, inputs: list[str]) -> list[tuple[str, Callable[[dict], object]]]:
+    """Etapas en orden; cada una lee los resultados previos de `done`."""
+    return [
+        ("postfix", lambda done: to_postfix(regex)),
+        ("tree", lambda done: build_syntax_tree(done["postfix"])),
+        ("dfa", lambda done: build_direct_dfa(regex)),
+        ("minimize", lambda done: minimize_dfa(done["dfa"])),
+        ("simulate", lambda done: [simulate_dfa(done["minimize"], w) for w in inputs]),
+    ]
+
+
+def _time_stages(regex: str, inputs: list[str], best: dict[str, float]) -> dict:
+    """Una ronda de todas las etapas; actualiza en best el mejor tiempo de cada una.
+
+    Las etapas cortas se repiten hasta sumar MIN_BATCH_SECONDS, y el
+    recolector de basura queda desactivado mientras se mide cada etapa.
+    """
+    done: dict = {}
+    for stage, run in _stages(regex, inputs):
+        total = 0.0
+        # Una recoleccion a mitad de la etapa agrega ruido que no es de la etapa
+        gc.collect()
+        gc.disable()
+        try:
+            while total < MIN_BATCH_SECONDS:
+                start = time.perf_counter()
+                done[stage] = run(done)
+                elapsed = time.perf_counter() - start
+                best[stage] = min(best.get(stage, elapsed), elapsed)
+                total += elapsed
+        finally:
+            gc.enable()
+    return done
+
+
+def _peak_stages(regex: str, inputs: list[str]) -> dict[str, int]:
+    peaks = {}
+    done: dict = {}
+    tracemalloc.start()
+    try:
+        for stage, run in _stages(regex, inputs):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            done[stage] = run(done)
+            peaks[stage] = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def run_corpus(quick: bool = False, repeat: int = DEFAULT_REPEAT) -> list[StageResult]:
+    """Ejecuta todas las familias y tamanos del corpus.
+
+    Las repeticiones se hacen en rondas sobre todo el corpus: un periodo de
+    carga de la maquina afecta a una ronda de cada etapa y no a todas las
+    rondas de unas pocas, y el minimo lo descarta.
+    """
+    cases = []
+    for family, (generate, sizes, quick_sizes) in CORPUS.items():
+        for size in quick_sizes if quick else sizes:
+            cases.append((family, size, *generate(size)))
+
+    best: dict[tuple[str, int], dict[str, float]] = {}
+    done: dict[tuple[str, int], dict] = {}
+    for _ in range(repeat):
+        for family, size, regex, inputs in cases:
+            seconds = best.setdefault((family, size), {})
+            done[family, size] = _time_stages(regex, inputs, seconds)
+
+    results = []
+    for family, size, regex, inputs in cases:
+        peaks = _peak_stages(regex, inputs)
+        for stage in STAGES:
+            last = done[family, size]
+            dfa = last["minimize"] if stage in ("minimize", "simulate") else last["dfa"]
+            results.append(
+                StageResult(
+                    family, size, stage, best[family, size][stage], peaks[stage], len(dfa.states)
+                )
+            )
+    return results
+
+
+def compare(
+    results: list[StageResult],
+    baseline: dict,
+    tolerance: float,
+) -> list[str]:
+    """Lista las etapas que empeoraron respecto a la corrida base."""
+    previous = {(r["family"], r["size"], r["stage"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        old = previous.get((r.family, r.size, r.stage))
+        if old is None:
+            continue
+        name = f"{r.family}[{r.size}] {r.stage}"
+        time_tolerance = tolerance
+        if old["seconds"] < SHORT_STAGE_SECONDS:
+            time_tolerance = max(tolerance, SHORT_TOLERANCE)
+        if (
+            r.seconds > old["seconds"] * (1 + time_tolerance)
+            and r.seconds - old["seconds"] > NOISE_SECONDS
+        ):
+            regressions.append(f"{name}: tiempo {old['seconds']:.4f}s -> {r.seconds:.4f}s")
+        if (
+            r.peak_bytes > old["peak_bytes"] * (1 + tolerance)
+            and r.peak_bytes - old["peak_bytes"] > NOISE_BYTES
+        ):
+            regressions.append(
+                f"{name}: memoria {old['peak_bytes'] / 1024:.0f} KiB -> {r.peak_bytes / 1024:.0f} KiB"
+            )
+    return regressions
+
+
+def _report(results: list[StageResult]) -> None:
+    print(f"{'Familia':>12} | {'Tamano':>7} | {'Etapa':>9} | {'Tiempo':>9} | {'Pico KiB':>9} | {'Estados':>8}")
+    print("-" * 70)
+    for r in results:
+        print(
+            f"{r.family:>12} | {r.size:>7} | {r.stage:>9} | {r.seconds:>8.4f}s "
+            f"| {r.peak_bytes / 1024:>9.0f} | {r.states:>8}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_pipeline")
+    parser.add_argument("--quick", action="store_true", help="Solo los tamanos pequenos")
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT, help="Rondas sobre el corpus (se toma la mejor)"
+    )
+    parser.add_argument("--json", default=None, help="Guardar los resultados en este archivo")
+    parser.add_argument("--baseline", default=None, help="Comparar contra un JSON guardado antes")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Empeoramiento relativo tolerado")
+    args = parser.parse_args(argv)
+
+    results = run_corpus(args.quick, args.repeat)
+    _report(results)
+
+    if args.json:
+        payload = {
+            "version": __version__,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "results": [asdict(r) for r in results],
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        print(f"\nResultados guardados en {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"\nComparacion con {args.baseline} (version {baseline.get('version', '?')}):")
+        for line in regressions:
+            print(f"  REGRESION {line}")
+        if regressions:
+            return 1
+        print("  Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Benchmark: tiempo de finditer segun el largo de la entrada.
+
+Incluye casos en que un inicio candidato avanza hasta el final del texto sin
+coincidir (x[^y]*y|a sobre xaxa...), que antes costaban tiempo cuadratico.
+Verifica las coincidencias y que el tiempo crezca de forma lineal.
+
+Uso:
+    python -m benchmarks.bench_search
+"""
+
+from __future__ import annotations
+
+import time
+
+from automaton.search import compile_searcher
+
+# (regex, unidad repetida, coincidencias por unidad)
+CASES = [
+    ("x[^y]*y|a", "xa", 1),
+    ("a(b|c)*d|c", "ac", 1),
+    ("(a|b)*abb", "aab", 0),
+    ("[a-z]+ing", "walking ", 1),
+]
+
+# Cociente maximo entre el tiempo por caracter del largo mayor y del menor
+MAX_GROWTH = 3.0
+
+
+def _time(searcher, text: str) -> tuple[float, int]:
+    start = time.perf_counter()
+    count = sum(1 for _ in searcher.finditer(text))
+    return time.perf_counter() - start, count
+
+
+def main(sizes: tuple[int, ...] = (4_000, 16_000, 64_000)) -> None:
+    print(f"{'Regex':>14} | {'Largo':>8} | {'Tiempo':>8} | {'us/caracter':>11}")
+    print("-" * 52)
+    for regex, unit, per_unit in CASES:
+        searcher = compile_searcher(regex)
+        rates = []
+        for n in sizes:
+            text = unit * n
+            elapsed, count = _time(searcher, text)
+            assert count == per_unit * n, f"{regex}: {count} coincidencias"
+            rates.append(elapsed / len(text))
+            print(f"{regex:>14} | {len(text):>8} | {elapsed:>7.3f}s | {1e6 * rates[-1]:>11.3f}")
+        assert rates[-1] <= MAX_GROWTH * rates[0], f"{regex}: crecimiento no lineal"
+
+
+if __name__ == "__main__":
+    main()
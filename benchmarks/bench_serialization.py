@@ -0,0 +1,56 @@
+"""
+Benchmark: tamano y tiempo de guardar y cargar un AFD grande con pickle, el
+formato binario de serialization.py y su forma JSON.
+
+Uso:
+    python -m benchmarks.bench_serialization [--symbols N] [--window N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import pickle
+import time
+
+from automaton.compact_dfa import build_compact_dfa
+from automaton.serialization import dfa_from_json, dfa_to_json, dump_dfa, load_dfa
+
+
+def _best(fn, repeat: int = 3) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_serialization")
+    parser.add_argument("--symbols", type=int, default=8, help="Simbolos del alfabeto")
+    parser.add_argument("--window", type=int, default=16, help="n en (s1|...|sk)*s1(s1|...|sk)^n")
+    args = parser.parse_args(argv)
+
+    group = "(" + "|".join("abcdefghijklmnop"[: args.symbols]) + ")"
+    compact = build_compact_dfa(group + "*a" + group * args.window)
+    dfa = compact.to_dfa()
+    print(f"AFD: {compact.num_states} estados, {len(compact.table)} transiciones")
+    print(f"{'Formato':>10} | {'Tamano MiB':>10} | {'Guardar':>10} | {'Cargar':>10}")
+    print("-" * 50)
+
+    formats = [
+        ("pickle", lambda: pickle.dumps(dfa), pickle.loads),
+        ("binario", lambda: dump_dfa(compact), load_dfa),
+        ("json", lambda: dfa_to_json(compact), dfa_from_json),
+    ]
+    for name, dump, load in formats:
+        dump_time, data = _best(dump, repeat=1 if name == "json" else 3)
+        load_time, _ = _best(lambda: load(data), repeat=1 if name == "json" else 3)
+        print(
+            f"{name:>10} | {len(data) / 2**20:>10.1f} | {dump_time * 1e3:>8.1f}ms "
+            f"| {load_time * 1e3:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
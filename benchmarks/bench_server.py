@@ -0,0 +1,145 @@
+"""
+Benchmark: latencia y rendimiento del servidor HTTP (python -m automaton serve)
+con distintos niveles de concurrencia.
+
+Inicia el servidor en un subproceso y lanza clientes asyncio con conexiones
+persistentes. Cada nivel reporta p50/p90/p99 de latencia y solicitudes por
+segundo. El escenario "en frio" envia la misma regex nueva desde todos los
+clientes a la vez para verificar que se compila una sola vez.
+
+Uso:
+    python -m benchmarks.bench_server
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+
+from automaton.server import percentile
+
+HOST = "127.0.0.1"
+PORT = 8799
+
+REGEXES = ["(a|b)*abb", "abba(c|x)+", "[a-c]+d?", "(ab|ba)*(a|b)"]
+
+
+class _Client:
+    """Cliente HTTP/1.1 minimo con una conexion persistente."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader, self.writer = reader, writer
+
+    @classmethod
+    async def connect(cls) -> _Client:
+        return cls(*await asyncio.open_connection(HOST, PORT))
+
+    async def request(self, method: str, path: str, payload: object = None) -> dict:
+        body = b"" if payload is None else json.dumps(payload).encode()
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode()
+            + body
+        )
+        await self.writer.drain()
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in head.decode().split("\r\n"):
+            if line.lower().startswith("content-length:"):
+                length = int(line.split(":", 1)[1])
+        return json.loads(await self.reader.readexactly(length))
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def _wait_ready(timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            client = await _Client.connect()
+            await client.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def _worker(requests: int, batch: int, seed: int, latencies: list[float]) -> None:
+    rng = random.Random(seed)
+    client = await _Client.connect()
+    try:
+        for _ in range(requests):
+            inputs = ["".join(rng.choice("abcdx") for _ in range(rng.randint(0, 16))) for _ in range(batch)]
+            start = time.perf_counter()
+            await client.request("POST", "/match", {"regex": rng.choice(REGEXES), "inputs": inputs})
+            latencies.append(time.perf_counter() - start)
+    finally:
+        await client.close()
+
+
+async def _run_level(concurrency: int, total: int, batch: int) -> tuple[list[float], float]:
+    latencies: list[float] = []
+    per_client = max(1, total // concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker(per_client, batch, seed, latencies) for seed in range(concurrency)))
+    return sorted(latencies), time.perf_counter() - start
+
+
+async def _cold_compile(concurrency: int) -> tuple[int, float]:
+    """Todos los clientes piden a la vez una regex que nadie ha compilado."""
+    regex = "(a|b)*a" + "(a|b)" * 10 + f"c{random.randrange(1 << 30)}"
+    clients = [await _Client.connect() for _ in range(concurrency)]
+    stats_client = await _Client.connect()
+    before = (await stats_client.request("GET", "/stats"))["compile"]["compiles"]
+    start = time.perf_counter()
+    await asyncio.gather(*(c.request("POST", "/match", {"regex": regex, "inputs": ["ab"]}) for c in clients))
+    elapsed = time.perf_counter() - start
+    after = (await stats_client.request("GET", "/stats"))["compile"]["compiles"]
+    for c in [*clients, stats_client]:
+        await c.close()
+    return after - before, elapsed
+
+
+async def _bench(levels: list[int], total: int, batch: int) -> None:
+    await _wait_ready()
+    # Calentar el cache con las regex del escenario
+    client = await _Client.connect()
+    for regex in REGEXES:
+        await client.request("POST", "/match", {"regex": regex, "inputs": []})
+    await client.close()
+
+    print(f"  Solicitudes por nivel: {total}, cadenas por solicitud: {batch}")
+    print(f"{'Clientes':>9} | {'p50 ms':>8} | {'p90 ms':>8} | {'p99 ms':>8} | {'Sol/s':>9}")
+    print("-" * 54)
+    for concurrency in levels:
+        latencies, elapsed = await _run_level(concurrency, total, batch)
+        p50, p90, p99 = (1e3 * percentile(latencies, q) for q in (50, 90, 99))
+        print(f"{concurrency:>9} | {p50:>8.2f} | {p90:>8.2f} | {p99:>8.2f} | {len(latencies) / elapsed:>9,.0f}")
+
+    compiles, elapsed = await _cold_compile(max(levels))
+    print(f"\n  En frio: {max(levels)} clientes con la misma regex nueva -> "
+          f"{compiles} compilacion(es) en {elapsed:.3f}s")
+
+
+def main(levels: list[int] | None = None, total: int = 2000, batch: int = 32) -> None:
+    levels = levels or [1, 8, 32, 128]
+    server = subprocess.Popen(
+        [sys.executable, "-m", "automaton", "serve", "--host", HOST, "--port", str(PORT)],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(_bench(levels, total, batch))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()